@@ -0,0 +1,3 @@
+"""
+Benchmarks for dashboard hot paths, run with ``python -m benchmarks``.
+"""
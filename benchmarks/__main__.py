@@ -0,0 +1,87 @@
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import django
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark dashboard rendering, table and chart serializers.",
+    )
+    parser.add_argument("-k", "--filter", help="only run benchmarks containing this")
+    parser.add_argument(
+        "--large", action="store_true", help="include 1m row benchmarks (slow)"
+    )
+    parser.add_argument(
+        "--min-time", type=float, default=1.0, help="seconds to run each benchmark"
+    )
+    parser.add_argument("--save", type=Path, help="save results as a baseline")
+    parser.add_argument("--compare", type=Path, help="compare results to a baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="fail when mean time is this much slower than the baseline",
+    )
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    from . import runner, suites  # noqa: F401, registers benchmarks
+
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0)
+
+    benchmarks = [
+        bench
+        for bench in runner.BENCHMARKS
+        if (args.large or not bench.large)
+        and (not args.filter or args.filter in bench.name)
+    ]
+    baseline = runner.load(args.compare) if args.compare else {}
+
+    results = []
+    print(
+        f"{'benchmark':<28}{'ops/s':>12}{'mean ms':>12}{'best ms':>12}{'peak kb':>12}"
+    )
+    for bench in benchmarks:
+        result = runner.run(bench, min_time=args.min_time)
+        results.append(result)
+        print(
+            f"{result.name:<28}{result.ops:>12.2f}{result.mean * 1000:>12.2f}"
+            f"{result.best * 1000:>12.2f}{result.peak_kb:>12.1f}",
+            flush=True,
+        )
+
+    regressions = []
+    if args.compare:
+        print(f"\ncompared to {args.compare}")
+        for result, change, regressed in runner.compare(
+            results, baseline, args.threshold
+        ):
+            if change is None:
+                print(f"{result.name:<28}{'new':>12}")
+                continue
+
+            print(
+                f"{result.name:<28}{change:>+12.1%}{' REGRESSION' if regressed else ''}"
+            )
+            if regressed:
+                regressions.append(result)
+
+    if args.save:
+        runner.save(results, args.save)
+        print(f"\nsaved baseline to {args.save}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
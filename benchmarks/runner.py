@@ -0,0 +1,107 @@
+import gc
+import json
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class Benchmark:
+    name: str
+    # builds any fixtures and returns the function to time
+    setup: Callable[[], Callable[[], Any]]
+    large: bool = False
+
+
+@dataclass
+class Result:
+    name: str
+    rounds: int
+    mean: float
+    best: float
+    peak_kb: float
+
+    @property
+    def ops(self) -> float:
+        return 1 / self.mean if self.mean else 0.0
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: Optional[str] = None, large: bool = False) -> Callable:
+    """
+    Register a benchmark setup function, large benchmarks only run with --large.
+    """
+
+    def decorator(setup: Callable[[], Callable[[], Any]]):
+        BENCHMARKS.append(
+            Benchmark(name=name or setup.__name__, setup=setup, large=large)
+        )
+        return setup
+
+    return decorator
+
+
+def run(bench: Benchmark, min_time: float = 1.0, max_rounds: int = 1000) -> Result:
+    func = bench.setup()
+    # warm up caches, imports and lazy template loading
+    func()
+
+    timings: List[float] = []
+    started = time.perf_counter()
+    while not timings or (
+        len(timings) < max_rounds and time.perf_counter() - started < min_time
+    ):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    # allocations measured separately as tracing slows down the timed rounds
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Result(
+        name=bench.name,
+        rounds=len(timings),
+        mean=sum(timings) / len(timings),
+        best=min(timings),
+        peak_kb=peak / 1024,
+    )
+
+
+def save(results: List[Result], path: Path):
+    path.write_text(
+        json.dumps({result.name: asdict(result) for result in results}, indent=2)
+    )
+
+
+def load(path: Path) -> Dict[str, Result]:
+    return {name: Result(**data) for name, data in json.loads(path.read_text()).items()}
+
+
+def compare(
+    results: List[Result], baseline: Dict[str, Result], threshold: float
+) -> List[Tuple[Result, Optional[float], bool]]:
+    """
+    Compare results to a baseline, returning each result with the change in mean
+    time (0.1 is 10% slower) and whether that is a regression beyond threshold.
+    """
+    compared: List[Tuple[Result, Optional[float], bool]] = []
+    for result in results:
+        previous = baseline.get(result.name)
+        if previous is None:
+            compared.append((result, None, False))
+            continue
+
+        change = (result.mean - previous.mean) / previous.mean
+        compared.append((result, change, change > threshold))
+
+    return compared
@@ -0,0 +1,195 @@
+from django.contrib.auth.models import User
+from django.db.models import Count
+from django.test import RequestFactory
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from dashboards.component import Text
+from dashboards.component.chart import figures
+from dashboards.component.chart.serializers import ChartSerializer
+from dashboards.component.table.serializers import TableSerializer
+from dashboards.dashboard import Dashboard
+from dashboards.views import DashboardView
+
+from .runner import benchmark
+
+
+# a datatables request for the first page, searched and sorted
+TABLE_FILTERS = {
+    "start": "0",
+    "length": "25",
+    "draw": "1",
+    "search[value]": "1",
+    "order[0][column]": "1",
+    "order[0][dir]": "desc",
+}
+
+TABLE_COLUMNS = {"username": "Username", "first_name": "First", "email": "Email"}
+
+
+def make_dashboard(size: int):
+    class Meta:
+        app_label = "benchmarks"
+
+    components = {f"component_{i}": Text(value=f"value {i}") for i in range(size)}
+    return type(
+        f"Dashboard{size}",
+        (Dashboard,),
+        {"__module__": __name__, "Meta": Meta, **components},
+    )
+
+
+def make_rows(size: int):
+    return [
+        {
+            "id": i,
+            "username": f"user{i}",
+            "first_name": f"first{i % 100}",
+            "email": f"user{i}@example.com",
+        }
+        for i in range(size)
+    ]
+
+
+def ensure_users(size: int):
+    existing = User.objects.count()
+    User.objects.bulk_create(
+        (User(**row) for row in make_rows(size)[existing:]), batch_size=5000
+    )
+
+
+def dashboard_render(size: int):
+    dashboard_class = make_dashboard(size)
+    view = DashboardView.as_view(dashboard_class=dashboard_class)
+    request = RequestFactory().get("/")
+
+    return lambda: view(request)
+
+
+def table_list(size: int):
+    rows = make_rows(size)
+
+    class ListTableSerializer(TableSerializer):
+        class Meta:
+            columns = TABLE_COLUMNS
+
+        def get_data(self, *args, **kwargs):
+            return rows
+
+    return lambda: ListTableSerializer.serialize(filters=TABLE_FILTERS)
+
+
+def table_queryset(size: int):
+    ensure_users(size)
+
+    class QuerysetTableSerializer(TableSerializer):
+        class Meta:
+            columns = TABLE_COLUMNS
+
+        def get_queryset(self, *args, **kwargs):
+            return User.objects.filter(id__lt=size)
+
+    return lambda: QuerysetTableSerializer.serialize(filters=TABLE_FILTERS)
+
+
+def chart_dataframe(size: int):
+    df = pd.DataFrame(
+        {
+            "x": np.arange(size),
+            "y": np.random.default_rng(0).random(size),
+            "group": np.arange(size) % 5,
+        }
+    )
+
+    class DataFrameChartSerializer(ChartSerializer):
+        def get_data(self, *args, **kwargs):
+            return df
+
+        def to_fig(self, data):
+            return px.line(data, x="x", y="y", color="group")
+
+    return lambda: DataFrameChartSerializer.serialize()
+
+
+def chart_dict(size: int):
+    df = pd.DataFrame(
+        {
+            "x": np.arange(size),
+            "y": np.random.default_rng(0).random(size),
+            "group": np.arange(size) % 5,
+        }
+    )
+
+    class DictChartSerializer(ChartSerializer):
+        def get_data(self, *args, **kwargs):
+            return df
+
+        def to_fig(self, data):
+            return figures.figure(
+                [
+                    figures.column_trace(
+                        group, "scatter", "x", "y", mode="lines", name=str(name)
+                    )
+                    for name, group in data.groupby("group")
+                ]
+            )
+
+    return lambda: DictChartSerializer.serialize()
+
+
+def chart_queryset(size: int):
+    ensure_users(size)
+
+    class QuerysetChartSerializer(ChartSerializer):
+        class Meta:
+            fields = ["id", "first_name"]
+
+        def get_queryset(self, *args, **kwargs):
+            return User.objects.filter(id__lt=size)
+
+        def to_fig(self, data):
+            return px.histogram(data, x="first_name", y="id")
+
+    return lambda: QuerysetChartSerializer.serialize()
+
+
+def chart_aggregate(size: int):
+    ensure_users(size)
+
+    class AggregateChartSerializer(ChartSerializer):
+        class Meta:
+            dimensions = ["first_name"]
+            time_field = "date_joined"
+            time_bucket = "day"
+            measures = {"id": Count("id")}
+
+        def get_queryset(self, *args, **kwargs):
+            return User.objects.filter(id__lt=size)
+
+        def to_fig(self, data):
+            return px.histogram(data, x="first_name", y="id")
+
+    return lambda: AggregateChartSerializer.serialize()
+
+
+for size in [10, 100, 1000]:
+    benchmark(f"dashboard_render_{size}")(lambda size=size: dashboard_render(size))
+
+for size, large in [(10_000, False), (1_000_000, True)]:
+    label = f"{size // 1000}k" if size < 1_000_000 else f"{size // 1_000_000}m"
+    benchmark(f"table_list_{label}", large=large)(lambda size=size: table_list(size))
+    benchmark(f"table_queryset_{label}", large=large)(
+        lambda size=size: table_queryset(size)
+    )
+    benchmark(f"chart_dataframe_{label}", large=large)(
+        lambda size=size: chart_dataframe(size)
+    )
+    benchmark(f"chart_dict_{label}", large=large)(lambda size=size: chart_dict(size))
+    benchmark(f"chart_queryset_{label}", large=large)(
+        lambda size=size: chart_queryset(size)
+    )
+    benchmark(f"chart_aggregate_{label}", large=large)(
+        lambda size=size: chart_aggregate(size)
+    )
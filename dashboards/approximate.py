@@ -0,0 +1,113 @@
+"""
+Approximate aggregates, for sources too large to aggregate exactly on every
+request. Values computed with these should be shown as approximate.
+"""
+from typing import Optional, Type
+
+from django.db import connections
+from django.db.models import Aggregate, BooleanField, Expression, IntegerField, Model
+
+from dashboards import config
+
+
+class Sample(Expression):
+    """
+    True for a random fraction of rows, so queryset.filter(Sample(0.01))
+    is a sample of about 1% of the queryset.
+    """
+
+    # sqlite's random() is a signed 64 bit integer rather than a float
+    SQLITE_SCALE = 1000000
+
+    def __init__(self, fraction: float):
+        super().__init__(output_field=BooleanField())
+        self.fraction = fraction
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.fraction})"
+
+    def as_sql(self, compiler, connection):
+        return "(RANDOM() < %s)", [self.fraction]
+
+    def as_sqlite(self, compiler, connection):
+        return "((ABS(RANDOM()) %% %s) < %s)", [
+            self.SQLITE_SCALE,
+            int(self.fraction * self.SQLITE_SCALE),
+        ]
+
+    def as_mysql(self, compiler, connection):
+        return "(RAND() < %s)", [self.fraction]
+
+    def as_oracle(self, compiler, connection):
+        return "(DBMS_RANDOM.VALUE < %s)", [self.fraction]
+
+
+class ApproxCountDistinct(Aggregate):
+    """
+    Count of distinct values, estimated where the database can: with
+    APPROX_COUNT_DISTINCT on oracle and, with DASHBOARDS_POSTGRES_HLL, the
+    postgresql-hll extension's HyperLogLog on postgres. Exact elsewhere.
+    """
+
+    function = "COUNT"
+    name = "ApproxCountDistinct"
+    template = "%(function)s(DISTINCT %(expressions)s)"
+    output_field = IntegerField()
+    empty_result_set_value = 0
+    hll_template = "hll_cardinality(hll_add_agg(hll_hash_any(%(expressions)s)))::bigint"
+
+    @staticmethod
+    def is_estimated(using: str) -> bool:
+        """
+        Whether counts on the using database are estimated rather than exact.
+        """
+        vendor = connections[using].vendor
+        return vendor == "oracle" or (
+            vendor == "postgresql" and config.Config().DASHBOARDS_POSTGRES_HLL
+        )
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        if config.Config().DASHBOARDS_POSTGRES_HLL:
+            extra_context["template"] = self.hll_template
+
+        return self.as_sql(compiler, connection, **extra_context)
+
+    def as_oracle(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler,
+            connection,
+            function="APPROX_COUNT_DISTINCT",
+            template="%(function)s(%(expressions)s)",
+            **extra_context,
+        )
+
+
+def estimate_count(model: Type[Model], using: str) -> Optional[int]:
+    """
+    The database's estimate of the rows in model's table, from the statistics
+    kept for the query planner, or None when it has none.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+
+    if connection.vendor == "postgresql":
+        sql = "SELECT reltuples FROM pg_class WHERE oid = to_regclass(%s)"
+        params = [connection.ops.quote_name(table)]
+    elif connection.vendor == "mysql":
+        sql = (
+            "SELECT table_rows FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name = %s"
+        )
+        params = [table]
+    else:
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+
+    # postgres reports -1 until the table is first vacuumed or analyzed
+    if not row or row[0] is None or row[0] < 0:
+        return None
+
+    return int(row[0])
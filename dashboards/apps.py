@@ -5,3 +5,8 @@ class DashboardConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "dashboards"
     verbose_name = "Django Dashboards"
+
+    def ready(self):
+        from dashboards import versions
+
+        versions.connect_pending()
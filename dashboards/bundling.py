@@ -0,0 +1,162 @@
+import functools
+import hashlib
+import json
+import posixpath
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from django.contrib.staticfiles import finders
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+import asset_definitions
+
+from dashboards import config
+
+
+BUNDLE_PATH = "dashboards/bundles"
+MANIFEST_NAME = "manifest.json"
+
+CSS_URL_RE = re.compile(r"""url\(\s*(['"]?)(?!data:|https?:|//|/|#)([^'")]+)\1\s*\)""")
+
+# {dashboard slug: {"js": [paths], "css": [paths]}}
+Manifest = Dict[str, Dict[str, List[str]]]
+
+
+def is_local(path: str) -> bool:
+    """
+    Whether a media path is a static file which can be bundled, rather than an
+    external url or inline html.
+    """
+    return not (
+        path.startswith(("http://", "https://", "//", "/"))
+        or path.lstrip().startswith("<")
+    )
+
+
+def rewrite_css_urls(css: str, source: str) -> str:
+    """
+    Rewrite relative url()s in css from source so they still resolve from the
+    bundle directory.
+    """
+
+    def rewrite(match):
+        quote, url = match.groups()
+        target = posixpath.normpath(posixpath.join(posixpath.dirname(source), url))
+        return f"url({quote}{posixpath.relpath(target, BUNDLE_PATH)}{quote})"
+
+    return CSS_URL_RE.sub(rewrite, css)
+
+
+def bundle_paths(
+    paths: List[str], name: str, extension: str, output: Path
+) -> List[str]:
+    """
+    Concatenate runs of local static files into fingerprinted bundles written
+    to output, keeping any external or inline media in place between them.
+    """
+    bundled: List[str] = []
+    run: List[str] = []
+
+    def flush():
+        if not run:
+            return
+
+        contents = []
+        for path in run:
+            found = finders.find(path)
+            if not found:
+                raise FileNotFoundError(f"Static file {path} not found")
+
+            content = Path(found).read_text()
+            if extension == "css":
+                content = rewrite_css_urls(content, path)
+            contents.append(f"/* {path} */\n{content}\n")
+
+        bundle = "".join(contents)
+        fingerprint = hashlib.md5(bundle.encode()).hexdigest()[:12]
+        bundle_name = f"{BUNDLE_PATH}/{name}.{len(bundled)}.{fingerprint}.{extension}"
+        (output / bundle_name).write_text(bundle)
+
+        bundled.append(bundle_name)
+        run.clear()
+
+    for path in paths:
+        if is_local(path):
+            run.append(path)
+        else:
+            flush()
+            bundled.append(path)
+
+    flush()
+
+    return bundled
+
+
+def bundle_media(
+    name: str, media: asset_definitions.Media, output: Path
+) -> Dict[str, List[str]]:
+    (output / BUNDLE_PATH).mkdir(parents=True, exist_ok=True)
+
+    return {
+        "js": bundle_paths(list(media._js), name, "js", output),
+        # only media for all devices is bundled, others are left as they are
+        "css": bundle_paths(media._css.get("all", []), name, "css", output),
+    }
+
+
+def write_manifest(manifest: Manifest, output: Path):
+    (output / BUNDLE_PATH / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+    load_manifest.cache_clear()
+
+
+@functools.lru_cache(maxsize=None)
+def load_manifest() -> Optional[Manifest]:
+    bundle_dir = config.Config().DASHBOARDS_MEDIA_BUNDLE_DIR
+    if not bundle_dir:
+        return None
+
+    path = Path(bundle_dir) / BUNDLE_PATH / MANIFEST_NAME
+    if not path.exists():
+        return None
+
+    return json.loads(path.read_text())
+
+
+def get_bundled_media(
+    name: str, media: asset_definitions.Media
+) -> asset_definitions.Media:
+    """
+    Replace media with its bundles, if bundle_dashboard_media has been run for it.
+    """
+    manifest = load_manifest()
+    if not manifest or name not in manifest:
+        return media
+
+    css = {medium: paths for medium, paths in media._css.items() if medium != "all"}
+    return asset_definitions.Media(
+        js=manifest[name]["js"], css={"all": manifest[name]["css"], **css}
+    )
+
+
+def get_preload_links(media: asset_definitions.Media) -> str:
+    """
+    Link header value asking the browser to preload local js and css.
+    """
+    links: List[Tuple[str, str]] = [
+        (media.absolute_path(path), "script") for path in media._js if is_local(path)
+    ]
+    links += [
+        (media.absolute_path(path), "style")
+        for path in media._css.get("all", [])
+        if is_local(path)
+    ]
+
+    return ", ".join(f"<{url}>; rel=preload; as={kind}" for url, kind in links)
+
+
+@receiver(setting_changed)
+def clear_manifest_on_setting_changed(setting, **kwargs):
+    if setting == "DASHBOARDS_MEDIA_BUNDLE_DIR":
+        load_manifest.cache_clear()
@@ -1,12 +1,15 @@
+import functools
+import hashlib
 from dataclasses import asdict, dataclass, is_dataclass
 from enum import Enum
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Type, Union
+from urllib.parse import urlencode
 
-from django.db.models import QuerySet
+from django.core.cache import caches
+from django.db import OperationalError
+from django.db.models import Model, QuerySet
 from django.http import HttpRequest
 from django.template import Context
-from django.template.loader import render_to_string
-from django.urls import reverse, reverse_lazy
 from django.utils.functional import lazy
 from django.utils.module_loading import import_string
 from django.utils.safestring import mark_safe
@@ -14,8 +17,20 @@ from django.utils.text import slugify
 
 import asset_definitions
 
-from dashboards import config
-
+from dashboards import (
+    config,
+    permissions,
+    profiling,
+    rendering,
+    routing,
+    url_templates,
+    versions,
+)
+
+from ..exceptions import ComponentLimitExceeded
+from ..limits import MISSING, Limits, enforce, is_limit_error
+from ..log import logger
+from ..memo import RequestMemo, freeze, get_memo
 from ..types import ValueData
 
 
@@ -23,6 +38,60 @@ if TYPE_CHECKING:
     from ..dashboard import Dashboard
 
 
+# request param used by polled components to ask for data since their last fetch
+DELTA_CURSOR_PARAM = "_cursor"
+# request param deferred components pass to reuse their page's shared context
+PAGE_TOKEN_PARAM = "_page"
+# request param holding the form values from the last submit
+PREVIOUS_FILTERS_PARAM = "_previous"
+
+# stand ins for the per request tokens of defer urls in cached layout html
+DEFER_TOKEN_PLACEHOLDERS = {
+    permissions.ACCESS_TOKEN_PARAM: "__dashboards_access__",
+    PAGE_TOKEN_PARAM: "__dashboards_page__",
+}
+
+STALE_VALUE_KEY_PREFIX = "dashboards.stale"
+VALUE_KEY_PREFIX = "dashboards.value"
+
+
+def get_defer_tokens(request: HttpRequest, dashboard) -> Dict[str, str]:
+    """
+    Tokens added to the defer urls of dashboard's components for this request,
+    keyed on their request param.
+    """
+    tokens = {
+        permissions.ACCESS_TOKEN_PARAM: permissions.get_access_token(
+            request, dashboard
+        ),
+        PAGE_TOKEN_PARAM: get_page_token(request, dashboard),
+    }
+
+    return {param: token for param, token in tokens.items() if token is not None}
+
+
+def get_page_token(request: Optional[HttpRequest], dashboard) -> Optional[str]:
+    """
+    Token of the shared context created for dashboard during this request, or
+    the one it was made with, passing it on to components rendered from it.
+    """
+    if request is None:
+        return None
+
+    memo = RequestMemo.for_request(request)
+    token = memo.get(("page_token", dashboard.get_slug())) if memo else None
+    if token is None:
+        data = request.GET if request.method == "GET" else request.POST
+        token = data.get(PAGE_TOKEN_PARAM)
+
+    return token
+
+
+@functools.lru_cache(maxsize=None)
+def get_cta_dashboard(path: str):
+    return import_string(path)
+
+
 @dataclass
 class CTA:
     href: Optional[Union[str, Callable]] = None
@@ -33,15 +102,16 @@ class CTA:
         Get CTA, first trying a dashboard by module path if not here as a str or callable.
         """
         if self.dashboard:
-            dashboard_class = import_string(self.dashboard)
+            dashboard_class = get_cta_dashboard(self.dashboard)
             if obj:
                 lookup = getattr(obj, dashboard_class._meta.lookup_field)
-                return reverse_lazy(
-                    f"dashboards:{dashboard_class.get_slug()}_detail",
-                    args=(lookup,),
+                return url_templates.reverse_args(
+                    f"dashboards:{dashboard_class.get_slug()}_detail", [lookup]
                 )
             else:
-                return reverse_lazy(f"dashboards:{dashboard_class.get_slug()}")
+                return url_templates.reverse_args(
+                    f"dashboards:{dashboard_class.get_slug()}", []
+                )
         elif callable(self.href):
             return self.href(obj)
 
@@ -56,6 +126,15 @@ class Component:
     defer_url: Optional[Callable[..., str]] = None
     defer_loading_template_name: Optional[str] = "dashboards/components/loading.html"
     dependents: Optional[List[str]] = None
+    consumes: Optional[List[str]] = None  # filter keys used, None if unknown
+    shared: Optional[List[str]] = None  # shared context keys used, None if unknown
+    background: bool = False  # compute deferred values in a job, see dashboards.jobs
+    limits: Optional[Limits] = None  # defaults to the dashboard's Meta.limits
+    lane: Optional[str] = None  # defaults to the serializer's Meta.lane
+    # cache values until cache_models change, for cache_timeout seconds or 0 for ever
+    cache_timeout: Optional[int] = None
+    cache_models: Optional[List[Type[Model]]] = None  # as well as the serializer's
+    degraded_template_name: Optional[str] = "dashboards/components/degraded.html"
     cta: Optional[CTA] = None
 
     # attrs below can be set, but are inferred when fetching components from the dashboard class.
@@ -99,6 +178,18 @@ class Component:
     def is_deferred(self) -> bool:
         return True if self.defer or self.defer_url else False
 
+    @property
+    def supports_delta(self) -> bool:
+        """
+        Polled components whose serializer implements get_data_since only fetch
+        new or changed data on each poll rather than fully re-rendering.
+        """
+        return bool(
+            self.poll_rate
+            and self.defer
+            and hasattr(self.get_serializer(), "get_data_since")
+        )
+
     @property
     def dashboard_class(self):
         if self.dashboard:
@@ -115,19 +206,40 @@ class Component:
 
         return ""
 
+    def get_serializer(self) -> Any:
+        """
+        Returns the value or defer source, unwrapping serialize if it has
+        already been swapped in by get_value.
+        """
+        source = self.defer if self.is_deferred else self.value
+        return getattr(source, "__self__", source)
+
     def get_value(
         self,
         request: HttpRequest = None,
         call_deferred=False,
         filters: Optional[Dict[str, Any]] = None,
     ) -> ValueData:
+        memo = get_memo(request=request)
+
         if self.is_deferred and self.defer and call_deferred:
             serializable = getattr(self.defer, "serialize", None)
             if serializable:
                 self.defer = serializable
 
             if callable(self.defer):
-                value = self.defer(request=request, object=self.object, filters=filters)
+                defer = self.defer
+                with profiling.phase("fetch"):
+                    value = self.call_cached(
+                        lambda: defer(
+                            request=request,
+                            object=self.object,
+                            filters=filters,
+                            memo=memo,
+                        ),
+                        request=request,
+                        filters=filters,
+                    )
             else:
                 value = self.defer
 
@@ -137,7 +249,18 @@ class Component:
                 self.value = serializable
 
             if callable(self.value):
-                value = self.value(request=request, object=self.object, filters=filters)
+                value_func = self.value
+                with profiling.phase("fetch"):
+                    value = self.call_cached(
+                        lambda: value_func(
+                            request=request,
+                            object=self.object,
+                            filters=filters,
+                            memo=memo,
+                        ),
+                        request=request,
+                        filters=filters,
+                    )
             else:
                 value = self.value
 
@@ -146,6 +269,200 @@ class Component:
 
         return value
 
+    def get_lane(self) -> Optional[str]:
+        """
+        Admission lane limiting how many of this component's values are
+        computed at once, see dashboards.lanes.
+        """
+        if self.lane:
+            return self.lane
+
+        meta = getattr(self.get_serializer(), "_meta", None)
+        return getattr(meta, "lane", None)
+
+    def get_database(self) -> str:
+        """
+        Database alias the component's serializer reads from.
+        """
+        meta = getattr(self.get_serializer(), "_meta", None)
+        return routing.get_database(
+            getattr(meta, "model", None), getattr(meta, "using", None)
+        )
+
+    def get_limits(self) -> Optional[Limits]:
+        if self.limits is not None:
+            return self.limits
+
+        meta = getattr(self.dashboard, "_meta", None)
+        return getattr(meta, "limits", None)
+
+    def get_stale_value_key(
+        self,
+        request: HttpRequest = None,
+        filters: Optional[Dict[str, Any]] = None,
+        kind: str = "value",
+    ) -> str:
+        key = repr(
+            (
+                self.get_absolute_url(),
+                freeze(filters or {}),
+                permissions.get_permission_fingerprint(request),
+                kind,
+            )
+        )
+        return f"{STALE_VALUE_KEY_PREFIX}.{hashlib.md5(key.encode()).hexdigest()}"
+
+    def call_with_limits(
+        self,
+        func: Callable[[], Any],
+        request: HttpRequest = None,
+        filters: Optional[Dict[str, Any]] = None,
+        kind: str = "value",
+    ) -> Any:
+        """
+        Call func within the component's limits. Successful results are kept
+        for DASHBOARDS_STALE_VALUE_TIMEOUT, and returned in place of a result
+        when a limit is hit, otherwise ComponentLimitExceeded is raised.
+        """
+        component_limits = self.get_limits()
+        if component_limits is None:
+            return func()
+
+        cache = caches[config.Config().DASHBOARDS_CACHE_ALIAS]
+        key = self.get_stale_value_key(request=request, filters=filters, kind=kind)
+        try:
+            with enforce(component_limits, using=self.get_database()):
+                result = func()
+        except (ComponentLimitExceeded, OperationalError) as e:
+            if not is_limit_error(e):
+                raise
+
+            logger.warning(f"Component {self.key} exceeded its limits: {e}")
+            stale = cache.get(key, MISSING)
+            if stale is MISSING:
+                raise ComponentLimitExceeded(str(e)) from e
+
+            return stale
+
+        cache.set(key, result, config.Config().DASHBOARDS_STALE_VALUE_TIMEOUT)
+        return result
+
+    def get_cache_models(self) -> List[Type[Model]]:
+        """
+        Models whose changes invalidate cached values, cache_models and the
+        serializer's Meta.model.
+        """
+        models = list(self.cache_models or [])
+        meta = getattr(self.get_serializer(), "_meta", None)
+        model = getattr(meta, "model", None)
+        if model is not None and model not in models:
+            models.append(model)
+
+        return models
+
+    def get_value_cache_key(
+        self, filters: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        Key the value is cached under, changing with the versions of its
+        models. None when values are not cached.
+        """
+        if self.cache_timeout is None:
+            return None
+
+        models = self.get_cache_models()
+        if not models:
+            return None
+
+        key = repr(
+            (
+                self.get_absolute_url(),
+                freeze(filters or {}),
+                sorted(versions.get_versions(models).items()),
+            )
+        )
+        return f"{VALUE_KEY_PREFIX}.{hashlib.md5(key.encode()).hexdigest()}"
+
+    def call_cached(
+        self,
+        func: Callable[[], Any],
+        request: HttpRequest = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """
+        Call func within the component's limits, or return its result cached
+        against the current versions of the component's models.
+        """
+        key = self.get_value_cache_key(filters)
+        if key is None:
+            return self.call_with_limits(func, request=request, filters=filters)
+
+        cache = caches[config.Config().DASHBOARDS_CACHE_ALIAS]
+        value = cache.get(key, MISSING)
+        if value is MISSING:
+            value = self.call_with_limits(func, request=request, filters=filters)
+            cache.set(key, value, self.cache_timeout or None)
+
+        return value
+
+    def get_delta_cursor(
+        self,
+        request: HttpRequest = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        return self.get_serializer().serialize_cursor(
+            request=request, object=self.object, filters=filters
+        )
+
+    def get_delta(
+        self,
+        cursor: Any,
+        request: HttpRequest = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> ValueData:
+        """
+        Get only the data added or changed since cursor, along with the
+        cursor for the next poll.
+        """
+        value = self.get_serializer().serialize_since(
+            cursor=cursor, request=request, object=self.object, filters=filters
+        )
+
+        if is_dataclass(value):
+            value = asdict(value, dict_factory=value_render_encoder)
+
+        return value
+
+    def get_cache_version(
+        self,
+        request: HttpRequest = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Optional[str]:
+        """
+        Version of the rendered component used by layout fragment caching, None
+        if it can't be cached.
+
+        Deferred components only render their loading placeholder and static
+        values never change, so both are cached. Callable values are versioned
+        on their models when cache_timeout is set, other components with
+        callable values should override this to return a version which changes
+        with their data.
+        """
+        if self.supports_delta:
+            return None
+
+        if self.is_deferred:
+            return "deferred"
+
+        if callable(self.value):
+            models = self.get_cache_models()
+            if self.cache_timeout is None or not models:
+                return None
+
+            return f"models:{sorted(versions.get_versions(models).items())!r}"
+
+        return f"static:{self.value!r}"
+
     @property
     def media(self):
         return self.get_media()
@@ -160,11 +477,14 @@ class Component:
     def get_media(self) -> asset_definitions.Media:
         # component level media
         media = self._get_media_from_definition() or asset_definitions.Media()
-        # serializers may have media, if so use that instead of component media
-        if callable(self.value) and hasattr(self.value, "get_media"):
-            media = self.value().get_media()
-        elif callable(self.defer) and hasattr(self.defer, "get_media"):
-            media = self.defer().get_media()
+        # serializers may have media, if so use that instead of component media,
+        # unwrapping serialize if it has already been swapped in by get_value.
+        value = getattr(self.value, "__self__", self.value)
+        defer = getattr(self.defer, "__self__", self.defer)
+        if callable(value) and hasattr(value, "get_media"):
+            media = value().get_media()
+        elif callable(defer) and hasattr(defer, "get_media"):
+            media = defer().get_media()
 
         return media
 
@@ -173,15 +493,33 @@ class Component:
             filters = (
                 request.GET.dict() if request.method == "GET" else request.POST.dict()
             )
+            filters.pop(permissions.ACCESS_TOKEN_PARAM, None)
+            filters.pop(PAGE_TOKEN_PARAM, None)
+            filters.pop(PREVIOUS_FILTERS_PARAM, None)
         else:
             filters = {}
 
         return filters
 
-    def render_value(self, context: Context, call_deferred: bool = False) -> str:
+    def get_changed_filters(self, request: HttpRequest) -> Optional[Set[str]]:
+        """
+        Filter keys changed by this request, used to limit which dependents are
+        recomputed. None when unknown, in which case all dependents are.
+        """
+        return None
+
+    def render_value(
+        self,
+        context: Context,
+        call_deferred: bool = False,
+        absolute_url: Optional[str] = None,
+    ) -> str:
         # if value is deferred and we are not ready to call it, return loading template
         if self.is_deferred and not call_deferred:
-            return render_to_string(self.defer_loading_template_name)
+            return rendering.render_static(self.defer_loading_template_name)
+
+        if absolute_url is None:
+            absolute_url = self.get_absolute_url()
 
         request = context.get("request")
         filters = self.get_filters(request)
@@ -191,52 +529,107 @@ class Component:
         else:
             render = getattr(self.value, "render", None)
 
+        # cursor is taken before the data so no change is missed between the two
+        delta_context = {}
+        if self.supports_delta:
+            delta_context = {
+                "cursor": self.get_delta_cursor(request=request, filters=filters),
+                "poll_rate": self.poll_rate,
+            }
+
         if callable(render):
-            lazy_render = lazy(render)
+
+            def render_within_limits(**kwargs):
+                try:
+                    if self.get_value_cache_key(filters) is not None:
+                        # render the cached value rather than serializing again
+                        kwargs["serialized"] = self.get_value(
+                            request=request,
+                            call_deferred=call_deferred,
+                            filters=filters,
+                        )
+
+                    return self.call_with_limits(
+                        lambda: render(**kwargs),
+                        request=request,
+                        filters=filters,
+                        kind="render",
+                    )
+                except ComponentLimitExceeded:
+                    return self.render_degraded()
+
+            lazy_render = lazy(render_within_limits)
             rendered_value = lazy_render(
-                template_id=self.template_id,
+                template_id=slugify(absolute_url),
                 request=request,
                 filters=filters,
                 object=self.object,
                 icon=self.icon,
                 css_classes=self.css_classes,
                 is_deferred=self.is_deferred,
-                defer_url=self.get_absolute_url(),
+                defer_url=self.get_defer_url(request, absolute_url),
+                memo=get_memo(request=request),
+                **delta_context,
             )
             return rendered_value
 
-        value = self.get_value(
-            request=request, call_deferred=call_deferred, filters=filters
-        )
+        try:
+            value = self.get_value(
+                request=request, call_deferred=call_deferred, filters=filters
+            )
+        except ComponentLimitExceeded:
+            return self.render_degraded()
 
         template_context = {
             "request": request,
             "component": self,
             "rendered_value": value,
+            **delta_context,
         }
-        return render_to_string(self.template_name, template_context)
+        return rendering.render_to_string(self.template_name, template_context)
+
+    def render_degraded(self) -> str:
+        return rendering.render_static(self.degraded_template_name)
 
     def render(
         self, context: Context, htmx: Optional[bool] = None, call_deferred: bool = False
     ) -> str:
+        with profiling.component(self.key), profiling.phase("render"):
+            return self._render(context, htmx=htmx, call_deferred=call_deferred)
+
+    def _render(
+        self, context: Context, htmx: Optional[bool] = None, call_deferred: bool = False
+    ) -> str:
+        # reversing the url is the most expensive part of the context, only do it once
+        absolute_url = self.get_absolute_url()
         template_context = {
-            "template_id": self.template_id,
+            "template_id": slugify(absolute_url),
             "object": self.object,
-            "media": self.media,
             "cta": self.cta,
             "is_deferred": self.is_deferred,
             "htmx": self.is_deferred if htmx is None else htmx,
-            "defer_url": self.get_absolute_url(),
+            "defer_url": self.get_defer_url(context.get("request"), absolute_url),
             "trigger_on": self.htmx_trigger_on(),
-            "poll_rate": self.htmx_poll_rate(),
+            # delta components poll for changes themselves rather than re-rendering
+            "poll_rate": None if self.supports_delta else self.htmx_poll_rate(),
             "defer_loading_template_name": self.defer_loading_template_name,
             "rendered_value": self.render_value(
-                context=context, call_deferred=call_deferred
+                context=context, call_deferred=call_deferred, absolute_url=absolute_url
             ),
         }
+        # rendered with the component's context, as {% include %} was
+        template_context["defer_loading"] = (
+            rendering.render_placeholder(
+                self.defer_loading_template_name, template_context
+            )
+            if self.is_deferred and self.defer_loading_template_name
+            else None
+        )
 
         return mark_safe(
-            render_to_string("dashboards/components/component.html", template_context)
+            rendering.render_to_string(
+                "dashboards/components/component.html", template_context
+            )
         )
 
     def get_absolute_url(self):
@@ -261,10 +654,32 @@ class Component:
         if self.defer_url:
             url = self.defer_url(reverse_args=args)
         else:
-            url = reverse("dashboards:dashboard_component", args=args)
+            url = url_templates.reverse_args("dashboards:dashboard_component", args)
 
         return url
 
+    def get_defer_url(
+        self, request: Optional[HttpRequest], absolute_url: Optional[str] = None
+    ) -> str:
+        """
+        Url deferred values are fetched from, carrying an access token when
+        DASHBOARDS_COMPONENT_ACCESS_TOKEN_MAX_AGE is set so the fetch can skip
+        the dashboard's permission checks, and the page token of the
+        dashboard's shared context.
+        """
+        if absolute_url is None:
+            absolute_url = self.get_absolute_url()
+
+        if not self.is_deferred or request is None or not self.dashboard:
+            return absolute_url
+
+        params = get_defer_tokens(request, self.dashboard)
+        if not params:
+            return absolute_url
+
+        separator = "&" if "?" in absolute_url else "?"
+        return f"{absolute_url}{separator}{urlencode(params)}"
+
     @property
     def template_id(self):
         return slugify(self.get_absolute_url())
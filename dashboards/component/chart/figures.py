@@ -0,0 +1,37 @@
+"""
+Plain dict figures, which chart serializers encode directly rather than
+through plotly.graph_objs, skipping its validation and copying. Traces and
+layout follow the plotly.js figure reference, values may be numpy arrays.
+"""
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+
+Figure = Dict[str, Any]
+
+
+def trace(type: str, **attrs) -> Dict[str, Any]:
+    return {"type": type, **attrs}
+
+
+def column_trace(
+    df: pd.DataFrame, type: str, x: str, y: str, **attrs
+) -> Dict[str, Any]:
+    """
+    A trace plotting column y against column x of df.
+    """
+    return trace(type, x=df[x].to_numpy(), y=df[y].to_numpy(), **attrs)
+
+
+def figure(
+    data: List[Dict[str, Any]], layout: Optional[Dict[str, Any]] = None
+) -> Figure:
+    """
+    A figure of traces, layout is merged over the serializer's layout.
+    """
+    fig: Figure = {"data": data}
+    if layout:
+        fig["layout"] = layout
+
+    return fig
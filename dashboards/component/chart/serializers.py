@@ -1,16 +1,37 @@
+import functools
 import json
-from typing import Any, Dict, List, Optional, Type
+from typing import Any, Dict, List, Optional, Type, Union
 
-from django.core.exceptions import ImproperlyConfigured
+from django.core.exceptions import EmptyResultSet, ImproperlyConfigured
 from django.db.models import Model
-from django.template.loader import render_to_string
+from django.db.models.functions import Trunc
+from django.http import HttpRequest
+from django.utils.html import json_script
+from django.utils.safestring import SafeString
 
 import asset_definitions
 import pandas as pd
 import plotly.graph_objs as go
-
+import plotly.io as pio
+
+from dashboards import (
+    approximate,
+    frames,
+    offload,
+    profiling,
+    rendering,
+    routing,
+    versions,
+)
+from dashboards.memo import RequestMemo, freeze, get_memo
 from dashboards.meta import ClassWithMeta
 
+from . import figures
+
+
+# kinds Meta.time_bucket truncates Meta.time_field to
+TIME_BUCKETS = ["year", "quarter", "month", "week", "day", "hour", "minute", "second"]
+
 
 class ModelDataMixin:
     """
@@ -20,9 +41,76 @@ class ModelDataMixin:
     class Meta:
         fields: Optional[List[str]] = None
         model: Optional[Model] = None
+        using: Optional[str] = None  # database alias, see DASHBOARDS_DATABASE_ALIAS
+        dataframe_cache: bool = False  # share frames between processes, see frames
+        # models, besides model and those reached by fields, invalidating cached frames
+        cache_models: Optional[List[Type[Model]]] = None
+        # aggregate in the database, see aggregate_queryset
+        dimensions: Optional[List[str]] = None
+        time_field: Optional[str] = None
+        time_bucket: Optional[str] = None  # a Trunc kind, e.g. "day"
+        measures: Optional[Dict[str, Any]] = None  # name: aggregate
+        where: Optional[Dict[str, Any]] = None  # lookups filtering rows
+        sample: Optional[float] = None  # fraction of rows, see approximate.Sample
 
     _meta: Type["ModelDataMixin.Meta"]
 
+    @classmethod
+    def postprocess_meta(cls, current_class_meta, resolved_meta_class):
+        resolved_meta_class = super().postprocess_meta(  # type: ignore[misc]
+            current_class_meta, resolved_meta_class
+        )
+        # cached frames are keyed on the versions of the models they read
+        if resolved_meta_class.dataframe_cache and resolved_meta_class.model:
+            versions.track(*cls.get_dataframe_cache_models(resolved_meta_class))
+
+        if resolved_meta_class.time_bucket:
+            if not resolved_meta_class.time_field:
+                raise ImproperlyConfigured(
+                    "%(cls)s.Meta.time_bucket requires time_field."
+                    % {"cls": cls.__name__}
+                )
+            if resolved_meta_class.time_bucket not in TIME_BUCKETS:
+                raise ImproperlyConfigured(
+                    "%(cls)s.Meta.time_bucket must be one of %(buckets)s."
+                    % {"cls": cls.__name__, "buckets": ", ".join(TIME_BUCKETS)}
+                )
+
+        sample = resolved_meta_class.sample
+        if sample is not None and not 0 < sample <= 1:
+            raise ImproperlyConfigured(
+                "%(cls)s.Meta.sample must be a fraction between 0 and 1."
+                % {"cls": cls.__name__}
+            )
+
+        grouped = resolved_meta_class.dimensions or resolved_meta_class.time_bucket
+        if bool(resolved_meta_class.measures) != bool(grouped):
+            raise ImproperlyConfigured(
+                "%(cls)s.Meta.measures requires dimensions or a time_bucket "
+                "to group by, and they require measures." % {"cls": cls.__name__}
+            )
+
+        return resolved_meta_class
+
+    @staticmethod
+    def get_dataframe_cache_models(meta) -> List[Type[Model]]:
+        """
+        Models whose changes invalidate cached frames, the model, those its
+        fields, dimensions, time_field and where lookups span, and cache_models.
+        """
+        paths = [
+            *(meta.fields or []),
+            *(meta.dimensions or []),
+            *([meta.time_field] if meta.time_field else []),
+            *(meta.where or {}),
+        ]
+        models = [meta.model, *versions.get_related_models(meta.model, paths)]
+        for model in meta.cache_models or []:
+            if model not in models:
+                models.append(model)
+
+        return models
+
     def get_fields(self) -> Optional[List[str]]:
         # TODO: for some reason mypy complains about this one line
         return self._meta.fields  # type: ignore
@@ -30,12 +118,99 @@ class ModelDataMixin:
     def convert_to_df(self, data: Any, columns: Optional[List] = None) -> pd.DataFrame:
         return pd.DataFrame(data, columns=columns)
 
+    @property
+    def bucket_field_name(self) -> Optional[str]:
+        if not self._meta.time_bucket:
+            return None
+
+        return f"{self._meta.time_field}_{self._meta.time_bucket}"
+
+    def get_aggregate_fields(self) -> List[str]:
+        """
+        Columns of an aggregated dataframe, the time bucket, dimensions then measures.
+        """
+        fields = [self.bucket_field_name] if self.bucket_field_name else []
+
+        return (
+            fields + list(self._meta.dimensions or []) + list(self._meta.measures or {})
+        )
+
+    def aggregate_queryset(self, queryset):
+        """
+        Group queryset by the time bucket and dimensions, annotated with each
+        measure, so the database returns one row per group not every row.
+        """
+        groups = list(self._meta.dimensions or [])
+        bucket = self.bucket_field_name
+        if bucket:
+            queryset = queryset.annotate(
+                **{bucket: Trunc(self._meta.time_field, self._meta.time_bucket)}
+            )
+            groups.insert(0, bucket)
+
+        return (
+            queryset.values(*groups).annotate(**self._meta.measures).order_by(*groups)
+        )
+
     def get_data(self, *args, **kwargs) -> pd.DataFrame:
         fields = self.get_fields()
         queryset = self.get_queryset(*args, **kwargs)
-        if fields:
+        if self._meta.where:
+            queryset = queryset.filter(**self._meta.where)
+
+        if self._meta.sample:
+            queryset = queryset.filter(approximate.Sample(self._meta.sample))
+
+        if self._meta.measures:
+            queryset = self.aggregate_queryset(queryset)
+            fields = self.get_aggregate_fields()
+        elif fields:
             queryset = queryset.values(*fields)
 
+        try:
+            key = (
+                "dataframe",
+                queryset.db,
+                freeze(queryset.query.sql_with_params()),
+                freeze(fields),
+            )
+        except EmptyResultSet:
+            return self.queryset_to_df(queryset, fields)
+
+        # serializers running the same query in a request share the dataframe,
+        # each getting a copy as to_fig may change it in place
+        memo = get_memo(**kwargs)
+        if memo is not None:
+            return memo.get_or_set(
+                key, lambda: self.load_df(queryset, fields, key)
+            ).copy()
+
+        return self.load_df(queryset, fields, key)
+
+    def load_df(self, queryset, fields: Optional[List[str]], key) -> pd.DataFrame:
+        """
+        Load the dataframe, from the frames shared by this host's processes
+        when Meta.dataframe_cache is set.
+        """
+        model = self._meta.model
+        if not self._meta.dataframe_cache or not model or not frames.is_enabled():
+            return self.queryset_to_df(queryset, fields)
+
+        models = self.get_dataframe_cache_models(self._meta)
+        # relations may not have been resolved when the class was defined
+        versions.track(*models)
+        shared_key = repr(
+            (
+                self.__class__.__qualname__,
+                key,
+                sorted(versions.get_versions(models).items()),
+            )
+        )
+        return frames.get_or_set(
+            shared_key, lambda: self.queryset_to_df(queryset, fields)
+        )
+
+    def queryset_to_df(self, queryset, fields: Optional[List[str]]) -> pd.DataFrame:
         try:
             df = self.convert_to_df(queryset.iterator(), fields)
         except KeyError:
@@ -44,7 +219,9 @@ class ModelDataMixin:
 
     def get_queryset(self, *args, **kwargs):
         if self._meta.model is not None:
-            queryset = self._meta.model._default_manager.all()
+            queryset = self._meta.model._default_manager.using(
+                routing.get_database(self._meta.model, self._meta.using)
+            )
         else:
             raise ImproperlyConfigured(
                 "%(self)s is missing a QuerySet. Define "
@@ -55,17 +232,61 @@ class ModelDataMixin:
         return queryset
 
 
+# applied over charts in dark mode by the client, see get_themes
+DARK_LAYOUT = {
+    "template": "plotly_dark",
+    "plot_bgcolor": "rgba(0,0,0,0.05)",
+    "paper_bgcolor": "rgba(0,0,0,0.05)",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def get_themes() -> Dict[str, Dict[str, Any]]:
+    """
+    Layout the client applies over a chart for each appearance, so charts are
+    serialized once for every appearance, and switching needs no refetch.
+    """
+    dark = {**DARK_LAYOUT, "template": pio.templates["plotly_dark"]}
+
+    return {"dark": json.loads(pio.json.to_json_plotly(dark))}
+
+
+@functools.lru_cache(maxsize=None)
+def get_themes_script() -> SafeString:
+    return json_script(get_themes(), "dashboards-chart-themes")
+
+
+def render_themes(request: Optional[HttpRequest] = None) -> str:
+    """
+    The script holding the chart themes Dashboard.newPlot applies, rendered
+    once per request by whichever of the {% chart_themes %} tag and
+    Dashboard.render comes first, so every page showing a dashboard has it.
+    """
+    memo = RequestMemo.for_request(request)
+    if memo is not None:
+        if ("chart_themes",) in memo:
+            return ""
+        memo.get_or_set(("chart_themes",), lambda: True)
+
+    return get_themes_script()
+
+
 class PlotlyChartSerializerMixin:
     template_name: str = "dashboards/components/chart/plotly.html"
     meta_layout_attrs = ["title", "width", "height"]
     layout: Optional[Dict[str, Any]] = None
 
     _meta: Type[Any]
+    # encoded layout for dict figures, see get_layout_json
+    _layout_json: str
 
     class Meta:
         displayModeBar: Optional[bool] = True
         staticPlot: Optional[bool] = False
         responsive: Optional[bool] = True
+        delta_max_points: Optional[int] = None
+        lane: Optional[str] = None  # see DASHBOARDS_LANES
+        offload: bool = True  # build figures in DASHBOARDS_CHART_PROCESSES
 
     def empty_chart(self) -> str:
         return json.dumps(
@@ -93,48 +314,188 @@ class PlotlyChartSerializerMixin:
             layout.setdefault(attr, getattr(self._meta, attr))
 
         if dark:
-            fig = fig.update_layout(
-                template="plotly_dark",
-                plot_bgcolor="rgba(0,0,0,0.05)",
-                paper_bgcolor="rgba(0,0,0,0.05)",
-            )
+            fig = fig.update_layout(**DARK_LAYOUT)
+
+        annotation = self.get_approximate_annotation()
+        if annotation:
+            fig = fig.add_annotation(**annotation)
 
         return fig.update_layout(**layout)
 
+    def get_approximate_annotation(self) -> Optional[Dict[str, Any]]:
+        """
+        Marks a chart of a sample of the data as approximate.
+        """
+        sample = getattr(self._meta, "sample", None)
+        if not sample:
+            return None
+
+        return {
+            "text": f"\u2248 {sample * 100:g}% sample",
+            "xref": "paper",
+            "yref": "paper",
+            "x": 1,
+            "y": 1,
+            "xanchor": "right",
+            "yanchor": "bottom",
+            "showarrow": False,
+            "font": {"size": 10},
+        }
+
+    def get_layout(self) -> Dict[str, Any]:
+        """
+        Layout of dict figures, equivalent to what apply_layout sets on a
+        go.Figure, including the full theme template.
+        """
+        template = pio.templates.default
+        layout: Dict[str, Any] = {}
+        if template:
+            layout["template"] = pio.templates[template].to_plotly_json()
+
+        layout.update(self.layout or {})
+        for attr in self.meta_layout_attrs:
+            value = getattr(self._meta, attr)
+            if value is not None:
+                layout.setdefault(attr, value)
+
+        annotation = self.get_approximate_annotation()
+        if annotation:
+            layout["annotations"] = [*layout.get("annotations", []), annotation]
+
+        return layout
+
+    @classmethod
+    def get_layout_json(cls) -> str:
+        """
+        The encoded layout, which is the same for every figure, so encoded
+        once per class.
+        """
+        if "_layout_json" not in cls.__dict__:
+            cls._layout_json = pio.json.to_json_plotly(cls().get_layout())
+
+        return cls._layout_json
+
+    def encode_figure(self, fig: figures.Figure) -> str:
+        """
+        Encode a dict figure, splicing its traces into the pre-encoded layout.
+        """
+        data = pio.json.to_json_plotly(fig.get("data", []))
+        if fig.get("layout"):
+            layout = pio.json.to_json_plotly({**self.get_layout(), **fig["layout"]})
+        else:
+            layout = self.get_layout_json()
+
+        return f'{{"data":{data},"layout":{layout}}}'
+
     def get_data(self, *args, **kwargs) -> pd.DataFrame:
         raise NotImplementedError
 
-    def to_fig(self, data: Any) -> go.Figure:
+    def to_fig(self, data: Any) -> Union[go.Figure, figures.Figure]:
+        """
+        Build the figure, either a go.Figure or, faster for large data, a dict
+        figure, see dashboards.component.chart.figures.
+        """
         raise NotImplementedError
 
     @classmethod
     def serialize(cls, **kwargs) -> str:
         self = cls()
-        request = kwargs.get("request")
-        df = self.get_data(**kwargs)
+        with profiling.phase("fetch"):
+            df = self.get_data(**kwargs)
 
-        if isinstance(df, pd.DataFrame) and df.empty:
-            return self.empty_chart()
+        with profiling.phase("serialize"):
+            if isinstance(df, pd.DataFrame) and df.empty:
+                return self.empty_chart()
 
-        fig = self.to_fig(df)
-        fig = self.apply_layout(
-            fig, dark=request and request.COOKIES.get("appearanceMode") == "dark"
-        )
+            # the same for every appearance, themed by the client
+            if (
+                self._meta.offload
+                and isinstance(df, pd.DataFrame)
+                and offload.is_enabled()
+            ):
+                return offload.run(cls.build_figure_json, df)
+
+            return cls.build_figure_json(df)
+
+    @classmethod
+    def build_figure_json(cls, data: Any) -> str:
+        """
+        The CPU bound part of serializing, building the figure from the data
+        and encoding it, which may run in another process.
+        """
+        self = cls()
+        fig = self.to_fig(data)
+        if isinstance(fig, dict):
+            return self.encode_figure(fig)
+
+        fig = self.apply_layout(fig)
 
         return fig.to_json()
 
+    def get_cursor(self, *args, **kwargs) -> Any:
+        """
+        The cursor a polling client starts from, required alongside get_data_since.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def serialize_cursor(cls, **kwargs) -> Any:
+        return cls().get_cursor(**kwargs)
+
+    def to_delta(self, data: Any) -> Dict[str, Any]:
+        """
+        Convert new data into a Plotly.extendTraces update, by default building
+        the figure for the new data and taking x/y from each of its traces.
+        """
+        fig = self.to_fig(data)
+        if isinstance(fig, dict):
+            traces = [(trace.get("x"), trace.get("y")) for trace in fig.get("data", [])]
+        else:
+            traces = [(trace.x, trace.y) for trace in fig.data]
+
+        update = {
+            "x": [x if x is not None else [] for x, _ in traces],
+            "y": [y if y is not None else [] for _, y in traces],
+        }
+
+        return {"update": update, "traces": list(range(len(traces)))}
+
+    @classmethod
+    def serialize_since(cls, cursor: Any, **kwargs) -> Dict[str, Any]:
+        """
+        Serialize only the points added since cursor, for serializers which
+        implement get_data_since(cursor, **kwargs) -> (data, next_cursor).
+        """
+        self = cls()
+        data, next_cursor = self.get_data_since(cursor, **kwargs)  # type: ignore
+
+        if isinstance(data, pd.DataFrame) and data.empty:
+            delta: Dict[str, Any] = {"update": {}, "traces": []}
+        else:
+            delta = self.to_delta(data)
+
+        delta["cursor"] = next_cursor
+        delta["max_points"] = self._meta.delta_max_points
+
+        # numpy/pandas values, including a cursor from the dataframe, are
+        # encoded by plotly then loaded back to plain types
+        return json.loads(pio.to_json(delta, validate=False))
+
     @classmethod
-    def render(cls, template_id, **kwargs) -> str:
+    def render(cls, template_id, serialized=None, **kwargs) -> str:
         self = cls()
-        value = cls.serialize(**kwargs)
+        value = cls.serialize(**kwargs) if serialized is None else serialized
         context = {
             "template_id": template_id,
             "value": value,
             "displayModeBar": self._meta.displayModeBar,
             "staticPlot": self._meta.staticPlot,
             "responsive": self._meta.responsive,
+            "cursor": kwargs.get("cursor"),
+            "poll_rate": kwargs.get("poll_rate"),
+            "defer_url": kwargs.get("defer_url"),
         }
-        return render_to_string(cls.template_name, context)
+        return rendering.render_to_string(cls.template_name, context)
 
 
 class BaseChartSerializer(ClassWithMeta, asset_definitions.MediaDefiningClass):
@@ -1,13 +1,12 @@
 from dataclasses import asdict, dataclass
-from typing import Any, Dict, Literal, Optional, Type
+from typing import Any, Dict, Literal, Optional, Set, Type
 
-from django.http import HttpRequest
-from django.urls import reverse
+from django.http import HttpRequest, QueryDict
 
-from .. import config
+from .. import config, url_templates
 from ..forms import DashboardForm
 from ..types import ValueData
-from .base import Component, value_render_encoder
+from .base import PREVIOUS_FILTERS_PARAM, Component, value_render_encoder
 
 
 @dataclass
@@ -16,6 +15,7 @@ class FormData:
     form: list[dict[str, Any]]
     method: str
     dependents: Optional[list[str]] = None
+    previous: Optional[str] = None
 
 
 @dataclass
@@ -60,7 +60,7 @@ class Form(Component):
             # <str:app_label>/<str:dashboard>/<str:lookup>/<str:component>/
             args.insert(2, getattr(self.object, self.dashboard._meta.lookup_field))
 
-        return reverse("dashboards:form_component", args=args)
+        return url_templates.reverse_args("dashboards:form_component", args)
 
     def get_form(self, request: HttpRequest = None) -> DashboardForm:
         if not self.form:
@@ -79,6 +79,47 @@ class Form(Component):
         form = self.form(data=data)
         return form
 
+    def get_form_data(self, request: HttpRequest = None) -> Optional[QueryDict]:
+        if not request:
+            return None
+
+        return request.POST if request.method == "POST" else request.GET
+
+    def tracks_changes(self) -> bool:
+        """
+        Only track previous values if a dependent declares the filters it consumes.
+        """
+        return any(
+            c and c.consumes is not None for c in self.dependent_components or []
+        )
+
+    def get_previous(self, request: HttpRequest = None) -> str:
+        """
+        Current form values, sent back with the next submit so the changed
+        filters can be worked out.
+        """
+        previous = QueryDict(mutable=True)
+        data = self.get_form_data(request)
+        if data and self.form:
+            for name in self.form.base_fields:
+                if name in data:
+                    previous.setlist(name, data.getlist(name))
+
+        return previous.urlencode()
+
+    def get_changed_filters(self, request: HttpRequest) -> Optional[Set[str]]:
+        data = self.get_form_data(request)
+        if not data or PREVIOUS_FILTERS_PARAM not in data or not self.form:
+            return None
+
+        previous = QueryDict(data[PREVIOUS_FILTERS_PARAM])
+
+        return {
+            name
+            for name in self.form.base_fields
+            if data.getlist(name) != previous.getlist(name)
+        }
+
     def get_value(
         self,
         request: HttpRequest = None,
@@ -91,6 +132,7 @@ class Form(Component):
             form=form,
             action=self.get_submit_url(),
             dependents=self.dependents,
+            previous=self.get_previous(request) if self.tracks_changes() else None,
         )
         value = asdict(form_data, dict_factory=value_render_encoder)
 
@@ -1,13 +1,18 @@
 import copy
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlencode
 
+from django.core.cache import caches
+from django.core.cache.utils import make_template_fragment_key
 from django.template import Context, Template
-from django.template.loader import render_to_string
 from django.utils.safestring import mark_safe
+from django.utils.text import slugify
 
-from .. import config
+from .. import config, permissions, rendering, url_templates
+from ..memo import freeze
 from . import CTA
+from .base import DEFER_TOKEN_PLACEHOLDERS, PAGE_TOKEN_PARAM, get_defer_tokens
 
 
 CARD_CLASSES: Dict[str, str] = {
@@ -40,6 +45,24 @@ DEFAULT_LAYOUT_COMPONENT_CLASSES: Dict[str, Dict[str, str]] = {
 }
 
 
+# query param for the tab shown on load
+TAB_PARAM = "tab"
+
+# component_context keys set while rendering, or which change on first render,
+# rather than part of the layout definition.
+RENDERED_CONTEXT_KEYS = [
+    "components",
+    "tabs",
+    "tab_panels",
+    "first",
+    "active",
+    "layout_component",
+    "actions",
+    "css",
+    "component_css",
+]
+
+
 def css_template(*css_classes):
     css = " ".join(filter(None, css_classes))
     return f"{css}"
@@ -50,15 +73,19 @@ class LayoutBase:
     css_classes: Optional[Union[str, Dict[str, str]]] = None
     grid_css_classes: Optional[str] = None
     layout_components: Tuple[Any, ...]
+    cache_timeout: Optional[int] = None
 
     def __init__(
         self,
         *layout_components,
         css_classes=None,
         grid_css_classes=None,
+        cache_timeout=None,
         **kwargs,
     ):
         self.layout_components = layout_components or ()
+        # opt in to caching the rendered html, for this many seconds
+        self.cache_timeout = cache_timeout
 
         self.component_css = self.get_component_css(css_classes)
 
@@ -89,9 +116,14 @@ class LayoutBase:
 
         return component_css
 
+    def render(self, dashboard, context: Context) -> str:
+        raise NotImplementedError
+
     def get_components_rendered(self, dashboard, context: Context) -> str:
         html = ""
-        dashboard_components = dict([(x.key, x) for x in dashboard.get_components()])
+        dashboard_components = context.get("dashboard_components")
+        if dashboard_components is None:
+            dashboard_components = {x.key: x for x in dashboard.get_components()}
 
         for layout_component in self.layout_components:
             dashboard_component = None
@@ -100,13 +132,143 @@ class LayoutBase:
             if isinstance(layout_component, str):
                 dashboard_component = dashboard_components.get(layout_component)
 
-            if hasattr(layout_component, "render"):
+            if isinstance(layout_component, LayoutBase):
+                html += layout_component.render_cached(
+                    dashboard=dashboard, context=context
+                )
+            elif hasattr(layout_component, "render"):
                 html += layout_component.render(dashboard=dashboard, context=context)
             elif dashboard_component:
                 html += dashboard_component.render(context=context)
 
         return mark_safe(html)
 
+    def get_cache_vary_on(
+        self, dashboard, request, components: Dict[str, Any]
+    ) -> Optional[List[Any]]:
+        """
+        Everything the rendered html depends on, None if any child component
+        can't be cached.
+        """
+        vary_on: List[Any] = [
+            self.__class__.__name__,
+            self.template_name,
+            self.grid_css_classes,
+            self.component_css,
+        ]
+        filters = None
+        for layout_component in self.layout_components:
+            if isinstance(layout_component, LayoutBase):
+                child_vary_on = layout_component.get_cache_vary_on(
+                    dashboard, request, components
+                )
+                if child_vary_on is None:
+                    return None
+                vary_on.append(child_vary_on)
+            elif isinstance(layout_component, str):
+                component = components.get(layout_component)
+                if component is None:
+                    continue
+                if filters is None:
+                    filters = component.get_filters(request)
+                version = component.get_cache_version(request=request, filters=filters)
+                if version is None:
+                    return None
+                vary_on.append((layout_component, version))
+            else:
+                vary_on.append(getattr(layout_component, "html", layout_component))
+
+        return vary_on
+
+    def get_cache_key(self, dashboard, context: Context) -> Optional[str]:
+        request = context.get("request")
+        components = context.get("dashboard_components")
+        if components is None:
+            components = {x.key: x for x in dashboard.get_components()}
+
+        vary_on = self.get_cache_vary_on(dashboard, request, components)
+        if vary_on is None:
+            return None
+
+        obj = dashboard.object
+        vary_on += [
+            getattr(obj, "pk", obj),
+            freeze(request.GET.dict()) if request else None,
+            # layouts and components render with the request, so may show the user
+            permissions.get_permission_fingerprint(request),
+            freeze(
+                {
+                    k: v
+                    for k, v in self.component_context.items()
+                    if k not in RENDERED_CONTEXT_KEYS
+                }
+            ),
+        ]
+
+        return make_template_fragment_key(
+            f"dashboards.layout.{dashboard.get_slug()}", [repr(freeze(vary_on))]
+        )
+
+    def render_cached(self, dashboard, context: Context) -> str:
+        """
+        Render, using the cached html when cache_timeout is set and nothing this
+        layout depends on has changed.
+        """
+        key = None
+        if self.cache_timeout is not None:
+            key = self.get_cache_key(dashboard=dashboard, context=context)
+
+        if key is None:
+            return self.render(dashboard=dashboard, context=context)
+
+        request = context.get("request")
+        cache = caches[config.Config().DASHBOARDS_CACHE_ALIAS]
+        html = cache.get(key)
+        if html is None:
+            html = str(self.render(dashboard=dashboard, context=context))
+            cache.set(
+                key, self.strip_tokens(html, dashboard, request), self.cache_timeout
+            )
+        else:
+            html = self.restore_tokens(html, dashboard, request)
+
+        return mark_safe(html)
+
+    def strip_tokens(self, html: str, dashboard, request) -> str:
+        """
+        Replace this request's access and page tokens in html with placeholders,
+        they are only valid for this user and for a limited time.
+        """
+        if request is None:
+            return html
+
+        tokens = get_defer_tokens(request, dashboard)
+        for param, placeholder in DEFER_TOKEN_PLACEHOLDERS.items():
+            if param in tokens:
+                html = html.replace(
+                    urlencode({param: tokens[param]}), f"{param}={placeholder}"
+                )
+
+        return html
+
+    def restore_tokens(self, html: str, dashboard, request) -> str:
+        """
+        Replace the placeholders in cached html with this request's tokens.
+        """
+        for param, placeholder in DEFER_TOKEN_PLACEHOLDERS.items():
+            stand_in = f"{param}={placeholder}"
+            if stand_in not in html:
+                continue
+
+            if param == PAGE_TOKEN_PARAM:
+                # creates this page's shared context, and its token
+                dashboard.shared_context
+
+            token = get_defer_tokens(request, dashboard).get(param) if request else None
+            html = html.replace(stand_in, urlencode({param: token}) if token else "")
+
+        return html
+
 
 class ComponentLayout(LayoutBase):
     """
@@ -145,7 +307,7 @@ class HTMLComponentLayout(ComponentLayout):
             }
         )
 
-        return render_to_string(
+        return rendering.render_to_string(
             self.template_name, context=component_context, request=request
         )
 
@@ -205,22 +367,55 @@ class TabContainer(HTMLComponentLayout):
         Dict[str, str]
     ] = config.Config().DASHBOARDS_LAYOUT_COMPONENT_CLASSES["TabContainer"]
 
+    def __init__(self, *layout_components, lazy: bool = False, **kwargs):
+        super().__init__(*layout_components, **kwargs)
+        # only render the active tab, fetching others when first shown
+        self.lazy = lazy
+
+    def get_cache_vary_on(
+        self, dashboard, request, components: Dict[str, Any]
+    ) -> Optional[List[Any]]:
+        vary_on = super().get_cache_vary_on(dashboard, request, components)
+        return vary_on + [self.lazy] if vary_on is not None else None
+
+    def get_active_tab(self, request) -> "Tab":
+        active = request.GET.get(TAB_PARAM) if request else None
+        for tab in self.layout_components:
+            if active and tab.get_slug() == active:
+                return tab
+
+        return self.layout_components[0]
+
     def render(self, dashboard, context: Context, **kwargs) -> str:
-        tab_panels = self.get_components_rendered(dashboard, context)
+        request = context.get("request")
+        active = self.get_active_tab(request)
+
+        if self.lazy:
+            tab_panels = mark_safe(
+                "".join(
+                    tab.render_cached(dashboard=dashboard, context=context)
+                    if tab is active
+                    else tab.render_lazy(dashboard=dashboard, context=context)
+                    for tab in self.layout_components
+                )
+            )
+        else:
+            tab_panels = self.get_components_rendered(dashboard, context)
+
         # make tab links for each tab
         tabs = "".join(tab.render_tab() for tab in self.layout_components)
 
-        request = context.get("request")
         component_context = super().get_component_context()
         component_context.update(
             {
                 "tabs": tabs,
                 "tab_panels": tab_panels,
                 "first": self.layout_components[0],
+                "active": active,
             }
         )
 
-        html = render_to_string(
+        html = rendering.render_to_string(
             self.template_name, context=component_context, request=request
         )
         return mark_safe(html)
@@ -242,9 +437,52 @@ class Tab(HTMLComponentLayout):
 
         return component_context
 
+    def get_slug(self) -> str:
+        return slugify(self.tab_label)
+
+    def get_absolute_url(self, dashboard) -> str:
+        """
+        Get the url lazy tabs fetch their components from.
+        """
+        # <str:app_label>/<str:dashboard>/@tab/<str:tab>/
+        args = [dashboard._meta.app_label, dashboard.class_name(), self.get_slug()]
+
+        # if this is for an object then add lookup param to args
+        if dashboard.object:
+            # <str:app_label>/<str:dashboard>/<str:lookup>/@tab/<str:tab>/
+            args.insert(2, getattr(dashboard.object, dashboard._meta.lookup_field))
+
+        return url_templates.reverse_args("dashboards:dashboard_tab", args)
+
+    def render_lazy(self, dashboard, context: Context) -> str:
+        """
+        Render the tab with a placeholder which fetches its components when shown.
+        """
+        request = context.get("request")
+        url = self.get_absolute_url(dashboard)
+        if getattr(dashboard, "page_token", None):
+            url = f"{url}?{urlencode({PAGE_TOKEN_PARAM: dashboard.page_token})}"
+
+        component_context = {
+            **self.get_component_context(),
+            "components": rendering.render_to_string(
+                "dashboards/layout/components/tabs/lazy.html",
+                {
+                    "url": url,
+                    "defer_loading": rendering.render_static(
+                        "dashboards/components/loading.html"
+                    ),
+                },
+            ),
+        }
+
+        return rendering.render_to_string(
+            self.template_name, context=component_context, request=request
+        )
+
     def render_tab(self):
         return mark_safe(
-            render_to_string(
+            rendering.render_to_string(
                 "dashboards/layout/components/tabs/tab.html",
                 {
                     "tab_label": self.tab_label,
@@ -263,9 +501,15 @@ class Tab(HTMLComponentLayout):
 class HTML:
     html: str
 
+    def __post_init__(self):
+        self.template = Template(self.html)
+
     def render(self, *args, context: Context, **kwargs):
-        to_render = f"{self.html}"
-        return Template(to_render).render(context=Context(context))
+        # html may be changed after definition, only recompile if it has
+        if self.template.source != self.html:
+            self.template = Template(self.html)
+
+        return self.template.render(context=Context(context))
 
 
 @dataclass
@@ -281,3 +525,4 @@ class Header(HTML):
 
     def __post_init__(self):
         self.html = f"<h{self.size}>{self.heading}</h{self.size}>"
+        super().__post_init__()
@@ -3,13 +3,13 @@ from datetime import timedelta
 from typing import Any, Optional, Type
 
 from django.core.exceptions import ImproperlyConfigured
-from django.db.models import Aggregate, Model, QuerySet
-from django.template.loader import render_to_string
+from django.db.models import Aggregate, Count, Model, QuerySet
 from django.utils import timezone
 from django.utils.timesince import timesince
 
 import asset_definitions
 
+from dashboards import approximate, rendering, routing
 from dashboards.meta import ClassWithMeta
 
 
@@ -20,6 +20,7 @@ class StatSerializerData:
     previous: Optional[Any] = None
     unit: Optional[str] = ""
     change_period: Optional[str] = ""
+    approximate: bool = False
     change: Optional[float] = field(init=False)
 
     def __post_init__(self):
@@ -39,8 +40,11 @@ class BaseStatSerializer(ClassWithMeta):
         annotation_field: str
         annotation: Aggregate
         model: Optional[Model] = None
+        using: Optional[str] = None  # database alias, see DASHBOARDS_DATABASE_ALIAS
         title: Optional[str] = ""
         unit: Optional[str] = ""
+        lane: Optional[str] = None  # see DASHBOARDS_LANES
+        estimate_count: bool = False  # use the planner's row estimate, see get_estimate
 
     _meta: Type["BaseStatSerializer.Meta"]
 
@@ -61,8 +65,44 @@ class BaseStatSerializer(ClassWithMeta):
         if not hasattr(resolved_meta_class, "title"):
             resolved_meta_class.title = resolved_meta_class.verbose_name
 
+        if resolved_meta_class.estimate_count and (
+            getattr(resolved_meta_class, "annotation", None) is not Count
+        ):
+            raise ImproperlyConfigured(
+                "%(cls)s.Meta.estimate_count requires annotation = Count."
+                % {"cls": cls.__name__}
+            )
+
         return resolved_meta_class
 
+    @property
+    def approximate(self) -> bool:
+        """
+        Whether the value is estimated, ApproxCountDistinct is exact on
+        databases which can't estimate it.
+        """
+        annotation = getattr(self._meta, "annotation", None)
+        if not (
+            isinstance(annotation, type)
+            and issubclass(annotation, approximate.ApproxCountDistinct)
+        ):
+            return False
+
+        return annotation.is_estimated(self.get_queryset().db)
+
+    def get_estimate(self) -> Optional[int]:
+        """
+        With Meta.estimate_count, the database's estimate of the model's rows
+        in place of counting them, None when it has no estimate. Estimates the
+        whole table, so only for serializers counting every row.
+        """
+        if not self._meta.estimate_count or self._meta.model is None:
+            return None
+
+        return approximate.estimate_count(
+            self._meta.model, routing.get_database(self._meta.model, self._meta.using)
+        )
+
     @property
     def annotated_field_name(self) -> str:
         return f"{self._meta.annotation.name.lower()}_{self._meta.annotation_field}"
@@ -81,7 +121,9 @@ class BaseStatSerializer(ClassWithMeta):
 
     def get_queryset(self, *args, **kwargs) -> QuerySet:
         if self._meta.model is not None:
-            queryset = self._meta.model._default_manager.all()
+            queryset = self._meta.model._default_manager.using(
+                routing.get_database(self._meta.model, self._meta.using)
+            )
         else:
             raise ImproperlyConfigured(
                 "%(self)s is missing a QuerySet. Define "
@@ -110,22 +152,24 @@ class StatSerializer(BaseStatSerializer, asset_definitions.MediaDefiningClass):
     @classmethod
     def serialize(cls, **kwargs) -> StatSerializerData:
         self = cls()
+        estimate = self.get_estimate()
 
         return StatSerializerData(
             title=self._meta.verbose_name,
-            value=self.get_value(),
+            value=self.get_value() if estimate is None else estimate,
             unit=self._meta.unit,
+            approximate=self.approximate or estimate is not None,
         )
 
     @classmethod
-    def render(cls, **kwargs) -> str:
-        value = cls.serialize(**kwargs)
+    def render(cls, serialized=None, **kwargs) -> str:
+        value = cls.serialize(**kwargs) if serialized is None else serialized
         context = {
             "rendered_value": value,
             **kwargs,
         }
 
-        return render_to_string(cls.template_name, context)
+        return rendering.render_to_string(cls.template_name, context)
 
 
 class StatDateChangeSerializer(StatSerializer):
@@ -166,6 +210,7 @@ class StatDateChangeSerializer(StatSerializer):
             previous=self.get_previous(),
             unit=self._meta.unit,
             change_period=self.get_change_period(),
+            approximate=self.approximate,
         )
 
     @property
@@ -1,5 +1,11 @@
-from .serializers import SerializedTable, TableSerializer
+from .serializers import SerializedTable, SerializedTableDelta, TableSerializer
 from .table import BasicTable, Table
 
 
-__all__ = ["BasicTable", "Table", "TableSerializer", "SerializedTable"]
+__all__ = [
+    "BasicTable",
+    "Table",
+    "TableSerializer",
+    "SerializedTable",
+    "SerializedTableDelta",
+]
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from datetime import datetime
 from functools import reduce
-from typing import Any, Dict, List, Optional, Type
+from typing import Any, Dict, List, Optional, Type, Union
 
 from django.contrib.humanize.templatetags.humanize import naturaltime
 from django.core.exceptions import ImproperlyConfigured
@@ -9,6 +9,7 @@ from django.db.models import Model, QuerySet
 
 import asset_definitions
 
+from dashboards import profiling, routing, url_templates
 from dashboards.log import logger
 from dashboards.meta import ClassWithMeta
 
@@ -26,6 +27,13 @@ class SerializedTable:
     filtered: Optional[int] = 0
 
 
+@dataclass
+class SerializedTableDelta:
+    data: List[Dict[str, Any]]
+    cursor: Any = None
+    row_id: Optional[str] = None
+
+
 class BaseTableSerializer(
     ClassWithMeta, asset_definitions.MediaDefiningClass, TableDataProcessorMixin
 ):
@@ -33,8 +41,11 @@ class BaseTableSerializer(
         columns: Dict[str, str]
         order: List[str]
         title: Optional[str] = None
-        first_as_absolute_url = False
+        first_as_absolute_url: Union[bool, str] = False
+        absolute_url_field = "pk"
         force_lower = True
+        row_id: Optional[str] = None
+        lane: Optional[str] = None  # see DASHBOARDS_LANES
 
     @classmethod
     def preprocess_meta(cls, current_class_meta):
@@ -58,8 +69,14 @@ class BaseTableSerializer(
     @classmethod
     def serialize(cls, **serialize_kwargs) -> SerializedTable:
         self = cls()
+        with profiling.phase("fetch"):
+            data = self.get_data(**serialize_kwargs)
+
+        with profiling.phase("serialize"):
+            return self.serialize_data(data, **serialize_kwargs)
+
+    def serialize_data(self, data: Any, **serialize_kwargs) -> SerializedTable:
         filters = serialize_kwargs.get("filters", {})
-        data = self.get_data(**serialize_kwargs)
         columns = self._meta.columns
         fields = list(columns)
 
@@ -87,41 +104,10 @@ class BaseTableSerializer(
         if self.count(data) > 0:
             page_obj, filtered_count = self.apply_paginator(data, start, length)
 
-            for obj in page_obj.object_list:
-                values = {}
-                for field in fields:
-                    if not isinstance(obj, dict):
-                        # reduce is used to allow relations to be traversed.
-                        try:
-                            value = reduce(getattr, field.split("__"), obj)
-                        except AttributeError:
-                            logger.warn(f"{field} is not a attribute for this object.")
-                            value = None
-                    else:
-                        value = obj.get(field)
-
-                    if value and isinstance(value, datetime):
-                        value = naturaltime(value)
-
-                    elif isinstance(value, bool):
-                        value = "Yes" if value else "No"
-
-                    elif value is None:
-                        value = "-"
-
-                    if (
-                        field == fields[0]
-                        and self._meta.first_as_absolute_url
-                        and hasattr(obj, "get_absolute_url")
-                    ):
-                        value = f'<a href="{obj.get_absolute_url()}">{value}</a>'
-
-                    if hasattr(self, f"get_{field}_value"):
-                        value = getattr(self, f"get_{field}_value")(obj)
-
-                    values[field] = value
-
-                processed_data.append(values)
+            objects = list(page_obj.object_list)
+            urls = self.get_absolute_urls(objects)
+            for obj, url in zip(objects, urls):
+                processed_data.append(self.format_row(obj, fields, absolute_url=url))
 
         order = [0, "asc"]
         if hasattr(self._meta, "order"):
@@ -143,6 +129,100 @@ class BaseTableSerializer(
             filtered=filtered_count,
         )
 
+    def get_absolute_urls(self, objects: List[Any]) -> List[Optional[str]]:
+        """
+        Urls the first column of each row links to. When first_as_absolute_url is a
+        url name, urls are built together from absolute_url_field so the url pattern
+        is resolved once, rather than reversed by get_absolute_url for every row.
+        """
+        first_as_absolute_url = self._meta.first_as_absolute_url
+        if not first_as_absolute_url:
+            return [None] * len(objects)
+
+        if isinstance(first_as_absolute_url, str):
+            return list(
+                url_templates.reverse_many(
+                    first_as_absolute_url,
+                    (
+                        [self.get_field_value(obj, self._meta.absolute_url_field)]
+                        for obj in objects
+                    ),
+                )
+            )
+
+        return [
+            obj.get_absolute_url() if hasattr(obj, "get_absolute_url") else None
+            for obj in objects
+        ]
+
+    def get_field_value(self, obj: Any, field: str) -> Any:
+        if isinstance(obj, dict):
+            return obj.get(field)
+
+        # reduce is used to allow relations to be traversed.
+        try:
+            return reduce(getattr, field.split("__"), obj)
+        except AttributeError:
+            logger.warn(f"{field} is not a attribute for this object.")
+            return None
+
+    def format_row(
+        self, obj: Any, fields: List[str], absolute_url: Optional[str] = None
+    ) -> Dict[str, Any]:
+        values = {}
+        for field in fields:
+            value = self.get_field_value(obj, field)
+
+            if value and isinstance(value, datetime):
+                value = naturaltime(value)
+
+            elif isinstance(value, bool):
+                value = "Yes" if value else "No"
+
+            elif value is None:
+                value = "-"
+
+            if field == fields[0] and absolute_url:
+                value = f'<a href="{absolute_url}">{value}</a>'
+
+            if hasattr(self, f"get_{field}_value"):
+                value = getattr(self, f"get_{field}_value")(obj)
+
+            values[field] = value
+
+        return values
+
+    @classmethod
+    def serialize_since(cls, cursor: Any, **serialize_kwargs) -> SerializedTableDelta:
+        """
+        Serialize only the rows appended or changed since cursor, for serializers
+        which implement get_data_since(cursor, **kwargs) -> (rows, next_cursor).
+        Rows sharing a Meta.row_id with an existing row replace it.
+        """
+        self = cls()
+        data, next_cursor = self.get_data_since(cursor, **serialize_kwargs)  # type: ignore
+        data = list(data)
+        fields = list(self._meta.columns)
+
+        return SerializedTableDelta(
+            data=[
+                self.format_row(obj, fields, absolute_url=url)
+                for obj, url in zip(data, self.get_absolute_urls(data))
+            ],
+            cursor=next_cursor,
+            row_id=self._meta.row_id,
+        )
+
+    def get_cursor(self, *args, **kwargs) -> Any:
+        """
+        The cursor a polling client starts from, required alongside get_data_since.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def serialize_cursor(cls, **kwargs) -> Any:
+        return cls().get_cursor(**kwargs)
+
     def get_data(self, *args, **kwargs):
         raise NotImplementedError
 
@@ -160,9 +240,13 @@ class TableSerializer(BaseTableSerializer):
         columns: Dict[str, str]
         order: List[str]
         title: Optional[str] = None
-        first_as_absolute_url = False
+        first_as_absolute_url: Union[bool, str] = False
+        absolute_url_field = "pk"
         force_lower = True
+        row_id: Optional[str] = None
+        lane: Optional[str] = None  # see DASHBOARDS_LANES
         model: Optional[Model] = None
+        using: Optional[str] = None  # database alias, see DASHBOARDS_DATABASE_ALIAS
 
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
@@ -175,7 +259,9 @@ class TableSerializer(BaseTableSerializer):
 
     def get_queryset(self, *args, **kwargs) -> QuerySet:
         if self._meta.model is not None:
-            queryset = self._meta.model._default_manager.all()
+            queryset = self._meta.model._default_manager.using(
+                routing.get_database(self._meta.model, self._meta.using)
+            )
         else:
             raise ImproperlyConfigured(
                 "%(self)s is missing a QuerySet. Define "
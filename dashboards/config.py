@@ -42,6 +42,174 @@ class Config:
             True,
         )
 
+    @property
+    def DASHBOARDS_PROFILING(cls) -> bool:
+        return getattr(
+            settings,
+            "DASHBOARDS_PROFILING",
+            False,
+        )
+
+    @property
+    def DASHBOARDS_CACHE_ALIAS(cls) -> str:
+        return getattr(
+            settings,
+            "DASHBOARDS_CACHE_ALIAS",
+            "default",
+        )
+
+    @property
+    def DASHBOARDS_JOB_BACKEND(cls) -> str:
+        return getattr(
+            settings,
+            "DASHBOARDS_JOB_BACKEND",
+            "dashboards.jobs.ThreadPoolBackend",
+        )
+
+    @property
+    def DASHBOARDS_JOB_WORKERS(cls) -> int:
+        return getattr(
+            settings,
+            "DASHBOARDS_JOB_WORKERS",
+            4,
+        )
+
+    @property
+    def DASHBOARDS_JOB_TIMEOUT(cls) -> int:
+        return getattr(
+            settings,
+            "DASHBOARDS_JOB_TIMEOUT",
+            300,
+        )
+
+    @property
+    def DASHBOARDS_JOB_POLL_INTERVAL(cls) -> int:
+        return getattr(
+            settings,
+            "DASHBOARDS_JOB_POLL_INTERVAL",
+            2,
+        )
+
+    @property
+    def DASHBOARDS_JOB_LONG_POLL(cls) -> int:
+        return getattr(
+            settings,
+            "DASHBOARDS_JOB_LONG_POLL",
+            0,
+        )
+
+    @property
+    def DASHBOARDS_SHARED_CONTEXT_TIMEOUT(cls) -> int:
+        return getattr(
+            settings,
+            "DASHBOARDS_SHARED_CONTEXT_TIMEOUT",
+            300,
+        )
+
+    @property
+    def DASHBOARDS_DATABASE_ALIAS(cls) -> Optional[str]:
+        return getattr(
+            settings,
+            "DASHBOARDS_DATABASE_ALIAS",
+            None,
+        )
+
+    @property
+    def DASHBOARDS_REPLICA_LAG(cls) -> Optional[float]:
+        return getattr(
+            settings,
+            "DASHBOARDS_REPLICA_LAG",
+            None,
+        )
+
+    @property
+    def DASHBOARDS_DATAFRAME_CACHE_DIR(cls) -> Optional[str]:
+        return getattr(
+            settings,
+            "DASHBOARDS_DATAFRAME_CACHE_DIR",
+            None,
+        )
+
+    @property
+    def DASHBOARDS_DATAFRAME_CACHE_SIZE(cls) -> int:
+        return getattr(
+            settings,
+            "DASHBOARDS_DATAFRAME_CACHE_SIZE",
+            512 * 1024 * 1024,
+        )
+
+    @property
+    def DASHBOARDS_CHART_PROCESSES(cls) -> Optional[int]:
+        return getattr(
+            settings,
+            "DASHBOARDS_CHART_PROCESSES",
+            None,
+        )
+
+    @property
+    def DASHBOARDS_POSTGRES_HLL(cls) -> bool:
+        return getattr(
+            settings,
+            "DASHBOARDS_POSTGRES_HLL",
+            False,
+        )
+
+    @property
+    def DASHBOARDS_LANES(cls) -> Dict[str, int]:
+        return getattr(
+            settings,
+            "DASHBOARDS_LANES",
+            {},
+        )
+
+    @property
+    def DASHBOARDS_LANE_WAIT(cls) -> float:
+        return getattr(
+            settings,
+            "DASHBOARDS_LANE_WAIT",
+            0,
+        )
+
+    @property
+    def DASHBOARDS_LANE_RETRY_AFTER(cls) -> int:
+        return getattr(
+            settings,
+            "DASHBOARDS_LANE_RETRY_AFTER",
+            2,
+        )
+
+    @property
+    def DASHBOARDS_STALE_VALUE_TIMEOUT(cls) -> Optional[int]:
+        return getattr(
+            settings,
+            "DASHBOARDS_STALE_VALUE_TIMEOUT",
+            86400,
+        )
+
+    @property
+    def DASHBOARDS_MEDIA_BUNDLE_DIR(cls) -> Optional[str]:
+        return getattr(
+            settings,
+            "DASHBOARDS_MEDIA_BUNDLE_DIR",
+            None,
+        )
+
+    @property
+    def DASHBOARDS_MENU_PERMISSION_CACHE(cls) -> Optional[int]:
+        return getattr(
+            settings,
+            "DASHBOARDS_MENU_PERMISSION_CACHE",
+            None,
+        )
+
+    @property
+    def DASHBOARDS_COMPONENT_ACCESS_TOKEN_MAX_AGE(cls) -> Optional[int]:
+        return getattr(
+            settings,
+            "DASHBOARDS_COMPONENT_ACCESS_TOKEN_MAX_AGE",
+            None,
+        )
+
     @property
     def DASHBOARDS_COMPONENT_CLASSES(cls) -> Dict[str, Optional[Dict[str, str]]]:
         # default css classes
@@ -1,29 +1,56 @@
-from typing import Any, ClassVar, Dict, List, Optional
+import hashlib
+import uuid
+from graphlib import CycleError, TopologicalSorter
+from typing import Any, ClassVar, Dict, List, Optional, Set, Type
 
+from django.core.cache import caches
 from django.db.models import Model
 from django.http import HttpRequest
 from django.template import Context
-from django.template.loader import render_to_string
-from django.urls import reverse
-from django.utils.module_loading import import_string
 from django.utils.safestring import mark_safe
 from django.utils.text import slugify
 
 import asset_definitions
 
+from dashboards import bundling, rendering, routing, url_templates, versions
 from dashboards.component import Component
-from dashboards.component.layout import Card, ComponentLayout
+from dashboards.component.base import PAGE_TOKEN_PARAM
+from dashboards.component.chart.serializers import render_themes
+from dashboards.component.layout import Card, ComponentLayout, Tab
 from dashboards.config import Config
+from dashboards.exceptions import DependencyError
+from dashboards.limits import Limits
 from dashboards.log import logger
+from dashboards.memo import RequestMemo
 from dashboards.meta import ClassWithAppConfigMeta
-from dashboards.permissions import BasePermission
+from dashboards.permissions import (
+    BasePermission,
+    get_permission_fingerprint,
+    get_permissions,
+    resolve_permission_classes,
+)
 from dashboards.registry import Registrable
 
 
+def get_related_paths(meta) -> List[str]:
+    """
+    Relation paths a ModelDashboard meta selects or prefetches.
+    """
+    return [
+        *(getattr(meta, "select_related", None) or []),
+        *(
+            getattr(lookup, "prefetch_through", lookup)
+            for lookup in getattr(meta, "prefetch_related", None) or []
+        ),
+    ]
+
+
 class Dashboard(
     Registrable, ClassWithAppConfigMeta, asset_definitions.MediaDefiningClass
 ):
     components: Dict[str, Any]
+    _class_media: asset_definitions.Media
+    _shared_context_keys: List[str]
 
     class Meta(ClassWithAppConfigMeta.Meta):
         abstract = True
@@ -32,6 +59,7 @@ class Dashboard(
         template_name: Optional[str] = None
         lookup_kwarg: str = "lookup"  # url parameter name
         lookup_field: str = "pk"  # model field
+        limits: Optional[Limits] = None  # default for components without limits
 
     class Media:
         js = ("dashboards/js/dashboard.js",)
@@ -42,6 +70,11 @@ class Dashboard(
     def __init__(self, *args, **kwargs):
         logger.debug(f"Calling init for {self.class_name()}")
         self.object = None
+        self.request = kwargs.get("request")
+        self.page_token: Optional[str] = None
+        # shared context keys needed, when only part of the dashboard is rendered
+        self.shared_keys: Optional[List[str]] = kwargs.get("shared_keys")
+        self._shared_context: Optional[Dict[str, Any]] = None
         # set component value/defer to be method calls to get_FOO_value, get_FOO_refer if defined on dashboard
         for key, component in self.components.items():
             if hasattr(self, f"get_{key}_value"):
@@ -82,6 +115,11 @@ class Dashboard(
         ):
             cls.components[k] = v
 
+        # bump versions of the models cached component values depend on
+        for component in cls.components.values():
+            if component.cache_timeout is not None:
+                versions.track(*component.get_cache_models())
+
         return super().postprocess_meta(class_meta, resolved_meta_class)
 
     class Layout:
@@ -124,25 +162,107 @@ class Dashboard(
 
         return list(components_to_keys.values())
 
+    def get_tab(self, slug: str) -> Optional[Tab]:
+        """
+        Find a Tab in the layout by its slug.
+        """
+        to_search = [self.Layout.components] if self.Layout.components else []
+        while to_search:
+            layout_component = to_search.pop(0)
+            if (
+                isinstance(layout_component, Tab)
+                and layout_component.get_slug() == slug
+            ):
+                return layout_component
+
+            to_search.extend(getattr(layout_component, "layout_components", []))
+
+        return None
+
+    def get_dependents(
+        self, component: Component, changed: Optional[Set[str]] = None
+    ) -> List[Component]:
+        """
+        Returns the components to recompute when component changes, following
+        dependents of dependents in topological order.
+
+        If the changed filter keys are known, only dependents which consume one
+        of them, or depend on a component being recomputed, are included.
+        """
+        components = {c.key: c for c in self.get_components()}
+
+        # graph of dependent -> the components it depends on
+        graph: Dict[str, Set[str]] = {}
+        to_visit = [component.key]
+        visited = set()
+        while to_visit:
+            key = to_visit.pop()
+            if key in visited:
+                continue
+
+            visited.add(key)
+            for dependent_key in components[key].dependents or []:
+                if dependent_key in components:
+                    graph.setdefault(dependent_key, set()).add(key)  # type: ignore
+                    to_visit.append(dependent_key)
+
+        try:
+            order = list(TopologicalSorter(graph).static_order())
+        except CycleError as e:
+            raise DependencyError(f"{component.key} has circular dependents") from e
+
+        recomputed: Set[str] = set()
+        dependents = []
+        for key in order:
+            if key == component.key:
+                continue
+
+            dependent = components[key]
+            if (
+                changed is None
+                or dependent.consumes is None
+                or changed.intersection(dependent.consumes)
+                or recomputed.intersection(graph[key])
+            ):
+                recomputed.add(key)
+                dependents.append(dependent)
+
+        return dependents
+
     @classmethod
     def get_dashboard_permissions(cls):
         """
         Returns a list of permissions attached to a dashboard.
         """
         if cls._meta.permission_classes:
-            permission_classes = cls._meta.permission_classes
+            permission_classes = tuple(cls._meta.permission_classes)
         else:
-            permission_classes = []
-            for permission_class_path in Config().DASHBOARDS_DEFAULT_PERMISSION_CLASSES:
-                try:
-                    permission_class = import_string(permission_class_path)
-                    permission_classes.append(permission_class)
-                except ModuleNotFoundError:  # pragma: no cover
-                    logger.warning(
-                        f"{permission_class_path} is invalid permissions path"
-                    )
-
-        return [permission() for permission in permission_classes]
+            permission_classes = tuple(
+                resolve_permission_classes(
+                    tuple(Config().DASHBOARDS_DEFAULT_PERMISSION_CLASSES)
+                )
+            )
+
+        return list(get_permissions(permission_classes))
+
+    @classmethod
+    def get_failed_permission(cls, request: HttpRequest) -> Optional[BasePermission]:
+        """
+        The first permission the request fails, if any. Decided once per request,
+        menus and views checking the same dashboard share the result.
+        """
+        memo = RequestMemo.for_request(request)
+
+        def check():
+            for permission in cls.get_dashboard_permissions():
+                if not permission.has_permission(request=request, dashboard=cls):
+                    return permission
+            return None
+
+        if memo is None:
+            return check()
+
+        return memo.get_or_set(("permissions", cls), check)
 
     @classmethod
     def has_permissions(cls, request: HttpRequest, handle: bool = True):
@@ -150,15 +270,14 @@ class Dashboard(
         Check if the request should be permitted.
         Raises exception if the request is not permitted.
         """
-        for permission in cls.get_dashboard_permissions():
-            if not permission.has_permission(request=request, dashboard=cls):
-                if handle:
-                    return permission.handle_no_permission(
-                        request=request, dashboard=cls
-                    )
-                else:
-                    return False
-        return True
+        permission = cls.get_failed_permission(request)
+        if permission is None:
+            return True
+
+        if handle:
+            return permission.handle_no_permission(request=request, dashboard=cls)
+
+        return False
 
     @classmethod
     def get_urls(cls):
@@ -183,19 +302,114 @@ class Dashboard(
 
     @classmethod
     def get_absolute_url(cls):
-        return reverse(f"dashboards:{cls.get_slug()}")
+        return url_templates.reverse_args(f"dashboards:{cls.get_slug()}", [])
 
     def get_context(self, **kwargs) -> dict:
         return kwargs
 
-    def get_media(self) -> asset_definitions.Media:
-        # dashboard level media
-        media = super().get_media()
-        # add any media defined in components
-        for key, component in self.components.items():
-            media += component.get_media()
+    @classmethod
+    def get_shared_context_keys(cls) -> List[str]:
+        if "_shared_context_keys" not in cls.__dict__:
+            cls._shared_context_keys = [
+                name[len("get_") : -len("_shared")]
+                for name in dir(cls)
+                if name.startswith("get_")
+                and name.endswith("_shared")
+                and callable(getattr(cls, name))
+            ]
+
+        return cls._shared_context_keys
 
-        return media
+    def get_shared_context(self, keys: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Data shared between components, the result of each get_FOO_shared()
+        method, limited to keys when given.
+        """
+        return {
+            key: getattr(self, f"get_{key}_shared")()
+            for key in self.get_shared_context_keys()
+            if keys is None or key in keys
+        }
+
+    @property
+    def shared_context(self) -> Dict[str, Any]:
+        """
+        Shared context computed once per page load and kept server side under a
+        page token, which deferred component requests from the page reuse.
+        When expired, a component request computes only the keys its component
+        declares in shared.
+        """
+        if self._shared_context is None:
+            self._shared_context = self.load_shared_context()
+
+        return self._shared_context
+
+    def set_page_token(self, token: str):
+        self.page_token = token
+        # components are shared between requests, so find the token in the request
+        memo = RequestMemo.for_request(self.request)
+        if memo is not None:
+            memo.get_or_set(("page_token", self.get_slug()), lambda: token)
+
+    def get_shared_context_cache_key(self, token: str) -> str:
+        fingerprint = get_permission_fingerprint(self.request)
+        return f"dashboards.shared.{self.get_slug()}.{fingerprint}.{token}"
+
+    def load_shared_context(self) -> Dict[str, Any]:
+        if not self.get_shared_context_keys():
+            return self.get_shared_context()
+
+        cache = caches[Config().DASHBOARDS_CACHE_ALIAS]
+        token = None
+        if self.request is not None:
+            data = (
+                self.request.GET if self.request.method == "GET" else self.request.POST
+            )
+            token = data.get(PAGE_TOKEN_PARAM)
+
+        if token:
+            shared_context = cache.get(self.get_shared_context_cache_key(token))
+            if shared_context is not None:
+                self.set_page_token(token)
+                return shared_context
+
+            # expired, only compute what the requested component needs
+            return self.get_shared_context(keys=self.shared_keys)
+
+        shared_context = self.get_shared_context()
+        token = uuid.uuid4().hex
+        self.set_page_token(token)
+        cache.set(
+            self.get_shared_context_cache_key(token),
+            shared_context,
+            Config().DASHBOARDS_SHARED_CONTEXT_TIMEOUT,
+        )
+
+        return shared_context
+
+    @classmethod
+    def get_class_media(cls) -> asset_definitions.Media:
+        """
+        Dashboard and component media merged, computed once per dashboard class.
+        """
+        if "_class_media" not in cls.__dict__:
+            # dashboard level media
+            definition = getattr(cls, "Media", None)
+            media = (
+                asset_definitions.Media(media=definition)
+                if definition
+                else asset_definitions.Media()
+            )
+            # add any media defined in components
+            for key, component in cls.components.items():
+                media += component.get_media()
+
+            cls._class_media = media
+
+        return cls._class_media
+
+    def get_media(self) -> asset_definitions.Media:
+        return bundling.get_bundled_media(self.get_slug(), self.get_class_media())
 
     def render(self, request: HttpRequest, template_name=None):
         """
@@ -207,8 +421,12 @@ class Dashboard(
         context = self.get_context(
             request=request, media=self.get_media(), call_deferred=False
         )
+        # create the page token before deferred component urls are rendered
+        self.shared_context
 
         layout = self.Layout()
+        # charts are themed client side, whatever template the page uses
+        themes = render_themes(request)
 
         # Render with template
         if template_name:
@@ -216,7 +434,9 @@ class Dashboard(
             self.get_components()
             # add dashboard to the context so it's available for the template
             context["dashboard"] = self
-            return mark_safe(render_to_string(template_name, context))
+            return mark_safe(
+                themes + rendering.render_to_string(template_name, context)
+            )
 
         # No layout, so create default one, copying any LayoutOptions elements from the component to the card
         # TODO Card as the default should be an option
@@ -233,7 +453,12 @@ class Dashboard(
                 *[Card(k, **_get_layout(c)) for k, c in self.components.items()]
             )
 
-        return layout.components.render(dashboard=self, context=Context(context))
+        # components are looked up once here rather than by every nested layout
+        context["dashboard_components"] = {c.key: c for c in self.get_components()}
+
+        return mark_safe(
+            themes + layout.components.render(dashboard=self, context=Context(context))
+        )
 
     def __str__(self):
         return self._meta.name
@@ -245,6 +470,12 @@ class ModelDashboard(Dashboard):
     class Meta(Dashboard.Meta):
         model: ClassVar[Model]
         abstract = True
+        select_related: Optional[List[str]] = None
+        prefetch_related: Optional[List[Any]] = None
+        object_cache_timeout: Optional[int] = None  # seconds, None to not cache
+        # also cache objects loaded by an overridden get_queryset()
+        object_cache_custom_queryset: bool = False
+        using: Optional[str] = None  # database alias, see DASHBOARDS_DATABASE_ALIAS
 
     def __init__(self, *args, **kwargs):
         super(ModelDashboard, self).__init__(*args, **kwargs)
@@ -252,30 +483,129 @@ class ModelDashboard(Dashboard):
         if not self.object:
             self.object = self.get_object(**kwargs)
 
+    @classmethod
+    def postprocess_meta(cls, class_meta, resolved_meta_class):
+        resolved_meta_class = super().postprocess_meta(class_meta, resolved_meta_class)
+        if (
+            not resolved_meta_class.abstract
+            and getattr(resolved_meta_class, "model", None) is not None
+            and resolved_meta_class.object_cache_timeout is not None
+        ):
+            versions.track(
+                resolved_meta_class.model,
+                *versions.get_related_models(
+                    resolved_meta_class.model,
+                    get_related_paths(resolved_meta_class),
+                ),
+            )
+
+        return resolved_meta_class
+
     def get_queryset(self):
         if self._meta.model is None:
             raise AttributeError("model is not set on Meta")
 
-        return self._meta.model.objects.all()
+        qs = self._meta.model.objects.using(
+            routing.get_database(self._meta.model, self._meta.using)
+        )
+        if self._meta.select_related:
+            qs = qs.select_related(*self._meta.select_related)
+        if self._meta.prefetch_related:
+            qs = qs.prefetch_related(*self._meta.prefetch_related)
+
+        return qs
 
     def get_absolute_url(self):
-        return reverse(
-            f"dashboards:{self.get_slug()}_detail",
-            kwargs={self._meta.lookup_kwarg: self.object.pk},
+        return self.get_object_url(self.object)
+
+    @classmethod
+    def get_object_url(cls, obj: Model) -> str:
+        """
+        Url of the dashboard for an object, without constructing the dashboard.
+        """
+        return url_templates.reverse_args(
+            f"dashboards:{cls.get_slug()}_detail", [obj.pk]
         )
 
-    def get_object(self, **kwargs):
+    @classmethod
+    def get_object_cache_models(cls) -> List[Type[Model]]:
         """
-        Get django object based on lookup params
+        Models whose changes invalidate cached objects, the dashboard model and
+        any it selects or prefetches.
         """
-        qs = self.get_queryset()
+        return [
+            cls._meta.model,
+            *versions.get_related_models(cls._meta.model, get_related_paths(cls._meta)),
+        ]
+
+    def get_object_cache_key(self, lookup) -> str:
+        model_versions = versions.get_versions(self.get_object_cache_models())
+        key = hashlib.md5(
+            repr(
+                (
+                    self.get_slug(),
+                    self._meta.lookup_field,
+                    str(lookup),
+                    get_related_paths(self._meta),
+                    sorted(model_versions.items()),
+                )
+            ).encode()
+        ).hexdigest()
+
+        return f"dashboards.object.{self._meta.model._meta.label_lower}.{key}"
 
+    def get_object(self, **kwargs):
+        """
+        Get django object based on lookup params, loaded once per request and
+        optionally cached between requests for Meta.object_cache_timeout.
+        """
         if self._meta.lookup_kwarg not in kwargs:
             raise AttributeError(f"{self._meta.lookup_kwarg} not in kwargs")
 
         lookup = kwargs[self._meta.lookup_kwarg]
 
-        return qs.get(**{self._meta.lookup_field: lookup})
+        def load():
+            return self.get_cached_object(lookup)
+
+        memo = RequestMemo.for_request(kwargs.get("request"))
+        if memo is None:
+            return load()
+
+        key = (
+            "object",
+            self.get_slug(),
+            self._meta.model,
+            self._meta.lookup_field,
+            str(lookup),
+            tuple(get_related_paths(self._meta)),
+        )
+        return memo.get_or_set(key, load)
+
+    @classmethod
+    def has_custom_queryset(cls) -> bool:
+        return cls.get_queryset is not ModelDashboard.get_queryset
+
+    def get_cached_object(self, lookup):
+        timeout = self._meta.object_cache_timeout
+        if timeout is None:
+            return self.load_object(lookup)
+
+        # get_queryset() may limit the objects per user or tenant, which the
+        # cache key does not know about
+        if self.has_custom_queryset() and not self._meta.object_cache_custom_queryset:
+            return self.load_object(lookup)
+
+        cache = caches[Config().DASHBOARDS_CACHE_ALIAS]
+        key = self.get_object_cache_key(lookup)
+        obj = cache.get(key)
+        if obj is None:
+            obj = self.load_object(lookup)
+            cache.set(key, obj, timeout)
+
+        return obj
+
+    def load_object(self, lookup):
+        return self.get_queryset().get(**{self._meta.lookup_field: lookup})
 
     @classmethod
     def get_urls(cls):
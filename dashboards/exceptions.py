@@ -12,3 +12,23 @@ class ComponentNotFoundError(DashboardError):
 
 class LayoutError(DashboardError):
     pass
+
+
+class DependencyError(DashboardError):
+    pass
+
+
+class ComponentLimitExceeded(DashboardError):
+    pass
+
+
+class ComponentTimeout(ComponentLimitExceeded):
+    pass
+
+
+class QueryBudgetExceeded(ComponentLimitExceeded):
+    pass
+
+
+class LaneSaturated(DashboardError):
+    pass
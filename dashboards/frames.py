@@ -0,0 +1,123 @@
+"""
+DataFrames shared by every process on a host, stored as files in
+DASHBOARDS_DATAFRAME_CACHE_DIR. With pyarrow installed frames are written as
+uncompressed Feather (Arrow IPC) files and memory mapped when read, so
+processes share the pages rather than each holding a copy, otherwise they
+are pickled.
+"""
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, Optional
+
+from django.core.exceptions import ImproperlyConfigured
+
+import pandas as pd
+
+from dashboards import config
+from dashboards.log import logger
+
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover
+    feather = None
+
+
+def is_enabled() -> bool:
+    return bool(config.Config().DASHBOARDS_DATAFRAME_CACHE_DIR)
+
+
+def get_dir() -> Path:
+    directory = config.Config().DASHBOARDS_DATAFRAME_CACHE_DIR
+    if not directory:
+        raise ImproperlyConfigured("DASHBOARDS_DATAFRAME_CACHE_DIR is not set")
+
+    path = Path(directory)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def get_path(key: str) -> Path:
+    extension = "feather" if feather else "pickle"
+    return get_dir() / f"{hashlib.md5(key.encode()).hexdigest()}.{extension}"
+
+
+def load(key: str) -> Optional[pd.DataFrame]:
+    path = get_path(key)
+    try:
+        if feather:
+            df = feather.read_table(path, memory_map=True).to_pandas(split_blocks=True)
+        else:
+            df = pd.read_pickle(path)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        logger.exception(f"Could not read cached dataframe {path}")
+        path.unlink(missing_ok=True)
+        return None
+
+    # reading marks the frame as recently used for eviction
+    path.touch()
+    return df
+
+
+def store(key: str, df: pd.DataFrame):
+    directory = get_dir()
+    path = get_path(key)
+    # write to a temporary file and move it in place, so other processes
+    # never read a partly written frame.
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        if feather:
+            feather.write_feather(df, tmp, compression="uncompressed")
+        else:
+            df.to_pickle(tmp)
+        os.replace(tmp, path)
+    except Exception:
+        logger.exception(f"Could not cache dataframe {path}")
+        Path(tmp).unlink(missing_ok=True)
+        return
+
+    evict()
+
+
+def evict():
+    """
+    Remove the least recently used frames until the cache fits in
+    DASHBOARDS_DATAFRAME_CACHE_SIZE bytes.
+    """
+    entries = []
+    for path in get_dir().iterdir():
+        if path.suffix == ".tmp":
+            continue
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    size = sum(entry[1] for entry in entries)
+    max_size = config.Config().DASHBOARDS_DATAFRAME_CACHE_SIZE
+    for _, file_size, path in sorted(entries, key=lambda entry: entry[0]):
+        if size <= max_size:
+            break
+        path.unlink(missing_ok=True)
+        size -= file_size
+
+
+def get_or_set(key: str, func: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    df = load(key)
+    if df is None:
+        df = func()
+        store(key, df)
+
+    return df
+
+
+def clear():
+    if is_enabled():
+        for path in get_dir().iterdir():
+            path.unlink(missing_ok=True)
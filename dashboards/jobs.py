@@ -0,0 +1,183 @@
+import functools
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db import connections
+from django.dispatch import receiver
+from django.http import HttpRequest
+from django.utils.module_loading import import_string
+
+from dashboards import config, permissions
+from dashboards.log import logger
+from dashboards.memo import freeze
+
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+JOB_KEY_PREFIX = "dashboards.job"
+
+
+@dataclass
+class Job:
+    id: str
+    func: Callable[[], Any]
+
+
+class JobBackend:
+    """
+    Runs jobs away from the request, storing their result with run(job).
+    Backends for external queues implement submit, and must be able to hand
+    the job's func to their workers, e.g. by pickling with cloudpickle.
+    """
+
+    def submit(self, job: Job):
+        raise NotImplementedError
+
+
+class SyncBackend(JobBackend):
+    """
+    Runs jobs immediately in the request, for tests and development.
+    """
+
+    def submit(self, job: Job):
+        run(job)
+
+
+class ThreadPoolBackend(JobBackend):
+    """
+    Runs jobs in a pool of DASHBOARDS_JOB_WORKERS threads in each web process.
+    """
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(
+            max_workers=config.Config().DASHBOARDS_JOB_WORKERS,
+            thread_name_prefix="dashboards-job",
+        )
+
+    def submit(self, job: Job):
+        self.executor.submit(self.run, job)
+
+    @staticmethod
+    def run(job: Job):
+        try:
+            run(job)
+        finally:
+            # connections opened by this thread are not closed by a request
+            connections.close_all()
+
+
+@functools.lru_cache(maxsize=None)
+def get_backend() -> JobBackend:
+    return import_string(config.Config().DASHBOARDS_JOB_BACKEND)()
+
+
+def get_cache():
+    return caches[config.Config().DASHBOARDS_CACHE_ALIAS]
+
+
+def get_job_id(
+    component,
+    filters: Optional[Dict[str, Any]] = None,
+    request: Optional[HttpRequest] = None,
+) -> str:
+    """
+    Id of the job computing a component's deferred value for filters, shared
+    by every request for the same component, object and filters by the same
+    user.
+    """
+    key = repr(
+        (
+            component.get_absolute_url(),
+            freeze(filters or {}),
+            permissions.get_permission_fingerprint(request),
+        )
+    )
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def detach_request(request: HttpRequest) -> HttpRequest:
+    """
+    A copy of the parts of request values are computed from, its user, path,
+    parameters, cookies and headers, for jobs which run after the request has
+    finished.
+    """
+    detached = HttpRequest()
+    detached.method = request.method
+    detached.path = request.path
+    detached.path_info = request.path_info
+    detached.GET = request.GET.copy()
+    detached.POST = request.POST.copy()
+    detached.COOKIES = dict(request.COOKIES)
+    # leave out the input stream and other server objects
+    detached.META = {k: v for k, v in request.META.items() if isinstance(v, str)}
+    if hasattr(request, "user"):
+        detached.user = request.user
+
+    return detached
+
+
+def get_key(job_id: str) -> str:
+    return f"{JOB_KEY_PREFIX}.{job_id}"
+
+
+def get_state(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    {"status": PENDING|DONE|FAILED, "result": ...}, None if never submitted or expired.
+    """
+    return get_cache().get(get_key(job_id))
+
+
+def submit(job_id: str, func: Callable[[], Any]) -> bool:
+    """
+    Submit a job unless one with the same id is already pending or done,
+    returning whether it was submitted.
+    """
+    if not get_cache().add(
+        get_key(job_id), {"status": PENDING}, config.Config().DASHBOARDS_JOB_TIMEOUT
+    ):
+        return False
+
+    get_backend().submit(Job(id=job_id, func=func))
+    return True
+
+
+def run(job: Job):
+    try:
+        state = {"status": DONE, "result": job.func()}
+    except Exception:
+        logger.exception(f"Dashboards job {job.id} failed")
+        state = {"status": FAILED}
+
+    get_cache().set(get_key(job.id), state, config.Config().DASHBOARDS_JOB_TIMEOUT)
+
+
+def wait(
+    job_id: str, timeout: float, interval: float = 0.25
+) -> Optional[Dict[str, Any]]:
+    """
+    Wait up to timeout seconds for a pending job to finish, for long polling.
+    """
+    deadline = time.monotonic() + timeout
+    state = get_state(job_id)
+    while state and state["status"] == PENDING and time.monotonic() < deadline:
+        time.sleep(interval)
+        state = get_state(job_id)
+
+    return state
+
+
+def clear(job_id: str):
+    get_cache().delete(get_key(job_id))
+
+
+@receiver(setting_changed)
+def clear_backend_on_setting_changed(setting, **kwargs):
+    if setting in ["DASHBOARDS_JOB_BACKEND", "DASHBOARDS_JOB_WORKERS"]:
+        get_backend.cache_clear()
@@ -0,0 +1,61 @@
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from dashboards import config
+from dashboards.exceptions import LaneSaturated
+
+
+_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_lock = threading.Lock()
+
+
+def get_semaphore(lane: str) -> Optional[threading.BoundedSemaphore]:
+    """
+    Semaphore bounding concurrent work in lane in this process, None for
+    lanes without a limit in DASHBOARDS_LANES.
+    """
+    size = config.Config().DASHBOARDS_LANES.get(lane)
+    if not size:
+        return None
+
+    with _lock:
+        if lane not in _semaphores:
+            _semaphores[lane] = threading.BoundedSemaphore(size)
+
+        return _semaphores[lane]
+
+
+@contextmanager
+def admit(lane: Optional[str], wait: Optional[float] = 0) -> Iterator[None]:
+    """
+    Run the block in lane, waiting up to wait seconds (None for as long as it
+    takes) for a free slot, otherwise raising LaneSaturated.
+    """
+    semaphore = get_semaphore(lane) if lane else None
+    if semaphore is None:
+        yield
+        return
+
+    if wait == 0:
+        acquired = semaphore.acquire(blocking=False)
+    else:
+        acquired = semaphore.acquire(timeout=wait)
+
+    if not acquired:
+        raise LaneSaturated(f"Lane {lane} is saturated")
+
+    try:
+        yield
+    finally:
+        semaphore.release()
+
+
+@receiver(setting_changed)
+def clear_lanes_on_setting_changed(setting, **kwargs):
+    if setting == "DASHBOARDS_LANES":
+        with _lock:
+            _semaphores.clear()
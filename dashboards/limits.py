@@ -0,0 +1,187 @@
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    DatabaseError,
+    OperationalError,
+    connections,
+    transaction,
+)
+
+from dashboards.exceptions import (
+    ComponentLimitExceeded,
+    ComponentTimeout,
+    QueryBudgetExceeded,
+)
+from dashboards.log import logger
+
+
+@dataclass(frozen=True)
+class Limits:
+    """
+    Bounds on the work done getting a component's value, set on a component
+    or for all components of a dashboard with Meta.limits.
+    """
+
+    timeout: Optional[float] = None  # seconds, wall clock
+    statement_timeout: Optional[float] = None  # seconds, per query
+    max_queries: Optional[int] = None
+
+
+# marks a missing cache entry, as None may be a stored value
+MISSING = object()
+
+# postgres' query_canceled sqlstate, raised when statement_timeout is hit
+POSTGRES_QUERY_CANCELED = "57014"
+# mysql's ER_QUERY_TIMEOUT, raised when max_execution_time is hit
+MYSQL_QUERY_TIMEOUT = 3024
+
+
+def is_limit_error(error: BaseException) -> bool:
+    """
+    Whether error means a limit was hit, a ComponentLimitExceeded or a query
+    cancelled by the database's statement timeout. Other database errors are
+    not limit errors.
+    """
+    if isinstance(error, ComponentLimitExceeded):
+        return True
+    if not isinstance(error, OperationalError):
+        return False
+
+    # django wraps the driver's error, keeping it as the cause
+    cause = error.__cause__
+    if POSTGRES_QUERY_CANCELED in (
+        getattr(cause, "pgcode", None),  # psycopg2
+        getattr(cause, "sqlstate", None),  # psycopg
+    ):
+        return True
+    args = getattr(cause, "args", None)
+    if args and args[0] == MYSQL_QUERY_TIMEOUT:
+        return True
+
+    # sqlite reports a query aborted by the progress handler as interrupted
+    return "interrupted" in str(error)
+
+
+@contextmanager
+def sqlite_deadline(connection, deadline: float) -> Iterator[None]:
+    """
+    Abort queries on connection still running at deadline. sqlite has one
+    progress handler per connection, so the deadlines of nested blocks are
+    kept on the connection and the earliest is checked, the outer block's
+    deadline applying again once the inner one exits.
+    """
+    connection.ensure_connection()
+    if not hasattr(connection, "dashboards_deadlines"):
+        connection.dashboards_deadlines = []
+    deadlines = connection.dashboards_deadlines
+    deadlines.append(deadline)
+
+    def handler():
+        return time.monotonic() > min(deadlines)
+
+    connection.connection.set_progress_handler(handler, 1000)
+    try:
+        yield
+    finally:
+        deadlines.pop()
+        if connection.connection is not None:
+            if deadlines:
+                connection.connection.set_progress_handler(handler, 1000)
+            else:
+                connection.connection.set_progress_handler(None, 0)
+
+
+@contextmanager
+def statement_timeout(connection, seconds: float) -> Iterator[None]:
+    """
+    Cancel any query on connection running longer than seconds, on PostgreSQL,
+    MySQL and SQLite. Other databases are not limited. The previous timeout
+    is restored on exit, so blocks may be nested.
+
+    On PostgreSQL the timeout is set with SET LOCAL, so must be in a
+    transaction, which is rolled back if the block raises, restoring it.
+    """
+    vendor = connection.vendor
+    milliseconds = int(seconds * 1000)
+    if vendor == "sqlite":
+        # sqlite has no statement timeout, abort queries still running at the deadline
+        with sqlite_deadline(connection, time.monotonic() + seconds):
+            yield
+        return
+    elif vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT current_setting('statement_timeout'), "
+                "set_config('statement_timeout', %s, true)",
+                [str(milliseconds)],
+            )
+            previous = cursor.fetchone()[0]
+        reset = "SELECT set_config('statement_timeout', %s, true)"
+    elif vendor == "mysql":
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT @@SESSION.max_execution_time")
+            previous = cursor.fetchone()[0]
+            cursor.execute("SET SESSION max_execution_time = %s", [milliseconds])
+        reset = "SET SESSION max_execution_time = %s"
+    else:
+        yield
+        return
+
+    try:
+        yield
+    except BaseException:
+        if vendor != "postgresql":
+            reset_statement_timeout(connection, reset, previous)
+        # otherwise the transaction, which a cancelled query aborts, is
+        # rolled back, undoing SET LOCAL.
+        raise
+
+    reset_statement_timeout(connection, reset, previous)
+
+
+def reset_statement_timeout(connection, reset: str, previous):
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(reset, [previous])
+    except DatabaseError:  # pragma: no cover
+        logger.warning(f"Could not reset statement timeout on {connection.vendor}")
+
+
+@contextmanager
+def enforce(limits: Limits, using: str = DEFAULT_DB_ALIAS) -> Iterator[None]:
+    """
+    Apply limits to the block. The wall clock timeout is best effort, it is
+    checked before each query and caps the statement timeout, so neither
+    python code nor queries on databases without a statement timeout are
+    interrupted.
+
+    With a statement timeout on PostgreSQL the block runs in a transaction (a
+    savepoint if already in one), so a cancelled query leaves the connection
+    usable for the rest of the request.
+    """
+    deadline = time.monotonic() + limits.timeout if limits.timeout else None
+    queries = 0
+
+    def check(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        if limits.max_queries is not None and queries > limits.max_queries:
+            raise QueryBudgetExceeded(f"More than {limits.max_queries} queries run")
+        if deadline is not None and time.monotonic() > deadline:
+            raise ComponentTimeout(f"Took longer than {limits.timeout}s")
+
+        return execute(sql, params, many, context)
+
+    timeouts = [t for t in [limits.statement_timeout, limits.timeout] if t]
+    connection = connections[using]
+    with ExitStack() as stack:
+        if timeouts:
+            if connection.vendor == "postgresql":
+                stack.enter_context(transaction.atomic(using=using))
+            stack.enter_context(statement_timeout(connection, min(timeouts)))
+        stack.enter_context(connection.execute_wrapper(check))
+        yield
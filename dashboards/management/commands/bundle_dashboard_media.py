@@ -0,0 +1,44 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboards import bundling, config
+from dashboards.registry import registry
+
+
+class Command(BaseCommand):
+    help = (
+        "Bundle each registered dashboard's js and css into fingerprinted files, "
+        "run before collectstatic."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            help="Directory to write bundles to, defaults to DASHBOARDS_MEDIA_BUNDLE_DIR.",
+        )
+
+    def handle(self, *args, **options):
+        output = options["output"] or config.Config().DASHBOARDS_MEDIA_BUNDLE_DIR
+        if not output:
+            raise CommandError(
+                "Set DASHBOARDS_MEDIA_BUNDLE_DIR or pass --output to bundle media."
+            )
+
+        output = Path(output)
+        manifest: bundling.Manifest = {}
+        for dashboard in registry.get_all_items():
+            slug = dashboard.get_slug()
+            try:
+                manifest[slug] = bundling.bundle_media(
+                    slug, dashboard.get_class_media(), output
+                )
+            except FileNotFoundError as e:
+                raise CommandError(str(e))
+
+            self.stdout.write(f"Bundled {slug}")
+
+        bundling.write_manifest(manifest, output)
+        self.stdout.write(
+            self.style.SUCCESS(f"Bundled media for {len(manifest)} dashboards")
+        )
@@ -0,0 +1,118 @@
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional
+
+from django.http import HttpRequest
+
+
+_active_memo: ContextVar[Optional["RequestMemo"]] = ContextVar(
+    "dashboards_memo", default=None
+)
+
+
+class RequestMemo:
+    """
+    Request scoped store of loaded data, so identical loads made by different
+    components on a dashboard only run once.
+
+    Values are shared between components so must be treated as read only.
+    """
+
+    def __init__(self):
+        self.values: Dict[Hashable, Any] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.values
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        return self.values.get(key, default)
+
+    def get_or_set(self, key: Hashable, default: Callable[[], Any]) -> Any:
+        if key not in self.values:
+            self.values[key] = default()
+
+        return self.values[key]
+
+    @classmethod
+    def for_request(cls, request: Optional[HttpRequest]) -> Optional["RequestMemo"]:
+        if request is None:
+            return None
+
+        memo = getattr(request, "_dashboards_memo", None)
+        if memo is None:
+            memo = cls()
+            request._dashboards_memo = memo  # type: ignore
+
+        return memo
+
+
+def get_memo(
+    memo: Optional[RequestMemo] = None,
+    request: Optional[HttpRequest] = None,
+    **kwargs,
+) -> Optional[RequestMemo]:
+    """
+    Get the memo for the current request, accepts serialize kwargs so can be
+    called as get_memo(**kwargs).
+    """
+    return memo or _active_memo.get() or RequestMemo.for_request(request)
+
+
+@contextmanager
+def activate(request: HttpRequest) -> Iterator[Optional[RequestMemo]]:
+    """
+    Make the request memo available to memoized functions which are not passed
+    the request or memo directly.
+    """
+    token = _active_memo.set(RequestMemo.for_request(request))
+    try:
+        yield _active_memo.get()
+    finally:
+        _active_memo.reset(token)
+
+
+def freeze(value: Any) -> Hashable:
+    """
+    Convert a value, such as filters, into something which can be used as a key.
+    """
+    if isinstance(value, dict):
+        return tuple(
+            sorted(((k, freeze(v)) for k, v in value.items()), key=lambda i: str(i[0]))
+        )
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, set):
+        return frozenset(freeze(v) for v in value)
+
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+
+    return value
+
+
+def memoize(func: Callable) -> Callable:
+    """
+    Decorator for data functions, calls with the same arguments during a request
+    run once with the result shared. request and memo kwargs are not part of
+    the key. Outside a request the function is called as normal.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        memo = get_memo(kwargs.get("memo"), kwargs.get("request"))
+        if memo is None:
+            return func(*args, **kwargs)
+
+        key = (
+            func.__module__,
+            func.__qualname__,
+            freeze(args),
+            freeze({k: v for k, v in kwargs.items() if k not in ["request", "memo"]}),
+        )
+
+        return memo.get_or_set(key, lambda: func(*args, **kwargs))
+
+    return wrapper
@@ -1,12 +1,30 @@
+import functools
 from dataclasses import dataclass
-from typing import Any, Callable, List, Optional, Type, Union
+from typing import Any, Callable, List, Optional, Tuple, Type, Union
 
-from django.urls import resolve
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import get_urlconf, resolve
 
+from dashboards import config
 from dashboards.dashboard import Dashboard, ModelDashboard
+from dashboards.menus.registry import menu_registry
+from dashboards.permissions import get_permission_fingerprint
 from dashboards.registry import Registrable, registry
 
 
+@functools.lru_cache(maxsize=1024)
+def resolve_url_name(url: str, urlconf: Optional[str] = None) -> Optional[str]:
+    return resolve(url, urlconf).url_name
+
+
+@receiver(setting_changed)
+def clear_url_name_cache(setting, **kwargs):
+    if setting == "ROOT_URLCONF":
+        resolve_url_name.cache_clear()
+
+
 def make_dashboard_item(
     d: Union[Type[Dashboard], Type[ModelDashboard]],
     obj: Optional[Any] = None,
@@ -16,8 +34,7 @@ def make_dashboard_item(
     title = title if title else d._meta.name.split("-")[0]  # shorten name in menu
 
     if obj and issubclass(d, ModelDashboard):
-        dashboard = d(object=obj)
-        url = dashboard.get_absolute_url()
+        url = d.get_object_url(obj)
     else:
         # TODO: for some reason mypy complains about this one line
         url = d.get_absolute_url()  # type: ignore
@@ -32,17 +49,37 @@ def make_dashboard_item(
 
 class Menu(Registrable):
     name: str
+    # reuse the items from get_items() until the registries change, only set
+    # this when they depend on nothing else.
+    cache_items: bool = False
+    _items_cache: Tuple[Any, List[Union["MenuItem", "DashboardMenuItem"]]]
 
     @classmethod
     def get_id(cls) -> str:
         return cls.__name__
 
+    @classmethod
+    def get_cached_items(
+        cls, obj: Optional[Any] = None
+    ) -> List[Union["MenuItem", "DashboardMenuItem"]]:
+        if not cls.cache_items or obj is not None:
+            return cls.get_items(obj)
+
+        version = (registry.version, menu_registry.version)
+        cached = cls.__dict__.get("_items_cache")
+        if cached is None or cached[0] != version:
+            cached = (version, cls.get_items(obj))
+            cls._items_cache = cached
+
+        # items are marked visible/selected per request, so each gets a copy
+        return [item.copy() for item in cached[1]]
+
     @classmethod
     def render(
         cls, request, obj: Optional[Any] = None
     ) -> List[Union["MenuItem", "DashboardMenuItem"]]:
         available_items = []
-        for item in cls.get_items(obj):
+        for item in cls.get_cached_items(obj):
             item.render(request)
             if item.visible:
                 available_items.append(item)
@@ -58,6 +95,7 @@ class Menu(Registrable):
 
 class DashboardMenu(Menu):
     app_label: str
+    cache_items = True
 
     @classmethod
     def get_items(cls, obj: Optional[Any] = None):
@@ -100,6 +138,19 @@ class MenuItem:
     def __repr__(self):
         return f"<MenuItem: {self.title}>"
 
+    def copy(self):
+        """
+        Copy of the item and its child items, for render to set per request
+        state on. Everything else, e.g. the dashboard and check_func, is shared.
+        """
+        # faster than copy.copy, which goes through __reduce_ex__
+        item = self.__class__.__new__(self.__class__)
+        item.__dict__.update(self.__dict__)
+        if isinstance(self.children, list):
+            item.children = [child.copy() for child in self.children]
+
+        return item
+
     def check(self, request):
         """set visible flag for the MenuItem"""
         if callable(self.check_func):
@@ -111,12 +162,8 @@ class MenuItem:
         if not self.visible:
             return
 
-        resolved_url_name = resolve(self.url).url_name
-        if (
-            request.resolver_match
-            and resolved_url_name
-            and request.resolver_match.url_name == resolved_url_name
-        ):
+        url_name = request.resolver_match.url_name if request.resolver_match else None
+        if url_name and url_name == resolve_url_name(self.url, get_urlconf()):
             self.selected = True
 
         if callable(self.children):
@@ -132,13 +179,11 @@ class MenuItem:
 
         selected = None
         for child in self.children:
-            child_resolved_url_name = resolve(child.url).url_name
-            if (
-                child.url
-                and request.resolver_match
-                and child_resolved_url_name
-                and request.resolver_match.url_name in child_resolved_url_name
-            ):
+            if not (child.url and url_name):
+                continue
+
+            child_url_name = resolve_url_name(child.url, get_urlconf())
+            if child_url_name and url_name in child_url_name:
                 selected = child
 
         if selected:
@@ -158,7 +203,22 @@ class DashboardMenuItem(MenuItem):
 
     def check(self, request):
         """only visible if the user has access to the dashboard"""
-        self.visible = self.dashboard.has_permissions(request, handle=False)
+        timeout = config.Config().DASHBOARDS_MENU_PERMISSION_CACHE
+        if timeout is None:
+            self.visible = self.dashboard.has_permissions(request, handle=False)
+            return
+
+        cache = caches[config.Config().DASHBOARDS_CACHE_ALIAS]
+        key = (
+            f"dashboards.menu.visible.{self.dashboard.get_slug()}."
+            f"{get_permission_fingerprint(request)}"
+        )
+        visible = cache.get(key)
+        if visible is None:
+            visible = bool(self.dashboard.has_permissions(request, handle=False))
+            cache.set(key, visible, timeout)
+
+        self.visible = visible
 
     def __post_init__(self):
         if self.dashboard is _no_default:
@@ -0,0 +1,137 @@
+"""
+Runs CPU bound work, such as building chart figures, in a pool of
+DASHBOARDS_CHART_PROCESSES processes so it doesn't hold the GIL of the web
+process. DataFrames are handed over in shared memory rather than through
+the pool's pipe.
+"""
+import functools
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, List, Optional, Tuple
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+import pandas as pd
+
+from dashboards import config
+from dashboards.log import logger
+
+
+def is_enabled() -> bool:
+    return bool(config.Config().DASHBOARDS_CHART_PROCESSES)
+
+
+def setup_process():
+    # workers are spawned, so load the project as the web process did
+    import django
+
+    django.setup()
+
+
+@functools.lru_cache(maxsize=None)
+def get_executor() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=config.Config().DASHBOARDS_CHART_PROCESSES,
+        # forking a threaded web process can copy held locks
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=setup_process,
+    )
+
+
+def share_frame(
+    df: pd.DataFrame,
+) -> Tuple[bytes, Optional[shared_memory.SharedMemory], List[int]]:
+    """
+    Pickle df with its array data copied into a shared memory block, returning
+    the pickle, the block and the size of each buffer in it.
+    """
+    buffers: List[pickle.PickleBuffer] = []
+    data = pickle.dumps(df, protocol=5, buffer_callback=buffers.append)
+    raws = [buffer.raw() for buffer in buffers]
+    sizes = [raw.nbytes for raw in raws]
+    if not sizes:
+        return data, None, sizes
+
+    block = shared_memory.SharedMemory(create=True, size=max(sum(sizes), 1))
+    offset = 0
+    for raw, size in zip(raws, sizes):
+        block.buf[offset : offset + size] = raw
+        offset += size
+
+    return data, block, sizes
+
+
+def call_with_frame(
+    func: Callable[..., Any],
+    data: bytes,
+    name: Optional[str],
+    sizes: List[int],
+    kwargs: dict,
+) -> Any:
+    """
+    Runs in a worker, calling func with the frame read from shared memory.
+    """
+    if name is None:
+        return func(pickle.loads(data), **kwargs)
+
+    block = shared_memory.SharedMemory(name=name)
+    # the web process owns the block, don't let this process's tracker unlink it
+    resource_tracker.unregister(block._name, "shared_memory")  # type: ignore[attr-defined]
+    try:
+        offset = 0
+        buffers = []
+        for size in sizes:
+            buffers.append(block.buf[offset : offset + size])
+            offset += size
+
+        df = pickle.loads(data, buffers=buffers)
+        result = func(df, **kwargs)
+        del df, buffers
+        return result
+    finally:
+        try:
+            block.close()
+        except BufferError:  # pragma: no cover
+            # something built from the frame still views the block, it is
+            # released with the worker.
+            pass
+
+
+def run(func: Callable[..., Any], df: pd.DataFrame, **kwargs) -> Any:
+    """
+    Call func(df, **kwargs) in the process pool, falling back to calling it
+    here when func can't be sent to a worker or the pool has broken. Errors
+    raised by func in the worker are raised here.
+    """
+    try:
+        # checked here as the pool pickles in a thread, reporting failures
+        # the same way as errors raised by func.
+        pickle.dumps((func, kwargs))
+        data, block, sizes = share_frame(df)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        # e.g. a serializer defined in a function, which workers can't import
+        return func(df, **kwargs)
+
+    try:
+        future = get_executor().submit(
+            call_with_frame, func, data, block.name if block else None, sizes, kwargs
+        )
+        return future.result()
+    except BrokenProcessPool:
+        logger.exception("Chart process pool broken, building in process")
+        get_executor.cache_clear()
+        return func(df, **kwargs)
+    finally:
+        if block:
+            block.close()
+            block.unlink()
+
+
+@receiver(setting_changed)
+def clear_executor_on_setting_changed(setting, **kwargs):
+    if setting == "DASHBOARDS_CHART_PROCESSES":
+        get_executor.cache_clear()
@@ -1,11 +1,23 @@
-from typing import Union
+import functools
+from typing import List, Optional, Tuple, Type, Union
 from urllib.parse import urlparse
 
 from django.conf import settings
 from django.contrib.auth.views import redirect_to_login
+from django.core import signing
 from django.core.exceptions import ImproperlyConfigured, PermissionDenied
 from django.http import HttpRequest, HttpResponseRedirect
 from django.shortcuts import resolve_url
+from django.utils.module_loading import import_string
+
+from dashboards import config
+from dashboards.log import logger
+from dashboards.memo import RequestMemo
+
+
+# query param deferred component urls carry their access token in
+ACCESS_TOKEN_PARAM = "_access"
+ACCESS_TOKEN_SALT = "dashboards.component.access"
 
 
 class BasePermission:
@@ -103,3 +115,76 @@ class IsAdminUser(BasePermission):
 
     def has_permission(self, request, dashboard) -> bool:
         return bool(request.user and request.user.is_staff)
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_permission_classes(paths: Tuple[str, ...]) -> List[Type[BasePermission]]:
+    """
+    Import permission classes from their paths, once per set of paths.
+    """
+    permission_classes = []
+    for permission_class_path in paths:
+        try:
+            permission_classes.append(import_string(permission_class_path))
+        except ModuleNotFoundError:  # pragma: no cover
+            logger.warning(f"{permission_class_path} is invalid permissions path")
+
+    return permission_classes
+
+
+@functools.lru_cache(maxsize=None)
+def get_permissions(
+    permission_classes: Tuple[Type[BasePermission], ...]
+) -> Tuple[BasePermission, ...]:
+    """
+    Permissions are stateless, so instances are created once and shared.
+    """
+    return tuple(permission() for permission in permission_classes)
+
+
+def get_permission_fingerprint(request) -> str:
+    """
+    Identifies who permissions were checked for, so a decision can be shared
+    between their requests.
+    """
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        return "anonymous"
+
+    return f"user-{user.pk}"
+
+
+def get_access_token(request: HttpRequest, dashboard) -> Optional[str]:
+    """
+    Short lived token showing the request passed the dashboard's permissions,
+    added to deferred component urls so fetching them can skip the checks.
+    Only created when DASHBOARDS_COMPONENT_ACCESS_TOKEN_MAX_AGE is set.
+    """
+    if config.Config().DASHBOARDS_COMPONENT_ACCESS_TOKEN_MAX_AGE is None:
+        return None
+
+    memo = RequestMemo.for_request(request)
+    value = f"{dashboard.get_slug()}:{get_permission_fingerprint(request)}"
+    signer = signing.TimestampSigner(salt=ACCESS_TOKEN_SALT)
+    if memo is None:
+        return signer.sign(value)
+
+    return memo.get_or_set(("access_token", value), lambda: signer.sign(value))
+
+
+def check_access_token(request: HttpRequest, dashboard, token: Optional[str]) -> bool:
+    """
+    Whether token was issued for this dashboard and user, and hasn't expired.
+    """
+    max_age = config.Config().DASHBOARDS_COMPONENT_ACCESS_TOKEN_MAX_AGE
+    if max_age is None or not token:
+        return False
+
+    try:
+        value = signing.TimestampSigner(salt=ACCESS_TOKEN_SALT).unsign(
+            token, max_age=max_age
+        )
+    except signing.BadSignature:
+        return False
+
+    return value == f"{dashboard.get_slug()}:{get_permission_fingerprint(request)}"
@@ -0,0 +1,152 @@
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+from dashboards import config
+from dashboards.signals import component_profiled
+
+
+logger = logging.getLogger("dashboards.profiling")
+
+PHASES = ["fetch", "serialize", "render"]
+
+_profiler: ContextVar[Optional["Profiler"]] = ContextVar(
+    "dashboards_profiler", default=None
+)
+_component: ContextVar[Optional[str]] = ContextVar(
+    "dashboards_profiled_component", default=None
+)
+
+
+@dataclass
+class ComponentTiming:
+    """
+    Time spent (ms) in each phase of getting a component on the page.
+    """
+
+    key: str
+    fetch: float = 0.0
+    serialize: float = 0.0
+    render: float = 0.0
+    queries: int = 0
+
+    @property
+    def total(self) -> float:
+        return self.fetch + self.serialize + self.render
+
+
+@dataclass
+class Profiler:
+    timings: Dict[str, ComponentTiming] = field(default_factory=dict)
+    # running phases, each entry is [start, time spent in nested phases]
+    stack: List[List[float]] = field(default_factory=list)
+
+    def get_timing(self, key: str) -> ComponentTiming:
+        if key not in self.timings:
+            self.timings[key] = ComponentTiming(key=key)
+
+        return self.timings[key]
+
+    def count_query(self, execute, sql, params, many, context):
+        key = _component.get()
+        if key:
+            self.get_timing(key).queries += 1
+
+        return execute(sql, params, many, context)
+
+    def server_timing(self) -> str:
+        metrics = []
+        for timing in self.timings.values():
+            for phase in PHASES:
+                metrics.append(f"{timing.key}.{phase};dur={getattr(timing, phase):.2f}")
+            metrics.append(f'{timing.key}.queries;desc="{timing.queries}"')
+
+        return ", ".join(metrics)
+
+
+def get_profiler() -> Optional[Profiler]:
+    return _profiler.get()
+
+
+@contextmanager
+def profile(request: HttpRequest) -> Iterator[Optional[Profiler]]:
+    """
+    Profile components for the duration of a request, when enabled via
+    DASHBOARDS_PROFILING.
+    """
+    if not config.Config().DASHBOARDS_PROFILING:
+        yield None
+        return
+
+    profiler = Profiler()
+    token = _profiler.set(profiler)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profiler.count_query))
+            yield profiler
+    finally:
+        _profiler.reset(token)
+
+    for timing in profiler.timings.values():
+        logger.info(
+            f"{timing.key} took {timing.total:.2f}ms with {timing.queries} queries",
+            extra={"dashboards_component": asdict(timing)},
+        )
+        component_profiled.send(sender=Profiler, timing=timing, request=request)
+
+
+@contextmanager
+def component(key: Optional[str]) -> Iterator[None]:
+    """
+    Attribute any phases & queries within the block to a component.
+    """
+    if _profiler.get() is None:
+        yield
+        return
+
+    token = _component.set(key)
+    try:
+        yield
+    finally:
+        _component.reset(token)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    Time a phase for the current component, time spent in nested phases is
+    attributed to them rather than this one.
+    """
+    profiler = _profiler.get()
+    key = _component.get()
+    if profiler is None or key is None:
+        yield
+        return
+
+    entry = [time.perf_counter(), 0.0]
+    profiler.stack.append(entry)
+    try:
+        yield
+    finally:
+        profiler.stack.pop()
+        elapsed = time.perf_counter() - entry[0]
+        if profiler.stack:
+            profiler.stack[-1][1] += elapsed
+
+        timing = profiler.get_timing(key)
+        exclusive = (elapsed - entry[1]) * 1000
+        setattr(timing, name, getattr(timing, name) + exclusive)
+
+
+def add_server_timing(response: HttpResponse, profiler: Optional[Profiler]):
+    if profiler and profiler.timings:
+        response["Server-Timing"] = profiler.server_timing()
+
+    return response
@@ -42,6 +42,8 @@ class Registry(object):
         self.module_name = module_name
         self.items = []
         self.discovered = False
+        # incremented whenever items change, so anything built from them can be cached
+        self.version = 0
 
     def __contains__(self, item):
         return item.get_id() not in list(map(lambda d: d.get_id(), self.items))
@@ -53,6 +55,7 @@ class Registry(object):
         """
         self.items = []
         self.discovered = False
+        self.version += 1
 
     def remove(self, item):
         """
@@ -62,6 +65,7 @@ class Registry(object):
         """
         if item.get_id() in list(map(lambda d: d.get_id(), self.items)):
             self.items.remove(item)
+            self.version += 1
 
     def register(self, cls):
         """
@@ -71,6 +75,7 @@ class Registry(object):
         """
         if cls.get_id() not in list(map(lambda d: d.get_id(), self.items)):
             self.items.append(cls)
+            self.version += 1
         else:
             logger.warn(f"{cls.get_id()} already registered")
 
@@ -0,0 +1,87 @@
+import functools
+from typing import Any, Dict, Optional
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpRequest
+from django.template import loader
+from django.template.base import TextNode
+from django.template.defaulttags import LoadNode
+from django.templatetags.static import StaticNode
+from django.utils.autoreload import file_changed
+from django.utils.safestring import SafeString, mark_safe
+
+
+@functools.lru_cache(maxsize=None)
+def get_template(template_name):
+    """
+    Resolve and compile a template once, rather than on every component render.
+    """
+    return loader.get_template(template_name)
+
+
+def render_to_string(
+    template_name,
+    context: Optional[Dict[str, Any]] = None,
+    request: Optional[HttpRequest] = None,
+) -> str:
+    return get_template(template_name).render(context, request)
+
+
+@functools.lru_cache(maxsize=None)
+def render_static(template_name: str) -> SafeString:
+    """
+    Render a template which does not use any context, such as the default
+    loading placeholder, once.
+    """
+    return mark_safe(loader.render_to_string(template_name))
+
+
+@functools.lru_cache(maxsize=None)
+def is_static(template_name: str) -> bool:
+    """
+    Whether the template's output does not depend on its context, it only
+    contains text, {% load %} and {% static %} without "as".
+    """
+    nodelist = getattr(
+        getattr(get_template(template_name), "template", None), "nodelist", None
+    )
+    if nodelist is None:
+        # not a django template
+        return False
+
+    return all(
+        isinstance(node, (TextNode, LoadNode))
+        or (isinstance(node, StaticNode) and node.varname is None)
+        for node in nodelist
+    )
+
+
+def render_placeholder(template_name: str, context: Dict[str, Any]) -> SafeString:
+    """
+    Render a placeholder template, such as the loading placeholder, with
+    context as {% include %} would, or once when it does not use the context.
+    """
+    if is_static(template_name):
+        return render_static(template_name)
+
+    return mark_safe(render_to_string(template_name, context))
+
+
+def clear_cache():
+    get_template.cache_clear()
+    render_static.cache_clear()
+    is_static.cache_clear()
+
+
+@receiver(setting_changed)
+def clear_cache_on_setting_changed(setting, **kwargs):
+    if setting in ["TEMPLATES", "INSTALLED_APPS"]:
+        clear_cache()
+
+
+@receiver(file_changed)
+def clear_cache_on_file_changed(**kwargs):
+    # templates may have been edited during development, the autoreloader
+    # handles whether a restart is needed.
+    clear_cache()
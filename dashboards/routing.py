@@ -0,0 +1,32 @@
+from typing import Optional, Type
+
+from django.db import DEFAULT_DB_ALIAS, router
+from django.db.models import Model
+
+from dashboards import config, versions
+
+
+def get_database(
+    model: Optional[Type[Model]] = None, using: Optional[str] = None
+) -> str:
+    """
+    Alias dashboards read model from, the first of using (e.g. a Meta.using),
+    DASHBOARDS_DATABASE_ALIAS and the database routers' choice.
+
+    With DASHBOARDS_REPLICA_LAG set, reads the routers send to a replica of a
+    tracked model which changed within that many seconds go to the database it
+    is written to instead, so data cached against its new version is not read
+    from a lagging replica. An alias from using or the setting is kept, it may
+    be a separate database rather than a replica.
+    """
+    alias = using or config.Config().DASHBOARDS_DATABASE_ALIAS
+    if alias:
+        return alias
+    if model is None:
+        return DEFAULT_DB_ALIAS
+
+    lag = config.Config().DASHBOARDS_REPLICA_LAG
+    if lag and versions.is_tracked(model) and versions.changed_within(model, lag):
+        return router.db_for_write(model) or DEFAULT_DB_ALIAS
+
+    return router.db_for_read(model) or DEFAULT_DB_ALIAS
@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+
+# sent for each component profiled during a request, with timing and request
+# kwargs, see DASHBOARDS_PROFILING
+component_profiled = Signal()
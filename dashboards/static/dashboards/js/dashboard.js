@@ -1,20 +1,101 @@
 // since we ar currently shipping very little js lets just include it here
 // but if this grows we will need to add a build step to create a nice bundle
 const setAppearance = (mode) => {
-    console.log(document.cookie)
-
     const d = new Date();
-    d.setTime(d.getTime() + (100 * 24 * 60 * 60 * 1000));
-    document.cookie = `appearanceMode=${mode}; expires=${d.toString()}; path=/`
+    if (mode) {
+        d.setTime(d.getTime() + (100 * 24 * 60 * 60 * 1000));
+    }
+    document.cookie = `appearanceMode=${mode || ""}; expires=${d.toUTCString()}; path=/`
 
     document.body.classList.remove("dark")
     document.body.classList.remove("light")
     if (mode) {
         document.body.classList.add(mode)
     }
-    console.log(document.cookie)
+
+    document.querySelectorAll("[data-appearance]").forEach((element) => {
+        element.classList.toggle("active", element.dataset.appearance === (mode || ""))
+    })
+    applyChartTheme()
+}
+
+const isDark = () => {
+    if (document.body.classList.contains("dark")) {
+        return true
+    }
+
+    return !document.body.classList.contains("light")
+        && window.matchMedia("(prefers-color-scheme: dark)").matches
+}
+
+// charts are served in the default theme, with the layout to apply over them
+// for each appearance in the chart themes script.
+const chartLayout = (layout) => {
+    const themes = document.getElementById("dashboards-chart-themes")
+    const theme = themes && isDark() ? JSON.parse(themes.textContent).dark : null
+
+    return theme ? {...layout, ...theme} : layout
 }
 
+const newPlot = (id, figure, config) => {
+    const element = document.getElementById(id)
+    element.dashboardsLayout = figure.layout
+    element.dashboardsConfig = config
+
+    return Plotly.newPlot(element, figure.data, chartLayout(figure.layout), config)
+}
+
+// restyle every chart for the current appearance, without fetching them again
+const applyChartTheme = () => {
+    document.querySelectorAll(".js-plotly-plot").forEach((element) => {
+        if (element.dashboardsLayout) {
+            Plotly.react(
+                element,
+                element.data,
+                chartLayout(element.dashboardsLayout),
+                element.dashboardsConfig,
+            )
+        }
+    })
+}
+
+window.matchMedia("(prefers-color-scheme: dark)").addEventListener("change", () => applyChartTheme())
+
+// poll a component for only the data added since cursor, passing each delta to
+// apply. Polling stops once element is no longer on the page e.g. after a swap.
+const pollDelta = (url, cursor, seconds, element, apply) => {
+    const poll = setInterval(() => {
+        if (!document.body.contains(element)) {
+            clearInterval(poll)
+            return
+        }
+
+        const target = new URL(url, window.location.href)
+        target.searchParams.set("_cursor", cursor)
+        fetch(target, {headers: {"X-Requested-With": "XMLHttpRequest"}})
+            .then((response) => response.json())
+            .then((delta) => {
+                cursor = delta.cursor
+                apply(delta)
+            })
+    }, seconds * 1000)
+
+    return poll
+}
+
+// htmx doesn't swap error responses, but a saturated component responds 503
+// with a placeholder which fetches it again after Retry-After.
+document.addEventListener("htmx:beforeSwap", (event) => {
+    const xhr = event.detail.xhr
+    if (xhr.status === 503 && xhr.getResponseHeader("Retry-After")) {
+        event.detail.shouldSwap = true
+        event.detail.isError = false
+    }
+})
+
 const Dashboard = {
     setAppearance,
+    newPlot,
+    applyChartTheme,
+    pollDelta,
 }
\ No newline at end of file
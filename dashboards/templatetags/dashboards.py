@@ -6,6 +6,7 @@ from django.template import RequestContext
 from django.utils.translation import gettext as _
 
 from dashboards.component import Component
+from dashboards.component.chart.serializers import render_themes
 from dashboards.dashboard import Dashboard
 from dashboards.menus.menu import DashboardMenuItem, Menu, MenuItem
 from dashboards.menus.registry import menu_registry
@@ -47,6 +48,15 @@ def dashboard_urls(app_label):
     }
 
 
+@register.simple_tag(takes_context=True)
+def chart_themes(context: RequestContext):
+    """
+    Layouts Dashboard.newPlot applies over charts for each appearance, once per
+    request, Dashboard.render adds them if this tag has not.
+    """
+    return render_themes(context.get("request"))
+
+
 @register.filter()
 def lookup(value, arg):
     return value.get(arg)
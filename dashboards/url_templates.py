@@ -0,0 +1,80 @@
+import functools
+from typing import Any, Iterable, List, Optional, Sequence
+from urllib.parse import quote
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import NoReverseMatch, get_script_prefix, get_urlconf, reverse
+from django.utils.http import RFC3986_SUBDELIMS
+
+
+# characters reverse() leaves unquoted in urls
+SAFE_CHARS = RFC3986_SUBDELIMS + "/~:@"
+
+
+def get_sentinel(index: int) -> str:
+    # valid for str and slug converters, and never a prefix of another sentinel
+    return f"__dashboards_arg_{index}__"
+
+
+@functools.lru_cache(maxsize=None)
+def get_url_template(
+    viewname: str, nargs: int, prefix: str, urlconf: Optional[str]
+) -> Optional[str]:
+    """
+    Reverse viewname once with placeholder args, returning a format string to
+    build its urls from, or None when the pattern cannot take placeholders
+    (e.g. an int converter) so reverse must be used.
+    """
+    sentinels = [get_sentinel(i) for i in range(nargs)]
+    try:
+        url = reverse(viewname, args=sentinels, urlconf=urlconf)
+    except NoReverseMatch:
+        return None
+
+    template = url.replace("{", "{{").replace("}", "}}")
+    for i, sentinel in enumerate(sentinels):
+        if template.count(sentinel) != 1:
+            return None
+        template = template.replace(sentinel, f"{{{i}}}")
+
+    return template
+
+
+def reverse_args(viewname: str, args: Sequence[Any]) -> str:
+    """
+    Equivalent to reverse(viewname, args=args) for patterns of str/slug args,
+    formatting a precomputed url template rather than resolving each time.
+    """
+    return reverse_many(viewname, [args])[0]
+
+
+def reverse_many(viewname: str, args_list: Iterable[Sequence[Any]]) -> List[str]:
+    """
+    Urls for many sets of args for the same viewname, e.g. a link per table row,
+    resolving the url pattern only once.
+    """
+    urls = []
+    template = None
+    for args in args_list:
+        if template is None:
+            template = get_url_template(
+                viewname, len(args), get_script_prefix(), get_urlconf()
+            )
+
+        values = [str(arg) for arg in args]
+        # reverse validates and raises for anything a placeholder would not match
+        if template is None or any(not value or "/" in value for value in values):
+            urls.append(reverse(viewname, args=args))
+        else:
+            urls.append(
+                template.format(*(quote(value, safe=SAFE_CHARS) for value in values))
+            )
+
+    return urls
+
+
+@receiver(setting_changed)
+def clear_url_templates(setting, **kwargs):
+    if setting == "ROOT_URLCONF":
+        get_url_template.cache_clear()
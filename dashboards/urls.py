@@ -12,6 +12,9 @@ MODEL_DASHBOARD_PATTERN = DASHBOARD_PATTERN + "<str:lookup>/"
 COMPONENT_PATTERN = DASHBOARD_PATTERN + "@component/<slug:component>/"
 COMPONENT_OBJECT_PATTERN = MODEL_DASHBOARD_PATTERN + "@component/<slug:component>/"
 
+TAB_PATTERN = DASHBOARD_PATTERN + "@tab/<slug:tab>/"
+TAB_OBJECT_PATTERN = MODEL_DASHBOARD_PATTERN + "@tab/<slug:tab>/"
+
 FORM_COMPONENT_PATTERN = DASHBOARD_PATTERN + "<slug:component>/@form/"
 FORM_COMPONENT_OBJECT_PATTERN = MODEL_DASHBOARD_PATTERN + "<slug:component>/@form/"
 
@@ -33,6 +36,16 @@ urlpatterns += [
         views.ComponentView.as_view(),
         name="dashboard_component",
     ),
+    path(
+        TAB_PATTERN,
+        views.TabView.as_view(),
+        name="dashboard_tab",
+    ),
+    path(
+        TAB_OBJECT_PATTERN,
+        views.TabView.as_view(),
+        name="dashboard_tab",
+    ),
     path(
         FORM_COMPONENT_PATTERN,
         views.FormComponentView.as_view(),
@@ -0,0 +1,198 @@
+import time
+from typing import Dict, Iterable, List, Set, Type
+
+from django.apps import apps
+from django.core.cache import caches
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.db.models import Model, QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from dashboards import config
+
+
+VERSION_KEY_PREFIX = "dashboards.version"
+CHANGED_KEY_PREFIX = "dashboards.changed"
+
+# labels of models whose versions are bumped when they are saved or deleted
+_tracked: Set[str] = set()
+# tracked models whose m2m receivers wait for the models to be loaded
+_pending: List[Type[Model]] = []
+
+
+def get_cache():
+    return caches[config.Config().DASHBOARDS_CACHE_ALIAS]
+
+
+def get_version_key(model: Type[Model]) -> str:
+    return f"{VERSION_KEY_PREFIX}.{model._meta.label_lower}"
+
+
+def new_version() -> int:
+    # versions restart from the current time, so a counter evicted from the
+    # cache never repeats a value an old entry was stored under.
+    return time.time_ns()
+
+
+def track(*models: Type[Model]):
+    """
+    Bump the version of models when any of their rows are saved or deleted.
+    Receivers are connected for only these models, so others keep fast deletes.
+    """
+    for model in models:
+        label = model._meta.label_lower
+        if label in _tracked:
+            continue
+
+        _tracked.add(label)
+        uid = f"dashboards.versions.{label}"
+        post_save.connect(bump_version_on_change, sender=model, dispatch_uid=uid)
+        post_delete.connect(bump_version_on_change, sender=model, dispatch_uid=uid)
+        if apps.models_ready:
+            connect_m2m(model)
+        else:
+            _pending.append(model)
+
+
+def connect_m2m(model: Type[Model]):
+    """
+    Connect the m2m receiver to the through model of each of model's m2m
+    relations, forward and reverse.
+    """
+    for field in model._meta.get_fields():
+        if not field.many_to_many:
+            continue
+
+        through = getattr(field, "through", None) or field.remote_field.through
+        m2m_changed.connect(
+            bump_version_on_m2m_change,
+            sender=through,
+            dispatch_uid=f"dashboards.versions.{through._meta.label_lower}",
+        )
+
+
+def connect_pending():
+    while _pending:
+        connect_m2m(_pending.pop())
+
+
+def is_tracked(model: Type[Model]) -> bool:
+    return model._meta.label_lower in _tracked
+
+
+def get_versions(models: Iterable[Type[Model]]) -> Dict[str, int]:
+    """
+    Current version of each model, keyed on model label, in one cache call.
+    """
+    cache = get_cache()
+    keys = {get_version_key(model): model._meta.label_lower for model in models}
+    found = cache.get_many(list(keys))
+
+    versions = {}
+    for key, label in keys.items():
+        if key not in found:
+            cache.add(key, new_version(), None)
+            found[key] = cache.get(key)
+        versions[label] = found[key]
+
+    return versions
+
+
+def get_version(model: Type[Model]) -> int:
+    return get_versions([model])[model._meta.label_lower]
+
+
+def bump_version(model: Type[Model]):
+    """
+    Invalidate anything stored against the model's current version.
+    """
+    cache = get_cache()
+    key = get_version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, new_version(), None)
+
+    lag = config.Config().DASHBOARDS_REPLICA_LAG
+    if lag:
+        cache.set(get_changed_key(model), time.time(), lag)
+
+
+def bump_version_on_commit(model: Type[Model], using: str):
+    """
+    Bump the version once the current transaction on using commits, so values
+    computed from the rows before it are never stored under the new version.
+    """
+    transaction.on_commit(lambda: bump_version(model), using=using)
+
+
+def get_changed_key(model: Type[Model]) -> str:
+    return f"{CHANGED_KEY_PREFIX}.{model._meta.label_lower}"
+
+
+def changed_within(model: Type[Model], seconds: float) -> bool:
+    """
+    Whether the model's version was bumped in the last seconds, only known
+    while DASHBOARDS_REPLICA_LAG is set.
+    """
+    changed = get_cache().get(get_changed_key(model))
+    return changed is not None and time.time() - changed < seconds
+
+
+def get_related_models(model: Type[Model], paths: Iterable[str]) -> List[Type[Model]]:
+    """
+    Models reached by select_related/prefetch_related paths such as
+    "owner__company", unresolvable paths are skipped.
+    """
+    models: List[Type[Model]] = []
+    for path in paths:
+        current = model
+        for name in path.split("__"):
+            try:
+                related = current._meta.get_field(name).related_model
+            except FieldDoesNotExist:
+                break
+
+            if not isinstance(related, type):
+                break
+
+            current = related
+            if current not in models:
+                models.append(current)
+
+    return models
+
+
+class VersionedQuerySet(QuerySet):
+    """
+    Bumps the version of tracked models after bulk operations, which don't
+    send post_save, use as the model's manager with VersionedQuerySet.as_manager().
+    bulk_update() is done with update().
+    """
+
+    def bump_version(self):
+        if is_tracked(self.model):
+            bump_version_on_commit(self.model, using=self.db)
+
+    def update(self, **kwargs):
+        rows = super().update(**kwargs)
+        if rows:
+            self.bump_version()
+        return rows
+
+    def bulk_create(self, objs, *args, **kwargs):
+        created = super().bulk_create(objs, *args, **kwargs)
+        if created:
+            self.bump_version()
+        return created
+
+
+def bump_version_on_change(sender, using, **kwargs):
+    bump_version_on_commit(sender, using=using)
+
+
+def bump_version_on_m2m_change(sender, instance, model, action, using, **kwargs):
+    if action.startswith("post_"):
+        for changed in {type(instance), model}:
+            if is_tracked(changed):
+                bump_version_on_commit(changed, using=using)
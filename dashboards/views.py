@@ -1,16 +1,26 @@
+import copy
 import json
-from typing import TYPE_CHECKING, Callable, Dict, Optional, Protocol, Type
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Protocol, Tuple, Type
 
 from django.core.exceptions import PermissionDenied
 from django.core.serializers.json import DjangoJSONEncoder
-from django.http import Http404, HttpRequest, HttpResponse
+from django.http import Http404, HttpRequest, HttpResponse, HttpResponseServerError
+from django.template import Context
 from django.views import View
 from django.views.generic import TemplateView
 
 from typing_extensions import TypeAlias
 
+from dashboards import bundling, config, jobs, lanes, permissions, profiling, rendering
+from dashboards.component import Component
+from dashboards.component.base import DELTA_CURSOR_PARAM
 from dashboards.dashboard import Dashboard
-from dashboards.exceptions import DashboardNotFoundError
+from dashboards.exceptions import (
+    ComponentLimitExceeded,
+    DashboardNotFoundError,
+    LaneSaturated,
+)
+from dashboards.memo import activate as activate_memo
 from dashboards.utils import get_dashboard_class
 
 
@@ -44,6 +54,27 @@ class DashboardObjectMixin(mixin_class):
             except DashboardNotFoundError as e:
                 raise Http404(str(e))
 
+        # share loaded data between all components rendered for this request,
+        # rendering here as components are only rendered with the response.
+        with activate_memo(request), profiling.profile(request) as profiler:
+            denied = self.check_permissions(request)
+            if denied is not None:
+                return denied
+
+            response = super().dispatch(request, *args, **kwargs)
+            if hasattr(response, "render") and not response.is_rendered:
+                response.render()
+
+        return profiling.add_server_timing(response, profiler)
+
+    def check_permissions(self, request: HttpRequest) -> Optional[HttpResponse]:
+        """
+        Returns the response of a permission.handle_no_permission, or None when
+        the request is permitted.
+        """
+        if not self.dashboard_class:
+            raise Exception("Dashboard class not set on view")
+
         has_perm = self.dashboard_class.has_permissions(request=request, handle=True)
         # if has perm is not a bool, it's the result of a permission.handle_no_permission
         if not isinstance(has_perm, bool):
@@ -52,7 +83,7 @@ class DashboardObjectMixin(mixin_class):
         elif not has_perm:
             raise PermissionDenied()
 
-        return super().dispatch(request, *args, **kwargs)
+        return None
 
     def get_dashboard_context(self, **context):
         """kwargs passed to dashboard class"""
@@ -86,7 +117,15 @@ class DashboardView(DashboardObjectMixin, TemplateView):
     def get(self, request, *args, **kwargs):
         dashboard = self.get_dashboard(request=request)
         context = self.get_context_data(**{"dashboard": dashboard})
-        return self.render_to_response(context)
+        response = self.render_to_response(context)
+
+        # let the browser start fetching dashboard js/css before parsing the page
+        if not self.is_htmx():
+            links = bundling.get_preload_links(dashboard.get_media())
+            if links:
+                response["Link"] = links
+
+        return response
 
     def get_template_names(self):
         if self.is_htmx():  # a certain check
@@ -102,26 +141,89 @@ class ComponentView(DashboardObjectMixin, TemplateView):
 
     template_name: str = "dashboards/components/partial.html"
 
+    def check_permissions(self, request: HttpRequest) -> Optional[HttpResponse]:
+        # deferred fetches carry a token from the dashboard render, proving the
+        # permissions were already checked for this user.
+        data = request.GET if request.method == "GET" else request.POST
+        token = data.get(permissions.ACCESS_TOKEN_PARAM)
+        if token and permissions.check_access_token(
+            request, self.dashboard_class, token
+        ):
+            return None
+
+        return super().check_permissions(request)
+
     def get(self, request: HttpRequest, *args, **kwargs):
         dashboard = self.get_dashboard(request=request)
         component = self.get_partial_component(dashboard)
 
-        if self.is_ajax() and component:
-            filters = (
-                request.GET.dict() if request.method == "GET" else request.POST.dict()
+        if component.background and component.is_deferred:
+            # the job is admitted to the component's lane when it runs
+            component, response = self.get_background_component(request, component)
+            if response is not None:
+                return response
+
+            return self.get_component_response(request, dashboard, component)
+
+        try:
+            with lanes.admit(
+                component.get_lane(), wait=config.Config().DASHBOARDS_LANE_WAIT
+            ):
+                response = self.get_component_response(request, dashboard, component)
+                # values are computed as the template is rendered, which must
+                # happen while admitted.
+                if hasattr(response, "render") and not response.is_rendered:
+                    response.render()
+        except LaneSaturated:
+            return self.get_retry_response(
+                request,
+                component,
+                status=503,
+                data={"status": "saturated"},
+                retry_after=config.Config().DASHBOARDS_LANE_RETRY_AFTER,
             )
 
-            # Return json, calling the deferred value.
+        return response
+
+    def get_component_response(
+        self, request: HttpRequest, dashboard: Dashboard, component: Component
+    ) -> HttpResponse:
+        if self.is_ajax() and component:
+            filters = component.get_filters(request)
+            cursor = filters.pop(DELTA_CURSOR_PARAM, None)
+
+            with profiling.component(component.key):
+                if cursor is not None and component.supports_delta:
+                    # Return json, of only what has changed since the client's cursor.
+                    value = component.get_delta(
+                        cursor=cursor, request=self.request, filters=filters
+                    )
+                else:
+                    # Return json, calling the deferred value.
+                    try:
+                        value = component.get_value(
+                            request=self.request, call_deferred=True, filters=filters
+                        )
+                    except ComponentLimitExceeded:
+                        return HttpResponse(
+                            json.dumps({"status": "degraded"}),
+                            content_type="application/json",
+                            status=503,
+                        )
+
             return HttpResponse(
-                json.dumps(
-                    component.get_value(
-                        request=self.request, call_deferred=True, filters=filters
-                    ),
-                    cls=DjangoJSONEncoder,
-                ),
+                json.dumps(value, cls=DjangoJSONEncoder),
                 content_type="application/json",
             )
         else:
+            # recompute only the dependents affected by this change, in one response
+            if component.dependents:
+                # components are shared between requests, the subset is this one's
+                component = copy.copy(component)
+                component.dependent_components = dashboard.get_dependents(
+                    component, changed=component.get_changed_filters(request)
+                )
+
             context = self.get_context_data(
                 **{"component": component, "dashboard": dashboard}
             )
@@ -134,6 +236,109 @@ class ComponentView(DashboardObjectMixin, TemplateView):
         """
         return self.get(*args, **kwargs)
 
+    def get_background_component(
+        self, request: HttpRequest, component: Component
+    ) -> Tuple[Component, Optional[HttpResponse]]:
+        """
+        Compute the deferred value in a job. Until it is done respond 202 asking
+        the client to poll, once done return a copy of component with the result
+        as its value to render.
+        """
+        filters = component.get_filters(request)
+        if DELTA_CURSOR_PARAM in filters:
+            return component, None
+
+        job_id = jobs.get_job_id(component, filters, request=request)
+        state = jobs.get_state(job_id)
+        if state is None:
+            # components are shared between requests, the job needs its own
+            job_component = copy.copy(component)
+            # the job runs after this request has finished
+            job_request = jobs.detach_request(request)
+
+            def compute():
+                with activate_memo(job_request), lanes.admit(
+                    job_component.get_lane(), wait=None
+                ):
+                    return job_component.get_value(
+                        request=job_request, call_deferred=True, filters=filters
+                    )
+
+            jobs.submit(job_id, compute)
+            state = jobs.get_state(job_id)
+
+        long_poll = config.Config().DASHBOARDS_JOB_LONG_POLL
+        if long_poll and state and state["status"] == jobs.PENDING:
+            state = jobs.wait(job_id, timeout=long_poll)
+
+        if state and state["status"] == jobs.DONE:
+            result = state["result"]
+            component = copy.copy(component)
+            component.defer = lambda **kwargs: result
+            return component, None
+
+        if state and state["status"] == jobs.FAILED:
+            # let the next request try again
+            jobs.clear(job_id)
+            return component, HttpResponseServerError()
+
+        response = self.get_retry_response(
+            request,
+            component,
+            status=202,
+            data={"status": jobs.PENDING, "job": job_id},
+            retry_after=config.Config().DASHBOARDS_JOB_POLL_INTERVAL,
+        )
+        return component, response
+
+    def get_retry_response(
+        self,
+        request: HttpRequest,
+        component: Component,
+        status: int,
+        data: Dict,
+        retry_after: int,
+    ) -> HttpResponse:
+        """
+        Ask the client to fetch the component again in retry_after seconds,
+        ajax requests get data as json and htmx a placeholder which refetches.
+        """
+        if self.is_ajax():
+            response = HttpResponse(
+                json.dumps(data),
+                content_type="application/json",
+                status=status,
+            )
+        else:
+            params = request.GET if request.method == "GET" else request.POST
+            response = HttpResponse(
+                rendering.render_to_string(
+                    "dashboards/components/job.html",
+                    {
+                        "url": f"{request.path}?{params.urlencode()}",
+                        "poll_interval": retry_after,
+                        "defer_loading": rendering.render_static(
+                            component.defer_loading_template_name
+                        ),
+                    },
+                ),
+                status=status,
+            )
+
+        response["Retry-After"] = str(retry_after)
+        return response
+
+    def get_dashboard_context(self, **context):
+        if not self.dashboard_class:
+            raise Exception("Dashboard class not set on view")
+
+        context = super().get_dashboard_context(**context)
+        # if the page's shared context has expired, only compute what this needs
+        component = self.dashboard_class.components.get(self.kwargs["component"])
+        context["shared_keys"] = component.shared if component else None
+
+        return context
+
     def get_partial_component(self, dashboard):
         if not self.dashboard_class:
             raise Exception("Dashboard class not set on view")
@@ -147,6 +352,33 @@ class ComponentView(DashboardObjectMixin, TemplateView):
         )
 
 
+class TabView(DashboardObjectMixin, TemplateView):
+    """
+    Tab view, renders the components of a lazy tab when it is first shown.
+    """
+
+    template_name: str = "dashboards/layout/components/tabs/partial.html"
+
+    def get(self, request: HttpRequest, *args, **kwargs):
+        dashboard = self.get_dashboard(request=request)
+        tab = dashboard.get_tab(self.kwargs["tab"])
+
+        if not tab:
+            raise Http404(
+                f"Tab {self.kwargs['tab']} does not exist in dashboard {dashboard.class_name()}"
+            )
+
+        components = tab.get_components_rendered(
+            dashboard=dashboard,
+            context=Context({"request": request, "dashboard": dashboard}),
+        )
+        context = self.get_context_data(
+            **{"tab": tab, "components": components, "dashboard": dashboard}
+        )
+
+        return self.render_to_response(context)
+
+
 class FormComponentView(ComponentView):
     """
     Form Component view, partial rendering of dependant components to support HTMX calls.
@@ -224,8 +224,8 @@ class DynamicDashboard(Dashboard):
                 grid_css_classes=Grid.TWO.value,
             )
 
-        # Components with shared seed data
-        hdd = psutil.disk_usage("/")
+        # Components with shared seed data, computed once per page load
+        hdd = self.shared_context["disk_usage"]
         self.components["total_disk"] = Stat(
             value=StatData(
                 text=str(round(hdd.total / (2**30))), sub_text="Total disk size GiB"
@@ -244,6 +244,7 @@ class DynamicDashboard(Dashboard):
 
         # Component which is deferred, note however, each defer function is partially loaded so init
         # would be called again for that component, which is worth considering in any code added here.
+        # Expensive setup belongs in a get_FOO_shared method, which deferred requests reuse.
         self.components["defer_also_works"] = Text(
             defer=lambda **k: "Deferred via init"
         )
@@ -291,6 +292,9 @@ class DynamicDashboard(Dashboard):
     defer_from_method = Text(grid_css_classes=Grid.TWO.value)
     stat_shared = SharedComponent()
 
+    def get_disk_usage_shared(self):
+        return psutil.disk_usage("/")
+
     def get_value_from_method_value(self, **kwargs):
         return "I am defined as a FOO value."
 
@@ -1,12 +1,13 @@
 import json
 from collections import namedtuple
 
-from django.db.models import Max
+from django.db.models import Count, Max, Q
 from django.utils.safestring import mark_safe
 
 from demo.vehicle.models import Data, Parameter, Vehicle
 
 from dashboards.component.stat import StatData
+from dashboards.memo import memoize
 
 
 def dict_to_table(d: dict):
@@ -38,6 +39,15 @@ class VehicleData:
 
         return qs
 
+    @staticmethod
+    @memoize
+    def get_counts(filters):
+        return VehicleData.get_queryset(filters).aggregate(
+            total=Count("pk"),
+            in_use=Count("pk", filter=Q(in_use=True)),
+            out_of_service=Count("pk", filter=Q(available=False)),
+        )
+
     @staticmethod
     def get_vehicle(request):
         try:
@@ -48,20 +58,20 @@ class VehicleData:
     @staticmethod
     def fetch_vehicle_count(request, **kwargs):
         filters = kwargs.get("filters") or {}
-        qs = VehicleData.get_queryset(filters)
-        return StatData(text=str(qs.total_vehicle_count()), sub_text="TOTAL VEHICLES")
+        counts = VehicleData.get_counts(filters)
+        return StatData(text=str(counts["total"]), sub_text="TOTAL VEHICLES")
 
     @staticmethod
     def fetch_in_use_count(request, **kwargs):
         filters = kwargs.get("filters") or {}
-        qs = VehicleData.get_queryset(filters)
-        return StatData(text=str(qs.in_use_count()), sub_text="IN USE")
+        counts = VehicleData.get_counts(filters)
+        return StatData(text=str(counts["in_use"]), sub_text="IN USE")
 
     @staticmethod
     def fetch_out_of_service_count(request, **kwargs):
         filters = kwargs.get("filters") or {}
-        qs = VehicleData.get_queryset(filters)
-        return StatData(text=str(qs.out_of_service_count()), sub_text="NOT AVAILABLE")
+        counts = VehicleData.get_counts(filters)
+        return StatData(text=str(counts["out_of_service"]), sub_text="NOT AVAILABLE")
 
     @staticmethod
     def fetch_service_count(request, **kwargs):
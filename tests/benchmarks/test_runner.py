@@ -0,0 +1,52 @@
+from benchmarks.runner import Benchmark, Result, compare, load, run, save
+
+
+def result(name, mean):
+    return Result(name=name, rounds=1, mean=mean, best=mean, peak_kb=0)
+
+
+def test_run():
+    calls = []
+
+    def setup():
+        return lambda: calls.append(bytearray(1024 * 100))
+
+    bench_result = run(Benchmark(name="append", setup=setup), min_time=0, max_rounds=3)
+
+    assert bench_result.name == "append"
+    # warm up + rounds + allocation run
+    assert len(calls) == 1 + bench_result.rounds + 1
+    assert bench_result.ops > 0
+    assert bench_result.peak_kb >= 100
+
+
+def test_run__max_rounds():
+    bench_result = run(
+        Benchmark(name="noop", setup=lambda: lambda: None), min_time=10, max_rounds=5
+    )
+
+    assert bench_result.rounds == 5
+
+
+def test_save_load(tmp_path):
+    path = tmp_path / "baseline.json"
+    save([result("a", 0.5)], path)
+
+    assert load(path) == {"a": result("a", 0.5)}
+
+
+def test_compare():
+    baseline = {"slower": result("slower", 1.0), "faster": result("faster", 1.0)}
+    compared = compare(
+        [result("slower", 1.2), result("faster", 0.5), result("new", 1.0)],
+        baseline,
+        threshold=0.1,
+    )
+
+    assert [
+        (r.name, round(c, 2) if c else c, regressed) for r, c, regressed in compared
+    ] == [
+        ("slower", 0.2, True),
+        ("faster", -0.5, False),
+        ("new", None, False),
+    ]
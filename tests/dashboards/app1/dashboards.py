@@ -5,7 +5,7 @@ from django.contrib.auth.models import User
 
 from dashboards import permissions
 from dashboards.component import Chart, Form, Table, Text
-from dashboards.component.layout import HR, ComponentLayout, Div
+from dashboards.component.layout import HR, ComponentLayout, Div, Tab, TabContainer
 from dashboards.component.table import TableSerializer
 from dashboards.dashboard import Dashboard, ModelDashboard
 from dashboards.forms import DashboardForm
@@ -114,6 +114,20 @@ class TestDashboardWithLayout(TestDashboard):
         )
 
 
+class TestDashboardWithLazyTabs(TestDashboard):
+    class Meta:
+        name = "Test Dashboard with Lazy Tabs"
+
+    class Layout:
+        components = ComponentLayout(
+            TabContainer(
+                Tab("First", "component_1"),
+                Tab("Second", "component_2", "component_3"),
+                lazy=True,
+            ),
+        )
+
+
 class TestNoMetaDashboard(Dashboard):
     component_1 = Text(value="value")
 
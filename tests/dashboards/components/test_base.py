@@ -1,10 +1,15 @@
 from dataclasses import dataclass
+from urllib.parse import parse_qs, urlparse
 
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
 from django.template import Context
 
 import pytest
 
+from dashboards import permissions, versions
 from dashboards.component import Chart, Component, Text
+from dashboards.component.stat import StatSerializer
 from dashboards.component.text import Stat
 from tests.utils import render_component_test
 
@@ -84,6 +89,14 @@ def test_get_value(component_kwargs, call_deferred, expected, rf):
     )
 
 
+def test_get_filters__strips_internal_params(rf):
+    request = rf.get(
+        "/", {"a": "1", "_access": "token", "_page": "page", "_previous": "a=0"}
+    )
+
+    assert TestComponent().get_filters(request) == {"a": "1"}
+
+
 @pytest.mark.parametrize(
     "component_kwargs,expected",
     [
@@ -156,3 +169,107 @@ def test_render(component_class, dashboard, component_kwargs, htmx, rf, snapshot
     )
 
     snapshot.assert_match(render_component_test(context, htmx=htmx))
+
+
+@pytest.mark.parametrize(
+    "component_kwargs,expected",
+    [
+        ({"value": "value"}, "static:'value'"),
+        ({"defer": lambda **kwargs: "value"}, "deferred"),
+        ({"value": lambda **kwargs: "value"}, None),
+    ],
+)
+def test_get_cache_version(component_kwargs, expected):
+    assert Text(**component_kwargs).get_cache_version() == expected
+
+
+@pytest.mark.parametrize(
+    "component_kwargs,max_age,expected",
+    [
+        ({"value": "value"}, 60, "/dash/app1/testdashboard/@component/test/"),
+        (
+            {"defer": lambda **kwargs: "value"},
+            None,
+            "/dash/app1/testdashboard/@component/test/",
+        ),
+        (
+            {"defer": lambda **kwargs: "value"},
+            60,
+            "/dash/app1/testdashboard/@component/test/?_access=",
+        ),
+    ],
+)
+def test_get_defer_url(component_kwargs, max_age, expected, dashboard, rf, settings):
+    settings.DASHBOARDS_COMPONENT_ACCESS_TOKEN_MAX_AGE = max_age
+    component = Text(**component_kwargs)
+    component.dashboard = dashboard
+    component.key = "test"
+    request = rf.get("/")
+
+    url = component.get_defer_url(request)
+
+    assert url.startswith(expected)
+    if max_age:
+        token = parse_qs(urlparse(url).query).get("_access", [None])[0]
+        assert bool(token) is component.is_deferred
+        assert not token or permissions.check_access_token(request, dashboard, token)
+
+
+@pytest.mark.django_db
+def test_get_value__cached_until_models_change(
+    dashboard, rf, django_capture_on_commit_callbacks
+):
+    cache.clear()
+    calls = []
+
+    def value(**kwargs):
+        calls.append(1)
+        return Group.objects.count()
+
+    component = Text(value=value, cache_timeout=0, cache_models=[Group], key="cached")
+    component.dashboard = dashboard
+    versions.track(Group)
+    request = rf.get("/")
+
+    assert component.get_value(request=request) == 0
+    assert component.get_value(request=request) == 0
+    assert len(calls) == 1
+    version = component.get_cache_version(request=request)
+    assert version.startswith("models:")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Group.objects.create(name="group")
+
+    assert component.get_value(request=request) == 1
+    assert len(calls) == 2
+    assert component.get_cache_version(request=request) != version
+    # filters are cached separately
+    component.get_value(request=request, filters={"a": "b"})
+    assert len(calls) == 3
+    cache.clear()
+
+
+def test_get_value_cache_key__not_cached(dashboard):
+    component = Text(value=lambda **kwargs: "value", cache_models=[Group])
+    component.dashboard = dashboard
+
+    assert component.get_value_cache_key() is None
+    assert component.get_cache_version() is None
+
+    component.cache_timeout = 60
+    component.cache_models = None
+
+    assert component.get_value_cache_key() is None
+
+
+def test_get_cache_models():
+    class GroupStatSerializer(StatSerializer):
+        class Meta:
+            annotation_field = "id"
+            model = Group
+
+    assert Stat(defer=GroupStatSerializer).get_cache_models() == [Group]
+    assert Stat(defer=GroupStatSerializer, cache_models=[User]).get_cache_models() == [
+        User,
+        Group,
+    ]
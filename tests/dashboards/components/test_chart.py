@@ -1,11 +1,22 @@
-from django.contrib.auth.models import User
+import json
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.db.models import Count, Max
+from django.test.utils import CaptureQueriesContext
 
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objs as go
 import pytest
 
-from dashboards.component.chart.serializers import ChartSerializer
+from dashboards import offload
+from dashboards.component.chart import figures
+from dashboards.component.chart.serializers import ChartSerializer, get_themes
 from tests.dashboards.fakes import fake_user
 
 
@@ -118,3 +129,312 @@ def test_serializer__serialize__model(test_user_serializer__model, snapshot):
     data = test_user_serializer__model.serialize()
 
     snapshot.assert_match(data)
+
+
+@pytest.fixture()
+def test_delta_serializer():
+    points = pd.DataFrame({"x": [1, 2, 3], "y": [10, 20, 30]})
+
+    class TestDeltaChartSerializer(ChartSerializer):
+        class Meta:
+            title = "Delta"
+            delta_max_points = 100
+
+        def get_data(self, *args, **kwargs):
+            return points
+
+        def get_cursor(self, *args, **kwargs):
+            return len(points)
+
+        def get_data_since(self, cursor, *args, **kwargs):
+            return points.iloc[int(cursor) :], len(points)
+
+        def to_fig(self, df) -> go.Figure:
+            return px.line(df, x="x", y="y")
+
+    return TestDeltaChartSerializer
+
+
+def test_serializer__serialize_since(test_delta_serializer):
+    delta = test_delta_serializer.serialize_since(cursor="1")
+
+    assert delta == {
+        "update": {"x": [[2, 3]], "y": [[20, 30]]},
+        "traces": [0],
+        "cursor": 3,
+        "max_points": 100,
+    }
+
+
+def test_serializer__serialize_since__no_data(test_delta_serializer):
+    delta = test_delta_serializer.serialize_since(cursor="3")
+
+    assert delta["traces"] == []
+    assert delta["cursor"] == 3
+
+
+@pytest.mark.django_db
+def test_serializer__get_data__dataframe_cache(
+    settings, tmp_path, django_user_model, django_capture_on_commit_callbacks
+):
+    settings.DASHBOARDS_DATAFRAME_CACHE_DIR = str(tmp_path)
+    cache.clear()
+
+    class CachedChartSerializer(ChartSerializer):
+        class Meta:
+            fields = ["username"]
+            model = User
+            dataframe_cache = True
+
+    django_user_model.objects.create(username="first")
+
+    # each get_data is as if in another process, without a request memo
+    with CaptureQueriesContext(connection) as queries:
+        first = CachedChartSerializer().get_data()
+        second = CachedChartSerializer().get_data()
+
+    assert len([q for q in queries if "auth_user" in q["sql"]]) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+    # saving a user bumps the version
+    with django_capture_on_commit_callbacks(execute=True):
+        django_user_model.objects.create(username="second")
+
+    assert len(CachedChartSerializer().get_data()) == 2
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_serializer__get_data__dataframe_cache__related(
+    settings, tmp_path, django_user_model, django_capture_on_commit_callbacks
+):
+    settings.DASHBOARDS_DATAFRAME_CACHE_DIR = str(tmp_path)
+    cache.clear()
+
+    class GroupChartSerializer(ChartSerializer):
+        class Meta:
+            fields = ["username", "groups__name"]
+            model = User
+            dataframe_cache = True
+
+    group = Group.objects.create(name="group")
+    django_user_model.objects.create(username="first").groups.add(group)
+
+    assert list(GroupChartSerializer().get_data()["groups__name"]) == ["group"]
+
+    # changes to related models read by the fields invalidate the frame
+    group.name = "renamed"
+    with django_capture_on_commit_callbacks(execute=True):
+        group.save()
+
+    assert list(GroupChartSerializer().get_data()["groups__name"]) == ["renamed"]
+    cache.clear()
+
+
+def test_serializer__get_dataframe_cache_models():
+    class GroupChartSerializer(ChartSerializer):
+        class Meta:
+            fields = ["username", "groups__name"]
+            model = User
+            cache_models = [Permission, Group]
+
+    assert GroupChartSerializer.get_dataframe_cache_models(
+        GroupChartSerializer._meta
+    ) == [User, Group, Permission]
+
+
+class BarChartSerializer(ChartSerializer):
+    # module level so chart processes can import it
+    class Meta:
+        title = "Bars"
+
+    def get_data(self, *args, **kwargs):
+        return pd.DataFrame({"col1": [420, 380, 390], "col2": [50, 40, 45]})
+
+    def to_fig(self, df) -> go.Figure:
+        return px.bar(df, x="col1", y="col2")
+
+
+def test_serializer__serialize__offload(settings):
+    expected = BarChartSerializer.serialize()
+    settings.DASHBOARDS_CHART_PROCESSES = 1
+
+    try:
+        with mock.patch("dashboards.offload.run", wraps=offload.run) as run:
+            assert BarChartSerializer.serialize() == expected
+    finally:
+        offload.get_executor().shutdown()
+        offload.get_executor.cache_clear()
+
+    run.assert_called_once()
+
+
+class DictBarChartSerializer(BarChartSerializer):
+    def to_fig(self, df) -> figures.Figure:
+        return figures.figure([figures.column_trace(df, "bar", "col1", "col2")])
+
+
+def test_serializer__build_figure_json__dict():
+    class FigureBarChartSerializer(BarChartSerializer):
+        def to_fig(self, df) -> go.Figure:
+            return go.Figure(go.Bar(x=df["col1"], y=df["col2"]))
+
+    df = DictBarChartSerializer().get_data()
+    expected = json.loads(FigureBarChartSerializer.build_figure_json(df))
+    value = json.loads(DictBarChartSerializer.build_figure_json(df))
+
+    assert value["data"] == expected["data"]
+    # plotly.js accepts a title string as shorthand for {"text": ...}
+    assert value["layout"].pop("title") == expected["layout"].pop("title")["text"]
+    assert value["layout"] == expected["layout"]
+
+
+def test_serializer__get_layout_json__encoded_once():
+    class LayoutChartSerializer(DictBarChartSerializer):
+        pass
+
+    with mock.patch.object(
+        LayoutChartSerializer, "get_layout", wraps=LayoutChartSerializer().get_layout
+    ) as get_layout:
+        first = LayoutChartSerializer.serialize()
+        second = LayoutChartSerializer.serialize()
+
+    assert first == second
+    get_layout.assert_called_once()
+
+
+def test_serializer__build_figure_json__dict_layout():
+    class LayoutChartSerializer(DictBarChartSerializer):
+        def to_fig(self, df) -> figures.Figure:
+            return figures.figure([], layout={"title": "Custom", "height": 200})
+
+    value = json.loads(LayoutChartSerializer.serialize())
+
+    assert value["data"] == []
+    assert value["layout"]["title"] == "Custom"
+    assert value["layout"]["height"] == 200
+    assert "template" in value["layout"]
+
+
+def test_serializer__to_delta__dict():
+    df = DictBarChartSerializer().get_data()
+
+    delta = DictBarChartSerializer().to_delta(df)
+
+    assert delta["traces"] == [0]
+    assert list(delta["update"]["x"][0]) == [420, 380, 390]
+
+
+def test_serializer__serialize__same_for_appearance(rf):
+    request = rf.get("/")
+    request.COOKIES["appearanceMode"] = "dark"
+
+    assert DictBarChartSerializer.serialize(
+        request=request
+    ) == DictBarChartSerializer.serialize(request=rf.get("/"))
+    assert BarChartSerializer.serialize(
+        request=request
+    ) == BarChartSerializer.serialize(request=rf.get("/"))
+
+
+def test_get_themes():
+    themes = get_themes()
+
+    assert themes["dark"]["paper_bgcolor"] == "rgba(0,0,0,0.05)"
+    assert themes["dark"]["template"]["layout"]["paper_bgcolor"] == "rgb(17,17,17)"
+
+
+@pytest.mark.django_db
+def test_serializer__get_data__aggregated():
+    class AggregateChartSerializer(ChartSerializer):
+        class Meta:
+            model = User
+            dimensions = ["first_name"]
+            time_field = "date_joined"
+            time_bucket = "day"
+            measures = {"users": Count("id"), "last_id": Max("id")}
+            where = {"is_active": True}
+
+    for u, (day, first_name) in enumerate(
+        [(1, "a"), (1, "a"), (1, "b"), (2, "a"), (2, "a")], start=10
+    ):
+        fake_user(
+            id=u,
+            username=f"u{u}",
+            first_name=first_name,
+            date_joined=datetime(2022, 6, day, 12, tzinfo=timezone.utc),
+        )
+    fake_user(id=20, username="inactive", is_active=False)
+
+    with CaptureQueriesContext(connection) as queries:
+        df = AggregateChartSerializer().get_data()
+
+    assert len(queries) == 1
+    assert list(df.columns) == ["date_joined_day", "first_name", "users", "last_id"]
+    assert [
+        (value.day, first_name, users, last_id)
+        for value, first_name, users, last_id in df.itertuples(index=False)
+    ] == [(1, "a", 2, 11), (1, "b", 1, 12), (2, "a", 2, 14)]
+
+
+@pytest.mark.parametrize(
+    "meta",
+    [
+        {"measures": {"users": Count("id")}},
+        {"dimensions": ["first_name"]},
+        {"time_bucket": "day", "measures": {"users": Count("id")}},
+        {
+            "time_field": "date_joined",
+            "time_bucket": "fortnight",
+            "measures": {"users": Count("id")},
+        },
+    ],
+)
+def test_serializer__aggregate__improperly_configured(meta):
+    with pytest.raises(ImproperlyConfigured):
+        type(
+            "AggregateChartSerializer",
+            (ChartSerializer,),
+            {"Meta": type("Meta", (), {"model": User, **meta})},
+        )
+
+
+@pytest.mark.django_db
+def test_serializer__get_data__sample():
+    class SampleChartSerializer(ChartSerializer):
+        class Meta:
+            model = User
+            fields = ["id"]
+            sample = 1
+
+        def to_fig(self, df) -> figures.Figure:
+            return figures.figure([figures.column_trace(df, "bar", "id", "id")])
+
+    fake_user(_quantity=5)
+
+    with CaptureQueriesContext(connection) as queries:
+        assert len(SampleChartSerializer().get_data()) == 5
+
+    assert "RANDOM()" in queries[0]["sql"]
+    annotations = json.loads(SampleChartSerializer.serialize())["layout"]["annotations"]
+    assert annotations[-1]["text"] == "\u2248 100% sample"
+
+
+def test_serializer__apply_layout__sample():
+    class SampleChartSerializer(BarChartSerializer):
+        class Meta:
+            sample = 0.001
+
+    fig = SampleChartSerializer().apply_layout(go.Figure())
+
+    assert fig.layout.annotations[0].text == "\u2248 0.1% sample"
+
+
+@pytest.mark.parametrize("sample", [0, 1.5])
+def test_serializer__sample__improperly_configured(sample):
+    with pytest.raises(ImproperlyConfigured):
+        type(
+            "SampleChartSerializer",
+            (ChartSerializer,),
+            {"Meta": type("Meta", (), {"model": User, "sample": sample})},
+        )
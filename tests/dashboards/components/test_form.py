@@ -4,7 +4,7 @@ from django.urls import reverse
 
 import pytest
 
-from dashboards.component import Form
+from dashboards.component import Form, Text
 from dashboards.forms import DashboardForm
 from tests.utils import render_component_test
 
@@ -111,3 +111,35 @@ def test_form_component__get_value__no_form_error(dashboard, rf):
 
     with pytest.raises(NotImplementedError):
         assert component.get_form(request)
+
+
+@pytest.mark.parametrize(
+    "data,expected",
+    [
+        ({"number": "two"}, None),
+        ({"number": "two", "_previous": "number=one"}, {"number"}),
+        ({"number": "two", "_previous": "number=two"}, set()),
+        ({"number": "two", "_previous": ""}, {"number"}),
+    ],
+)
+def test_form_component__get_changed_filters(data, expected, dashboard, rf):
+    component = Form(form=TestForm, method="get")
+
+    assert component.get_changed_filters(rf.get("/", data)) == expected
+
+
+def test_form_component__get_value__previous(dashboard, rf):
+    component = Form(form=TestForm, method="get", dependents=["component_1"])
+    component.dashboard = dashboard
+    component.key = "test"
+    request = rf.get("/", {"number": "two", "key": "x", "_previous": ""})
+
+    assert component.get_value(request)["previous"] is None
+
+    component.dependent_components = [Text(value="", consumes=["number"])]
+    value = component.get_value(request)
+
+    assert value["previous"] == "number=two"
+    assert 'name="_previous" value="number=two"' in component.render_value(
+        Context({"request": request}), call_deferred=True
+    )
@@ -1,11 +1,14 @@
 from datetime import date, timedelta
+from unittest import mock
 
 from django.contrib.auth.models import User
-from django.db.models import Count
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Count, Max
 from django.template import Context
 
 import pytest
 
+from dashboards import approximate
 from dashboards.component.stat import Stat, StatData, StatSerializer
 from dashboards.component.stat.serializers import (
     StatDateChangeSerializer,
@@ -142,3 +145,65 @@ def test_serializer__with_dates(test_user_date_serializer):
     assert result.change == 100.0
     assert result.title == "Users"
     assert result.unit == "People"
+
+
+@pytest.mark.parametrize("estimate", [None, 1000])
+@pytest.mark.django_db
+def test_serializer__estimate_count(estimate, rf):
+    class EstimateStatSerializer(StatSerializer):
+        class Meta:
+            annotation_field = "id"
+            annotation = Count
+            model = User
+            estimate_count = True
+
+    fake_user(_quantity=3)
+
+    with mock.patch.object(
+        approximate, "estimate_count", return_value=estimate
+    ) as estimate_count:
+        result = EstimateStatSerializer.serialize()
+
+    estimate_count.assert_called_once_with(User, "default")
+    assert result.value == (3 if estimate is None else estimate)
+    assert result.approximate is (estimate is not None)
+    assert ("&asymp;" in EstimateStatSerializer.render(serialized=result)) is (
+        estimate is not None
+    )
+
+
+def test_serializer__estimate_count__not_count():
+    with pytest.raises(ImproperlyConfigured):
+
+        class EstimateStatSerializer(StatSerializer):
+            class Meta:
+                annotation_field = "id"
+                annotation = Max
+                model = User
+                estimate_count = True
+
+
+@pytest.mark.django_db
+def test_serializer__approx_count_distinct():
+    class DistinctStatSerializer(StatSerializer):
+        class Meta:
+            annotation_field = "first_name"
+            annotation = approximate.ApproxCountDistinct
+            model = User
+
+    fake_user(first_name="a", _quantity=2)
+    fake_user(first_name="b")
+
+    result = DistinctStatSerializer.serialize()
+
+    assert result.value == 2
+    # counted exactly by sqlite
+    assert not result.approximate
+    assert "&asymp;" not in DistinctStatSerializer.render(serialized=result)
+
+    with mock.patch.object(
+        approximate.ApproxCountDistinct, "is_estimated", return_value=True
+    ) as is_estimated:
+        assert DistinctStatSerializer.serialize().approximate
+
+    is_estimated.assert_called_once_with("default")
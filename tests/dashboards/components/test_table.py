@@ -8,9 +8,14 @@ from django.template import Context
 
 import pytest
 
+from dashboards import url_templates
 from dashboards.component import BasicTable, Table
 from dashboards.component.table.mixins import TableDataProcessorMixin
-from dashboards.component.table.serializers import SerializedTable, TableSerializer
+from dashboards.component.table.serializers import (
+    SerializedTable,
+    SerializedTableDelta,
+    TableSerializer,
+)
 from tests.dashboards.fakes import fake_user
 from tests.utils import render_component_test
 
@@ -466,6 +471,34 @@ def test_serializer__first_as_absolute_url(test_user_serializer__qs):
     ]
 
 
+@pytest.mark.django_db
+def test_serializer__first_as_absolute_url__url_name(test_user_serializer__qs):
+    fake_user(username="abc", first_name="one")
+    fake_user(username="d e", first_name="two")
+
+    test_user_serializer__qs._meta.first_as_absolute_url = (
+        "dashboards:app1_testmodeldashboard_detail"
+    )
+    test_user_serializer__qs._meta.absolute_url_field = "username"
+
+    with patch(
+        "dashboards.url_templates.reverse", wraps=url_templates.reverse
+    ) as reverse:
+        result = test_user_serializer__qs.serialize()
+
+    assert reverse.call_count <= 1
+    assert result.data == [
+        {
+            "username": '<a href="/dash/app1/testmodeldashboard/abc/">abc</a>',
+            "first_name": "ONE",
+        },
+        {
+            "username": '<a href="/dash/app1/testmodeldashboard/d%20e/">d e</a>',
+            "first_name": "TWO",
+        },
+    ]
+
+
 @pytest.mark.django_db
 def test_no_columns():
     with pytest.raises(ImproperlyConfigured):
@@ -473,3 +506,60 @@ def test_no_columns():
         class TestTableSerializer(TableSerializer):
             class Meta:
                 model = User
+
+
+@pytest.fixture()
+def test_delta_serializer():
+    rows = [{"id": i, "name": f"row {i}"} for i in range(5)]
+
+    class TestDeltaTableSerializer(TableSerializer):
+        class Meta:
+            columns = {"id": "Id", "name": "Name"}
+            row_id = "id"
+
+        def get_data(self, *args, **kwargs):
+            return rows
+
+        def get_cursor(self, *args, **kwargs):
+            return len(rows)
+
+        def get_data_since(self, cursor, *args, **kwargs):
+            return rows[int(cursor) :], len(rows)
+
+    return rows, TestDeltaTableSerializer
+
+
+def test_serializer__serialize_since(test_delta_serializer):
+    rows, serializer = test_delta_serializer
+    rows.append({"id": 5, "name": None})
+
+    result = serializer.serialize_since(cursor="5")
+
+    assert isinstance(result, SerializedTableDelta)
+    assert result.data == [{"id": 5, "name": "-"}]
+    assert result.cursor == 6
+    assert result.row_id == "id"
+
+
+def test_serializer__serialize_since__no_changes(test_delta_serializer):
+    rows, serializer = test_delta_serializer
+
+    result = serializer.serialize_since(cursor=len(rows))
+
+    assert result.data == []
+    assert result.cursor == len(rows)
+
+
+def test_render__delta(test_delta_serializer, dashboard, rf):
+    _, serializer = test_delta_serializer
+    component = Table(defer=serializer, poll_rate=5)
+    component.dashboard = dashboard
+    component.key = "test"
+    context = Context({"component": component, "request": rf.get("/")})
+
+    html = render_component_test(context, htmx=False)
+
+    assert component.supports_delta
+    assert f'id="cursor_{component.template_id}" type="application/json">5<' in html
+    assert "Dashboard.pollDelta(" in html
+    assert "serverSide: true" not in html
@@ -1,7 +1,13 @@
+from typing import List
+
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+
 import pytest
 
 from dashboards.component import Text
-from dashboards.dashboard import Dashboard
+from dashboards.dashboard import Dashboard, ModelDashboard
+from dashboards.exceptions import DependencyError
 from tests.dashboards.app1.dashboards import TestDashboard, TestModelDashboard
 
 
@@ -133,3 +139,254 @@ def test_dashboard_has_verbose_name_and_name___verbose_name_is_provided_verbose_
     verbose_named_meta_dashboard,
 ):
     assert verbose_named_meta_dashboard._meta.verbose_name == "Meta Verbose Name"
+
+
+class DependentsDashboard(Dashboard):
+    filters = Text(value="", dependents=["country", "city", "everything"])
+    country = Text(value="", dependents=["summary"], consumes=["country"])
+    city = Text(value="", consumes=["city"])
+    everything = Text(value="")
+    summary = Text(value="", consumes=[])
+
+    class Meta:
+        app_label = "app1"
+
+
+@pytest.mark.parametrize(
+    "changed,expected",
+    [
+        (None, ["country", "city", "everything", "summary"]),
+        ({"country"}, ["country", "everything", "summary"]),
+        ({"city"}, ["city", "everything"]),
+        (set(), ["everything"]),
+    ],
+)
+def test_dashboard__get_dependents(changed, expected, rf):
+    dashboard = DependentsDashboard(request=rf.get("/"))
+    component = dashboard.components["filters"]
+
+    dependents = dashboard.get_dependents(component, changed=changed)
+
+    assert sorted(d.key for d in dependents) == sorted(expected)
+    # dependents are always after the components they depend on
+    keys = [d.key for d in dependents]
+    if "summary" in keys:
+        assert keys.index("country") < keys.index("summary")
+
+
+def test_dashboard__get_dependents__cycle(rf):
+    class CycleDashboard(Dashboard):
+        one = Text(value="", dependents=["two"])
+        two = Text(value="", dependents=["one"])
+
+        class Meta:
+            app_label = "app1"
+
+    dashboard = CycleDashboard(request=rf.get("/"))
+
+    with pytest.raises(DependencyError):
+        dashboard.get_dependents(dashboard.components["one"])
+
+
+class TestCachedModelDashboard(ModelDashboard):
+    component_1 = Text(value="value")
+
+    class Meta:
+        name = "Test Cached Model Dashboard"
+        model = User
+        app_label = "app1"
+        prefetch_related = ["groups"]
+        object_cache_timeout = 60
+
+
+@pytest.mark.django_db
+def test_model_dashboard__get_queryset__related(user):
+    queryset = TestCachedModelDashboard.get_queryset(TestCachedModelDashboard)
+
+    assert queryset._prefetch_related_lookups == ("groups",)
+
+
+@pytest.mark.django_db
+def test_model_dashboard__object_loaded_once_per_request(
+    user, rf, django_assert_num_queries
+):
+    request = rf.get("/")
+
+    with django_assert_num_queries(1):
+        dashboard = TestModelDashboard(request=request, lookup=user.pk)
+        assert TestModelDashboard(request=request, lookup=user.pk).object is (
+            dashboard.object
+        )
+
+    with django_assert_num_queries(1):
+        TestModelDashboard(request=rf.get("/"), lookup=user.pk)
+
+
+@pytest.mark.django_db
+def test_model_dashboard__object_cache(
+    user, rf, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    cache.clear()
+    Group.objects.create(name="group").user_set.add(user)
+
+    with django_assert_num_queries(2):
+        TestCachedModelDashboard(request=rf.get("/"), lookup=user.pk)
+
+    with django_assert_num_queries(0):
+        dashboard = TestCachedModelDashboard(request=rf.get("/"), lookup=user.pk)
+        assert [g.name for g in dashboard.object.groups.all()] == ["group"]
+
+    # changes to the model, or those prefetched, invalidate cached objects
+    user.first_name = "changed"
+    with django_capture_on_commit_callbacks(execute=True):
+        user.save()
+    dashboard = TestCachedModelDashboard(request=rf.get("/"), lookup=user.pk)
+    assert dashboard.object.first_name == "changed"
+
+    Group.objects.filter(name="group").update(name="renamed")
+    with django_capture_on_commit_callbacks(execute=True):
+        Group.objects.get().save()
+    dashboard = TestCachedModelDashboard(request=rf.get("/"), lookup=user.pk)
+    assert [g.name for g in dashboard.object.groups.all()] == ["renamed"]
+    cache.clear()
+
+
+class TestUserCachedModelDashboard(ModelDashboard):
+    component_1 = Text(value="value")
+
+    class Meta:
+        name = "Test User Cached Model Dashboard"
+        model = User
+        app_label = "app1"
+        object_cache_timeout = 60
+
+
+class TestStaffOnlyModelDashboard(ModelDashboard):
+    component_1 = Text(value="value")
+
+    class Meta:
+        name = "Test Staff Only Model Dashboard"
+        model = User
+        app_label = "app1"
+        object_cache_timeout = 60
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_staff=True)
+
+
+class TestStaffOnlyCachedModelDashboard(TestStaffOnlyModelDashboard):
+    class Meta:
+        name = "Test Staff Only Cached Model Dashboard"
+        model = User
+        app_label = "app1"
+        object_cache_timeout = 60
+        object_cache_custom_queryset = True
+
+
+@pytest.mark.django_db
+def test_model_dashboard__object_cache__per_dashboard(user, rf):
+    cache.clear()
+    request = rf.get("/")
+    TestUserCachedModelDashboard(request=request, lookup=user.pk)
+
+    # another dashboard of the same model doesn't use its object
+    with pytest.raises(User.DoesNotExist):
+        TestStaffOnlyCachedModelDashboard(request=request, lookup=user.pk)
+    with pytest.raises(User.DoesNotExist):
+        TestStaffOnlyCachedModelDashboard(request=rf.get("/"), lookup=user.pk)
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_model_dashboard__object_cache__custom_queryset(
+    user, rf, django_assert_num_queries
+):
+    cache.clear()
+    user.is_staff = True
+    user.save()
+
+    for dashboard, queries in [
+        (TestStaffOnlyModelDashboard, 1),
+        (TestStaffOnlyCachedModelDashboard, 0),
+    ]:
+        dashboard(request=rf.get("/"), lookup=user.pk)
+        with django_assert_num_queries(queries):
+            dashboard(request=rf.get("/"), lookup=user.pk)
+    cache.clear()
+
+
+class TestSharedContextDashboard(Dashboard):
+    deferred = Text(defer=lambda **kwargs: "value", shared=["disk"])
+    calls: List[str] = []
+
+    class Meta:
+        name = "Test Shared Context Dashboard"
+        app_label = "app1"
+
+    def get_disk_shared(self):
+        self.calls.append("disk")
+        return {"free": 1}
+
+    def get_cpu_shared(self):
+        self.calls.append("cpu")
+        return 2
+
+
+@pytest.fixture
+def shared_context_dashboard():
+    cache.clear()
+    TestSharedContextDashboard.calls.clear()
+    yield TestSharedContextDashboard
+    cache.clear()
+
+
+def test_get_shared_context_keys(shared_context_dashboard):
+    assert shared_context_dashboard.get_shared_context_keys() == ["cpu", "disk"]
+    assert TestDashboard.get_shared_context_keys() == []
+
+
+def test_shared_context__no_shared_context(rf):
+    dashboard = TestDashboard(request=rf.get("/"))
+    dashboard.render(request=dashboard.request)
+
+    assert dashboard.shared_context == {}
+    assert dashboard.page_token is None
+
+
+def test_shared_context__reused_by_page_requests(shared_context_dashboard, rf):
+    request = rf.get("/")
+    dashboard = shared_context_dashboard(request=request)
+    html = dashboard.render(request=request)
+
+    assert dashboard.shared_context == {"cpu": 2, "disk": {"free": 1}}
+    assert f"_page={dashboard.page_token}" in html
+    assert shared_context_dashboard.calls == ["cpu", "disk"]
+
+    request = rf.get("/", {"_page": dashboard.page_token})
+    component_dashboard = shared_context_dashboard(request=request)
+
+    assert component_dashboard.shared_context == dashboard.shared_context
+    assert component_dashboard.page_token == dashboard.page_token
+    assert shared_context_dashboard.calls == ["cpu", "disk"]
+
+
+def test_shared_context__expired__computes_needed_keys(shared_context_dashboard, rf):
+    request = rf.get("/", {"_page": "expired"})
+    dashboard = shared_context_dashboard(request=request, shared_keys=["disk"])
+
+    assert dashboard.shared_context == {"disk": {"free": 1}}
+    assert dashboard.page_token is None
+    assert shared_context_dashboard.calls == ["disk"]
+
+
+def test_shared_context__other_user(shared_context_dashboard, rf, admin_user, user):
+    request = rf.get("/")
+    request.user = admin_user
+    dashboard = shared_context_dashboard(request=request)
+    dashboard.shared_context
+
+    request = rf.get("/", {"_page": dashboard.page_token})
+    request.user = user
+
+    assert shared_context_dashboard(request=request).shared_context
+    assert shared_context_dashboard.calls == ["cpu", "disk", "cpu", "disk"]
@@ -1,7 +1,14 @@
+from unittest.mock import patch
+from urllib.parse import urlencode
+
+from django.core.cache import cache
 from django.template import Context
 
 import pytest
 
+from dashboards import permissions
+from dashboards.component import Text
+from dashboards.component.base import PAGE_TOKEN_PARAM
 from dashboards.component.layout import (
     HTML,
     Card,
@@ -11,6 +18,8 @@ from dashboards.component.layout import (
     Tab,
     TabContainer,
 )
+from dashboards.dashboard import Dashboard
+from dashboards.memo import activate as activate_memo
 from tests.utils import render_dashboard_test
 
 
@@ -171,3 +180,163 @@ def test_layout_component__unknown_component_ignored(rf, dashboard, snapshot):
             "component_3",
         ).render(dashboard=dashboard(request=request), context=context)
     )
+
+
+@pytest.fixture
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def render_cached(layout, dashboard, request):
+    return layout.render_cached(
+        dashboard=dashboard(request=request), context=Context({"request": request})
+    )
+
+
+def test_render_cached__cached(rf, dashboard, clear_cache):
+    layout = Card("component_1", "component_2", cache_timeout=60)
+
+    with patch.object(Text, "render", autospec=True, side_effect=Text.render) as render:
+        first = render_cached(layout, dashboard, rf.get("/"))
+        second = render_cached(layout, dashboard, rf.get("/"))
+
+    assert render.call_count == 2
+    assert first == second
+
+
+def test_render_cached__nested(rf, dashboard, clear_cache):
+    layout = Div(Card("component_1"), HTML("<hr />"), cache_timeout=60)
+
+    with patch.object(Text, "render", autospec=True, side_effect=Text.render) as render:
+        render_cached(layout, dashboard, rf.get("/"))
+        render_cached(layout, dashboard, rf.get("/"))
+
+    assert render.call_count == 1
+
+
+def test_render_cached__varies_on_filters(rf, dashboard, clear_cache):
+    layout = Card("component_1", cache_timeout=60)
+
+    with patch.object(Text, "render", autospec=True, side_effect=Text.render) as render:
+        render_cached(layout, dashboard, rf.get("/"))
+        render_cached(layout, dashboard, rf.get("/?a=1"))
+
+    assert render.call_count == 2
+
+
+@pytest.mark.django_db
+def test_render_cached__varies_on_user(rf, dashboard, django_user_model, clear_cache):
+    layout = Div(HTML("<p>{{ request.user.username }}</p>"), cache_timeout=60)
+    htmls = []
+    for username in ["a", "b"]:
+        request = rf.get("/")
+        request.user = django_user_model.objects.create(username=username)
+        htmls.append(render_cached(layout, dashboard, request))
+
+    assert "<p>a</p>" in htmls[0]
+    assert "<p>b</p>" in htmls[1]
+
+
+@pytest.mark.parametrize(
+    "layout,renders",
+    [
+        # callable value has no version
+        (Card("component_1", "component_3", cache_timeout=60), 4),
+        (Div(Card("component_3"), cache_timeout=60), 2),
+        # not opted in
+        (Card("component_1"), 2),
+    ],
+)
+def test_render_cached__not_cached(rf, dashboard, layout, renders, clear_cache):
+    with patch.object(Text, "render", autospec=True, side_effect=Text.render) as render:
+        render_cached(layout, dashboard, rf.get("/"))
+        render_cached(layout, dashboard, rf.get("/"))
+
+    assert render.call_count == renders
+
+
+@pytest.mark.django_db
+def test_render_cached__access_tokens_per_user(
+    rf, dashboard, django_user_model, settings, clear_cache
+):
+    settings.DASHBOARDS_COMPONENT_ACCESS_TOKEN_MAX_AGE = 60
+    layout = Card("component_1", "component_2", cache_timeout=60)
+    htmls = []
+    for username in ["a", "b"]:
+        request = rf.get("/")
+        request.user = django_user_model.objects.create(username=username)
+        with activate_memo(request):
+            html = render_cached(layout, dashboard, request)
+
+        token = permissions.get_access_token(request, dashboard)
+        assert urlencode({permissions.ACCESS_TOKEN_PARAM: token}) in html
+        htmls.append(html)
+
+    assert htmls[0] != htmls[1]
+    assert "__dashboards_access__" not in htmls[1]
+
+
+class SharedContextDashboard(Dashboard):
+    component_1 = Text(defer=lambda **kwargs: "value", shared=["disk"])
+
+    class Meta:
+        name = "Shared Context Layout Dashboard"
+        app_label = "app1"
+
+    def get_disk_shared(self):
+        return {"free": 1}
+
+
+def test_render_cached__page_token_per_page(rf, clear_cache):
+    layout = Card("component_1", cache_timeout=60)
+    tokens = []
+    for _ in range(2):
+        request = rf.get("/")
+        with activate_memo(request):
+            dashboard = SharedContextDashboard(request=request)
+            # as Dashboard.render, creating a new page token
+            dashboard.shared_context
+            html = layout.render_cached(
+                dashboard=dashboard, context=Context({"request": request})
+            )
+
+        assert urlencode({PAGE_TOKEN_PARAM: dashboard.page_token}) in html
+        # the cached html points at a shared context which exists
+        assert cache.get(dashboard.get_shared_context_cache_key(dashboard.page_token))
+        tokens.append(dashboard.page_token)
+
+    assert tokens[0] != tokens[1]
+
+
+def test_tab_container__lazy__render(rf, lazy_tab_dashboard):
+    request = rf.get("/")
+
+    with patch.object(Text, "render", autospec=True, side_effect=Text.render) as render:
+        html = lazy_tab_dashboard(request=request).render(request=request)
+
+    # only the first tab's component is rendered
+    assert [call.args[0].key for call in render.call_args_list] == ["component_1"]
+    assert "x-data=\"{ tab: 'first' }\"" in html
+    assert 'hx-get="/dash/app1/testdashboardwithlazytabs/@tab/second/"' in html
+
+
+def test_tab_container__lazy__active_tab(rf, lazy_tab_dashboard):
+    request = rf.get("/?tab=second")
+
+    with patch.object(Text, "render", autospec=True, side_effect=Text.render) as render:
+        html = lazy_tab_dashboard(request=request).render(request=request)
+
+    assert [call.args[0].key for call in render.call_args_list] == [
+        "component_2",
+        "component_3",
+    ]
+    assert "x-data=\"{ tab: 'second' }\"" in html
+    assert 'hx-get="/dash/app1/testdashboardwithlazytabs/@tab/first/"' in html
+
+
+def test_get_tab(lazy_tab_dashboard, dashboard_with_layout):
+    assert lazy_tab_dashboard().get_tab("second").tab_label == "Second"
+    assert lazy_tab_dashboard().get_tab("third") is None
+    assert dashboard_with_layout().get_tab("second") is None
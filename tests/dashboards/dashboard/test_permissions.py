@@ -1,8 +1,11 @@
+from unittest import mock
+
 from django.contrib.auth.models import AnonymousUser, User
 from django.core.exceptions import PermissionDenied
 from django.http import HttpResponseRedirect
 
 import pytest
+from freezegun import freeze_time
 
 from dashboards import permissions
 from dashboards.dashboard import Dashboard, ModelDashboard
@@ -194,3 +197,66 @@ def test_model_dashboard__has_permission_passes_for_authenticated_user(user, rf)
     dashboard = TestModelDashboard(request=request, lookup=lookup)
 
     assert dashboard.has_permissions(request) is True
+
+
+def test_dashboard__get_dashboard_permissions__instances_shared(admin_dashboard):
+    assert (
+        admin_dashboard.get_dashboard_permissions()[0]
+        is admin_dashboard.get_dashboard_permissions()[0]
+    )
+
+
+@pytest.mark.django_db
+def test_dashboard__has_permissions__decided_once_per_request(
+    admin_dashboard, user, rf
+):
+    request = rf.get("/")
+    request.user = user
+
+    with mock.patch.object(
+        permissions.IsAdminUser, "has_permission", return_value=False
+    ) as has_permission:
+        assert admin_dashboard.has_permissions(request, handle=False) is False
+        with pytest.raises(PermissionDenied):
+            admin_dashboard.has_permissions(request, handle=True)
+
+    assert has_permission.call_count == 1
+
+    request = rf.get("/")
+    request.user = user
+    with mock.patch.object(
+        permissions.IsAdminUser, "has_permission", return_value=True
+    ) as has_permission:
+        assert admin_dashboard.has_permissions(request) is True
+
+    assert has_permission.call_count == 1
+
+
+@pytest.mark.django_db
+def test_access_token(admin_dashboard, dashboard, user, rf, settings):
+    request = rf.get("/")
+    request.user = user
+    assert permissions.get_access_token(request, admin_dashboard) is None
+
+    settings.DASHBOARDS_COMPONENT_ACCESS_TOKEN_MAX_AGE = 60
+    token = permissions.get_access_token(request, admin_dashboard)
+
+    assert permissions.check_access_token(request, admin_dashboard, token) is True
+    assert permissions.check_access_token(request, dashboard, token) is False
+    assert permissions.check_access_token(request, admin_dashboard, "bad") is False
+
+    request.user = AnonymousUser()
+    assert permissions.check_access_token(request, admin_dashboard, token) is False
+
+
+@pytest.mark.django_db
+def test_access_token__expired(admin_dashboard, user, rf, settings):
+    settings.DASHBOARDS_COMPONENT_ACCESS_TOKEN_MAX_AGE = 60
+    request = rf.get("/")
+    request.user = user
+
+    with freeze_time("2022-01-01 00:00:00"):
+        token = permissions.get_access_token(request, admin_dashboard)
+
+    with freeze_time("2022-01-01 00:02:00"):
+        assert permissions.check_access_token(request, admin_dashboard, token) is False
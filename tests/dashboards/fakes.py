@@ -14,3 +14,14 @@ def fake_user(**kwargs):
         user.set_password(password)
         user.save()
     return user
+
+
+class FakeJobBackend:
+    """
+    Job backend which holds submitted jobs until run by the test.
+    """
+
+    jobs: list = []
+
+    def submit(self, job):
+        self.jobs.append(job)
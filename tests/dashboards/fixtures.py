@@ -9,6 +9,7 @@ from tests.dashboards.app1.dashboards import (
     TestComplexDashboard,
     TestDashboard,
     TestDashboardWithLayout,
+    TestDashboardWithLazyTabs,
     TestDashboardWithMetaName,
     TestDashboardWithMetaVerboseName,
     TestFilterDashboard,
@@ -54,6 +55,11 @@ def dashboard_with_layout(dashboard):
     return TestDashboardWithLayout
 
 
+@pytest.fixture
+def lazy_tab_dashboard():
+    return TestDashboardWithLazyTabs
+
+
 @pytest.fixture
 def no_meta_dashboard(dashboard):
     return TestNoMetaDashboard
@@ -1,3 +1,6 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
 from django.urls import resolve
 
 import pytest
@@ -9,6 +12,7 @@ from dashboards.menus.menu import (
     MenuItem,
     make_dashboard_item,
 )
+from dashboards.registry import registry
 
 
 pytestmark = pytest.mark.django_db(reset_sequences=True)
@@ -223,3 +227,118 @@ def test_make_dashboard_item(model_dashboard, user):
     assert menu_item.url == model_dashboard(object=user).get_absolute_url()
     assert menu_item.dashboard == model_dashboard
     assert menu_item.children is None
+
+
+def test_dashboard_menu__get_cached_items__copies(user):
+    class TestDashboardMenu(DashboardMenu):
+        name = "Test Dashboard Menu"
+        app_label = "app1"
+
+    with patch.object(
+        TestDashboardMenu, "get_items", wraps=TestDashboardMenu.get_items
+    ) as get_items:
+        first = TestDashboardMenu.get_cached_items()
+        second = TestDashboardMenu.get_cached_items()
+
+    assert get_items.call_count == 1
+    assert [item.url for item in first] == [item.url for item in second]
+    assert first[0] is not second[0]
+
+
+def test_menu__get_cached_items__render_leaves_cache_unchanged(user, rf):
+    class TestCachedMenu(Menu):
+        name = "Test Cached Menu"
+        cache_items = True
+
+        @classmethod
+        def get_items(cls, obj=None):
+            return [
+                MenuItem(
+                    title="parent",
+                    url="/parent/",
+                    children=[
+                        MenuItem(title="shown", url="/shown/"),
+                        MenuItem(
+                            title="hidden", url="/hidden/", check_func=lambda r: False
+                        ),
+                    ],
+                )
+            ]
+
+    request = rf.get("/")
+    request.user = user
+    request.resolver_match = None
+
+    with patch("copy.deepcopy") as deepcopy:
+        rendered = TestCachedMenu.render(request)
+    cached = TestCachedMenu._items_cache[1]
+
+    deepcopy.assert_not_called()
+    assert [child.title for child in rendered[0].children] == ["shown"]
+    assert [child.title for child in cached[0].children] == ["shown", "hidden"]
+    assert all(child.parent is None for child in cached[0].children)
+    assert cached[0].children[1].visible
+    # and the next request sees the whole menu again
+    assert [child.title for child in TestCachedMenu.render(request)[0].children] == [
+        "shown"
+    ]
+
+
+def test_dashboard_menu__get_cached_items__registry_changed(dashboard, user):
+    class TestDashboardMenu(DashboardMenu):
+        name = "Test Dashboard Menu"
+        app_label = "app1"
+
+    assert len(TestDashboardMenu.get_cached_items()) == 6
+
+    registry.remove(dashboard)
+
+    assert len(TestDashboardMenu.get_cached_items()) == 5
+
+
+def test_dashboard_menu__get_cached_items__object_not_cached(user):
+    class TestDashboardMenu(DashboardMenu):
+        name = "Test Dashboard Menu"
+        app_label = "app1"
+
+    with patch.object(
+        TestDashboardMenu, "get_items", wraps=TestDashboardMenu.get_items
+    ) as get_items:
+        TestDashboardMenu.get_cached_items(obj=user)
+        TestDashboardMenu.get_cached_items(obj=user)
+
+    assert get_items.call_count == 2
+
+
+def test_menu__get_cached_items__not_cached_by_default(menu):
+    with patch.object(menu, "get_items", wraps=menu.get_items) as get_items:
+        menu.get_cached_items()
+        menu.get_cached_items()
+
+    assert get_items.call_count == 2
+
+
+def test_dashboard_menu_item__check__cached(admin_dashboard, user, rf, settings):
+    settings.DASHBOARDS_MENU_PERMISSION_CACHE = 60
+    cache.clear()
+    request = rf.get("/")
+    request.user = user
+    menu_item = DashboardMenuItem(title="test", url="/", dashboard=admin_dashboard)
+
+    with patch.object(
+        admin_dashboard, "has_permissions", return_value=False
+    ) as has_permissions:
+        menu_item.check(request)
+        menu_item.check(request)
+
+    assert has_permissions.call_count == 1
+    assert menu_item.visible is False
+    cache.clear()
+
+
+def test_make_dashboard_item__does_not_construct_dashboard(model_dashboard, user):
+    with patch.object(model_dashboard, "__init__") as init:
+        menu_item = make_dashboard_item(model_dashboard, obj=user)
+
+    init.assert_not_called()
+    assert menu_item.url == f"/dash/app1/testmodeldashboard/{user.pk}/"
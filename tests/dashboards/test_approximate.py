@@ -0,0 +1,82 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS, connection
+
+import pytest
+
+from dashboards import approximate
+from tests.dashboards.fakes import fake_user
+
+
+@pytest.mark.django_db
+def test_sample():
+    fake_user(_quantity=50)
+    queryset = User.objects.all()
+
+    assert queryset.filter(approximate.Sample(1)).count() == 50
+    assert queryset.filter(approximate.Sample(0)).count() == 0
+    assert "RANDOM()" in str(queryset.filter(approximate.Sample(0.5)).query)
+
+
+@pytest.mark.django_db
+def test_approx_count_distinct():
+    fake_user(first_name="a", _quantity=3)
+    fake_user(first_name="b", _quantity=2)
+
+    # not estimated by sqlite
+    assert User.objects.aggregate(
+        count=approximate.ApproxCountDistinct("first_name")
+    ) == {"count": 2}
+
+
+@pytest.mark.parametrize("hll", [False, True])
+def test_approx_count_distinct__postgres_hll(settings, hll):
+    settings.DASHBOARDS_POSTGRES_HLL = hll
+    query = User.objects.all().query
+    compiler = query.get_compiler(DEFAULT_DB_ALIAS)
+    aggregate = approximate.ApproxCountDistinct("first_name").resolve_expression(query)
+
+    sql, _ = aggregate.as_postgresql(compiler, connection)
+
+    assert ("hll_cardinality(hll_add_agg(hll_hash_any(" in sql) is hll
+    assert ("COUNT(DISTINCT" in sql) is not hll
+
+
+@pytest.mark.parametrize(
+    "vendor, hll, estimated",
+    [
+        ("sqlite", True, False),
+        ("mysql", True, False),
+        ("postgresql", False, False),
+        ("postgresql", True, True),
+        ("oracle", False, True),
+    ],
+)
+def test_approx_count_distinct__is_estimated(settings, vendor, hll, estimated):
+    settings.DASHBOARDS_POSTGRES_HLL = hll
+    with mock.patch.object(approximate, "connections") as connections:
+        connections.__getitem__.return_value.vendor = vendor
+
+        assert approximate.ApproxCountDistinct.is_estimated("default") is estimated
+
+
+@pytest.mark.django_db
+def test_estimate_count__unsupported():
+    assert approximate.estimate_count(User, DEFAULT_DB_ALIAS) is None
+
+
+@pytest.mark.parametrize("estimate, expected", [(1200.0, 1200), (-1.0, None)])
+def test_estimate_count__postgres(estimate, expected):
+    with mock.patch.object(approximate, "connections") as connections:
+        postgres = connections.__getitem__.return_value
+        postgres.vendor = "postgresql"
+        postgres.ops.quote_name.side_effect = lambda name: f'"{name}"'
+        cursor = postgres.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (estimate,)
+
+        assert approximate.estimate_count(User, DEFAULT_DB_ALIAS) == expected
+
+    cursor.execute.assert_called_once_with(
+        "SELECT reltuples FROM pg_class WHERE oid = to_regclass(%s)", ['"auth_user"']
+    )
@@ -0,0 +1,138 @@
+import json
+from unittest.mock import patch
+
+from django.core.management import CommandError, call_command
+
+import asset_definitions
+import pytest
+
+from dashboards import bundling
+from dashboards.component import Text
+from dashboards.registry import registry
+from dashboards.views import DashboardView
+
+
+pytest_plugins = [
+    "tests.dashboards.fixtures",
+]
+
+
+@pytest.fixture
+def bundle_dir(tmp_path, settings):
+    settings.DASHBOARDS_MEDIA_BUNDLE_DIR = str(tmp_path)
+    yield tmp_path
+    bundling.load_manifest.cache_clear()
+
+
+def test_get_class_media__computed_once(complex_dashboard):
+    if "_class_media" in complex_dashboard.__dict__:
+        del complex_dashboard._class_media
+
+    with patch.object(
+        Text, "get_media", autospec=True, return_value=asset_definitions.Media()
+    ) as get_media:
+        media = complex_dashboard().get_media()
+        assert complex_dashboard().get_media()._js == media._js
+
+    assert get_media.call_count == 5
+
+
+def test_get_media(complex_dashboard):
+    media = complex_dashboard().get_media()
+
+    assert media._js == [
+        "dashboards/js/dashboard.js",
+        "dashboards/vendor/js/plotly.min.js",
+    ]
+    assert media._css == {"all": ["dashboards/css/dashboards.css"]}
+
+
+def test_rewrite_css_urls():
+    css = "a { background: url('../img/a.png') } b { background: url(/abs.png) }"
+
+    assert bundling.rewrite_css_urls(css, "app/css/style.css") == (
+        "a { background: url('../../app/img/a.png') } "
+        "b { background: url(/abs.png) }"
+    )
+
+
+def test_bundle_paths__external_kept_in_order(tmp_path):
+    (tmp_path / bundling.BUNDLE_PATH).mkdir(parents=True)
+
+    bundled = bundling.bundle_paths(
+        [
+            "dashboards/js/dashboard.js",
+            "https://cdn.example.com/lib.js",
+            "dashboards/vendor/js/htmx.min.js",
+        ],
+        "name",
+        "js",
+        tmp_path,
+    )
+
+    assert bundled[0].startswith("dashboards/bundles/name.0.")
+    assert bundled[1] == "https://cdn.example.com/lib.js"
+    assert bundled[2].startswith("dashboards/bundles/name.2.")
+    assert "/* dashboards/js/dashboard.js */" in (tmp_path / bundled[0]).read_text()
+
+
+def test_bundle_paths__missing():
+    with pytest.raises(FileNotFoundError):
+        bundling.bundle_paths(["missing.js"], "name", "js", None)
+
+
+def test_command__no_output(settings):
+    settings.DASHBOARDS_MEDIA_BUNDLE_DIR = None
+
+    with pytest.raises(CommandError):
+        call_command("bundle_dashboard_media")
+
+
+def test_command__bundles_registered(bundle_dir, dashboard):
+    registry.reset()
+    registry.register(dashboard)
+
+    call_command("bundle_dashboard_media")
+
+    manifest = json.loads(
+        (bundle_dir / bundling.BUNDLE_PATH / bundling.MANIFEST_NAME).read_text()
+    )
+    bundle = manifest[dashboard.get_slug()]
+    assert len(bundle["js"]) == 1
+    assert len(bundle["css"]) == 1
+    assert "dashboards/js/dashboard.js" in (bundle_dir / bundle["js"][0]).read_text()
+
+    media = dashboard().get_media()
+    assert media._js == bundle["js"]
+    assert media._css == {"all": bundle["css"]}
+
+
+def test_get_media__not_bundled(bundle_dir, dashboard):
+    assert dashboard().get_media()._js == ["dashboards/js/dashboard.js"]
+
+
+def test_get_preload_links():
+    media = asset_definitions.Media(
+        js=["a.js", "https://cdn.example.com/b.js"], css={"all": ["c.css"]}
+    )
+
+    assert bundling.get_preload_links(media) == (
+        "</static/a.js>; rel=preload; as=script, </static/c.css>; rel=preload; as=style"
+    )
+
+
+def test_dashboard_view__link_header(rf, dashboard):
+    response = DashboardView.as_view(dashboard_class=dashboard)(rf.get("/"))
+
+    assert response["Link"] == (
+        "</static/dashboards/js/dashboard.js>; rel=preload; as=script, "
+        "</static/dashboards/css/dashboards.css>; rel=preload; as=style"
+    )
+
+
+def test_dashboard_view__htmx__no_link_header(rf, dashboard):
+    response = DashboardView.as_view(dashboard_class=dashboard)(
+        rf.get("/", HTTP_HX_REQUEST="true")
+    )
+
+    assert "Link" not in response
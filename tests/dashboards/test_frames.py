@@ -0,0 +1,82 @@
+import os
+
+import pandas as pd
+import pytest
+
+from dashboards import frames
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(settings, tmp_path):
+    settings.DASHBOARDS_DATAFRAME_CACHE_DIR = str(tmp_path / "frames")
+    return tmp_path / "frames"
+
+
+@pytest.fixture(params=["pickle", "feather"])
+def format(request, monkeypatch):
+    if request.param == "feather":
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr(frames, "feather", None)
+
+    return request.param
+
+
+def test_is_enabled(settings):
+    assert frames.is_enabled()
+
+    settings.DASHBOARDS_DATAFRAME_CACHE_DIR = None
+
+    assert not frames.is_enabled()
+
+
+def test_get_or_set(format, cache_dir):
+    df = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+    calls = []
+
+    def load():
+        calls.append(1)
+        return df
+
+    pd.testing.assert_frame_equal(frames.get_or_set("key", load), df)
+    pd.testing.assert_frame_equal(frames.get_or_set("key", load), df)
+
+    assert len(calls) == 1
+    assert [path.suffix for path in cache_dir.iterdir()] == [f".{format}"]
+
+
+def test_load__missing():
+    assert frames.load("missing") is None
+
+
+def test_load__corrupt(format):
+    frames.get_path("key").write_bytes(b"corrupt")
+
+    assert frames.load("key") is None
+    assert not frames.get_path("key").exists()
+
+
+def test_evict__least_recently_used(settings, format):
+    df = pd.DataFrame({"a": range(1000)})
+    frames.store("first", df)
+    frames.store("second", df)
+    first, second = frames.get_path("first"), frames.get_path("second")
+    settings.DASHBOARDS_DATAFRAME_CACHE_SIZE = first.stat().st_size * 2
+    os.utime(first, (0, 0))
+    os.utime(second, (1, 1))
+
+    # reading marks first as more recently used than second
+    frames.load("first")
+    frames.store("third", df)
+
+    assert first.exists()
+    assert not second.exists()
+    assert frames.get_path("third").exists()
+
+
+def test_clear(cache_dir):
+    frames.store("key", pd.DataFrame({"a": [1]}))
+
+    frames.clear()
+
+    assert list(cache_dir.iterdir()) == []
@@ -0,0 +1,115 @@
+import threading
+
+from django.core.cache import cache
+
+import pytest
+
+from dashboards import jobs
+from dashboards.component import Text
+from tests.dashboards.fakes import FakeJobBackend
+
+
+pytest_plugins = [
+    "tests.dashboards.fixtures",
+]
+
+
+@pytest.fixture(autouse=True)
+def job_backend(settings):
+    cache.clear()
+    FakeJobBackend.jobs.clear()
+    settings.DASHBOARDS_JOB_BACKEND = "tests.dashboards.fakes.FakeJobBackend"
+    yield
+    cache.clear()
+
+
+def test_submit__runs_once():
+    assert jobs.submit("job", lambda: "result") is True
+    assert jobs.submit("job", lambda: "other") is False
+    assert jobs.get_state("job") == {"status": jobs.PENDING}
+    assert len(FakeJobBackend.jobs) == 1
+
+    jobs.run(FakeJobBackend.jobs[0])
+
+    assert jobs.get_state("job") == {"status": jobs.DONE, "result": "result"}
+
+
+def test_run__failed():
+    def fail():
+        raise ValueError()
+
+    jobs.run(jobs.Job(id="job", func=fail))
+
+    assert jobs.get_state("job") == {"status": jobs.FAILED}
+
+    jobs.clear("job")
+
+    assert jobs.get_state("job") is None
+
+
+def test_sync_backend(settings):
+    settings.DASHBOARDS_JOB_BACKEND = "dashboards.jobs.SyncBackend"
+
+    jobs.submit("job", lambda: "result")
+
+    assert jobs.get_state("job") == {"status": jobs.DONE, "result": "result"}
+
+
+def test_thread_pool_backend(settings):
+    settings.DASHBOARDS_JOB_BACKEND = "dashboards.jobs.ThreadPoolBackend"
+    ran_in = []
+
+    jobs.submit("job", lambda: ran_in.append(threading.current_thread().name))
+
+    assert jobs.wait("job", timeout=5, interval=0.01)["status"] == jobs.DONE
+    assert ran_in[0].startswith("dashboards-job")
+
+
+def test_wait__times_out():
+    jobs.submit("job", lambda: "result")
+
+    assert jobs.wait("job", timeout=0.05, interval=0.01) == {"status": jobs.PENDING}
+
+
+def test_get_job_id(dashboard):
+    component = dashboard.components["component_2"]
+    component.dashboard = dashboard
+    component.key = "component_2"
+
+    assert jobs.get_job_id(component, {"a": "1"}) == jobs.get_job_id(
+        component, {"a": "1"}
+    )
+    assert jobs.get_job_id(component, {"a": "1"}) != jobs.get_job_id(
+        component, {"a": "2"}
+    )
+    assert jobs.get_job_id(component) != jobs.get_job_id(
+        Text(dashboard=dashboard, key="other")
+    )
+
+
+def test_get_job_id__per_user(rf, dashboard, django_user_model):
+    component = dashboard.components["component_2"]
+    component.dashboard = dashboard
+    request, other = rf.get("/"), rf.get("/")
+    request.user = django_user_model(pk=1, username="a")
+    other.user = django_user_model(pk=2, username="b")
+
+    assert jobs.get_job_id(component, request=request) != jobs.get_job_id(
+        component, request=other
+    )
+
+
+def test_detach_request(rf, django_user_model):
+    request = rf.post("/path/?a=1", {"b": "2"}, HTTP_X_CUSTOM="header")
+    request.user = django_user_model(username="a")
+
+    detached = jobs.detach_request(request)
+
+    assert detached is not request
+    assert detached.method == "POST"
+    assert detached.path == "/path/"
+    assert detached.GET == {"a": ["1"]}
+    assert detached.POST == {"b": ["2"]}
+    assert detached.headers["X-Custom"] == "header"
+    assert detached.user is request.user
+    assert "wsgi.input" not in detached.META
@@ -0,0 +1,87 @@
+import threading
+
+import pytest
+
+from dashboards import lanes
+from dashboards.component import Table, Text
+from dashboards.component.table import TableSerializer
+from dashboards.exceptions import LaneSaturated
+
+
+@pytest.fixture(autouse=True)
+def lane_settings(settings):
+    settings.DASHBOARDS_LANES = {"expensive": 1}
+
+
+def test_admit__saturated():
+    with lanes.admit("expensive"):
+        with pytest.raises(LaneSaturated):
+            with lanes.admit("expensive"):
+                pass
+
+    # released once the block exits
+    with lanes.admit("expensive"):
+        pass
+
+
+def test_admit__released_on_error():
+    with pytest.raises(ValueError):
+        with lanes.admit("expensive"):
+            raise ValueError()
+
+    with lanes.admit("expensive"):
+        pass
+
+
+@pytest.mark.parametrize("lane", [None, "cheap"])
+def test_admit__unlimited(lane):
+    with lanes.admit(lane):
+        with lanes.admit(lane):
+            pass
+
+
+def test_admit__wait():
+    entered = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with lanes.admit("expensive"):
+            entered.set()
+            release.wait(1)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    entered.wait(1)
+
+    with pytest.raises(LaneSaturated):
+        with lanes.admit("expensive", wait=0.01):
+            pass
+
+    threading.Timer(0.05, release.set).start()
+    with lanes.admit("expensive", wait=1):
+        pass
+
+    thread.join()
+
+
+def test_admit__setting_changed(settings):
+    with lanes.admit("expensive"):
+        settings.DASHBOARDS_LANES = {"expensive": 2}
+        with lanes.admit("expensive"):
+            pass
+
+
+def test_get_lane():
+    class ExpensiveSerializer(TableSerializer):
+        class Meta:
+            columns = {"a": "A"}
+            order = ["a"]
+            lane = "expensive"
+
+        def get_data(self, *args, **kwargs):
+            return []
+
+    assert Text(value="value").get_lane() is None
+    assert Text(value="value", lane="cheap").get_lane() == "cheap"
+    assert Table(defer=ExpensiveSerializer).get_lane() == "expensive"
+    assert Table(defer=ExpensiveSerializer, lane="cheap").get_lane() == "cheap"
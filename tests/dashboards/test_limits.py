@@ -0,0 +1,218 @@
+import time
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import OperationalError, connection
+from django.template import Context
+
+import pytest
+
+from dashboards import limits
+from dashboards.component import Text
+from dashboards.exceptions import (
+    ComponentLimitExceeded,
+    ComponentTimeout,
+    QueryBudgetExceeded,
+)
+from dashboards.limits import Limits, enforce, is_limit_error
+
+
+pytest_plugins = [
+    "tests.dashboards.fixtures",
+]
+
+SLOW_QUERY = (
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) "
+    "SELECT count(*) FROM (SELECT x FROM c LIMIT 1000000000)"
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_enforce__max_queries():
+    with enforce(Limits(max_queries=2)):
+        User.objects.count()
+        User.objects.count()
+
+    with pytest.raises(QueryBudgetExceeded):
+        with enforce(Limits(max_queries=2)):
+            for _ in range(3):
+                User.objects.count()
+
+
+@pytest.mark.django_db
+def test_enforce__timeout_checked_between_queries():
+    with pytest.raises(ComponentTimeout):
+        with enforce(Limits(timeout=0.01)):
+            User.objects.count()
+            time.sleep(0.02)
+            User.objects.count()
+
+
+@pytest.mark.django_db
+def test_enforce__statement_timeout():
+    start = time.monotonic()
+    with pytest.raises(OperationalError):
+        with enforce(Limits(statement_timeout=0.05)):
+            with connection.cursor() as cursor:
+                cursor.execute(SLOW_QUERY)
+
+    assert time.monotonic() - start < 5
+    # the timeout is removed and the connection still usable afterwards
+    assert User.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_enforce__nested__outer_statement_timeout_kept():
+    with pytest.raises(OperationalError):
+        with enforce(Limits(statement_timeout=0.05)):
+            with enforce(Limits(max_queries=1)):
+                User.objects.count()
+            with enforce(Limits(statement_timeout=10)):
+                User.objects.count()
+            # the outer limit still applies once the inner blocks exit
+            with connection.cursor() as cursor:
+                cursor.execute(SLOW_QUERY)
+
+    assert not connection.dashboards_deadlines
+
+
+@pytest.mark.django_db
+def test_enforce__nested__inner_statement_timeout():
+    start = time.monotonic()
+    with enforce(Limits(statement_timeout=10)):
+        with pytest.raises(OperationalError) as e:
+            with enforce(Limits(statement_timeout=0.05)):
+                with connection.cursor() as cursor:
+                    cursor.execute(SLOW_QUERY)
+
+        assert is_limit_error(e.value)
+        assert User.objects.count() == 0
+
+    assert time.monotonic() - start < 5
+
+
+@pytest.mark.django_db
+def test_enforce__no_transaction():
+    with mock.patch.object(limits.transaction, "atomic") as atomic:
+        with enforce(Limits(timeout=5, max_queries=2)):
+            User.objects.count()
+
+    atomic.assert_not_called()
+
+
+def test_enforce__postgres__set_local_in_transaction():
+    with mock.patch.object(limits, "connections") as connections, mock.patch.object(
+        limits.transaction, "atomic"
+    ) as atomic:
+        postgres = connections.__getitem__.return_value
+        postgres.vendor = "postgresql"
+        cursor = postgres.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = ("0",)
+
+        with enforce(Limits(statement_timeout=2)):
+            pass
+
+    atomic.assert_called_once_with(using="default")
+    assert cursor.execute.call_args_list == [
+        mock.call(
+            "SELECT current_setting('statement_timeout'), "
+            "set_config('statement_timeout', %s, true)",
+            ["2000"],
+        ),
+        mock.call("SELECT set_config('statement_timeout', %s, true)", ["0"]),
+    ]
+
+
+@pytest.mark.django_db
+def test_is_limit_error():
+    assert is_limit_error(QueryBudgetExceeded("over"))
+    assert not is_limit_error(ValueError("interrupted"))
+
+    with pytest.raises(OperationalError) as e:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT * FROM missing_table")
+
+    assert not is_limit_error(e.value)
+
+
+@pytest.mark.django_db
+def test_call_with_limits__stale_value(dashboard, rf):
+    request = rf.get("/")
+    component = Text(value="value", limits=Limits(max_queries=1), key="limited")
+    component.dashboard = dashboard
+
+    def query(count):
+        for _ in range(count):
+            User.objects.count()
+        return count
+
+    with pytest.raises(ComponentLimitExceeded):
+        component.call_with_limits(lambda: query(2), request=request)
+
+    assert component.call_with_limits(lambda: query(1), request=request) == 1
+    # the last value is used in place of one over the limits
+    assert component.call_with_limits(lambda: query(2), request=request) == 1
+    # but not for other filters
+    with pytest.raises(ComponentLimitExceeded):
+        component.call_with_limits(
+            lambda: query(2), request=request, filters={"a": "b"}
+        )
+
+
+@pytest.mark.django_db
+def test_call_with_limits__database_error_raised(dashboard, rf):
+    component = Text(value="value", limits=Limits(max_queries=5), key="limited")
+    component.dashboard = dashboard
+
+    def query():
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT * FROM missing_table")
+
+    # errors other than hitting a limit are not shown as degraded
+    with pytest.raises(OperationalError):
+        component.call_with_limits(query, request=rf.get("/"))
+
+
+def test_call_with_limits__no_limits(dashboard):
+    component = Text(value="value")
+    component.dashboard = dashboard
+
+    assert component.get_limits() is None
+    assert component.call_with_limits(lambda: "result") == "result"
+
+
+def test_get_limits__dashboard_default(dashboard):
+    limits = Limits(timeout=1)
+    component = Text(value="value")
+    component.dashboard = dashboard
+    dashboard._meta.limits = limits
+    try:
+        assert component.get_limits() == limits
+        assert Text(value="value", limits=Limits(timeout=2)).get_limits() == Limits(
+            timeout=2
+        )
+    finally:
+        dashboard._meta.limits = None
+
+
+@pytest.mark.django_db
+def test_render__degraded(dashboard, rf):
+    def value(**kwargs):
+        for _ in range(2):
+            User.objects.count()
+        return "value"
+
+    component = Text(value=value, limits=Limits(max_queries=1), key="limited")
+    component.dashboard = dashboard
+
+    rendered = component.render(context=Context({"request": rf.get("/")}))
+
+    assert "dashboard-component-degraded" in rendered
@@ -0,0 +1,130 @@
+from django.contrib.auth.models import User
+
+import pandas as pd
+import pytest
+
+from dashboards.component import Text
+from dashboards.component.chart.serializers import ChartSerializer
+from dashboards.memo import RequestMemo, activate, freeze, get_memo, memoize
+from tests.dashboards.fakes import fake_user
+
+
+pytest_plugins = [
+    "tests.dashboards.fixtures",
+]
+
+
+def test_for_request__same_memo_per_request(rf):
+    request = rf.get("/")
+
+    assert RequestMemo.for_request(request) is RequestMemo.for_request(request)
+    assert RequestMemo.for_request(request) is not RequestMemo.for_request(rf.get("/"))
+    assert RequestMemo.for_request(None) is None
+
+
+def test_get_memo__active(rf):
+    request = rf.get("/")
+
+    assert get_memo() is None
+
+    with activate(request) as memo:
+        assert get_memo() is memo
+        assert get_memo(request=rf.get("/")) is memo
+
+    assert get_memo() is None
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ({"b": 1, "a": [1, 2]}, (("a", (1, 2)), ("b", 1))),
+        ({1, 2}, frozenset([1, 2])),
+        ("a", "a"),
+    ],
+)
+def test_freeze(value, expected):
+    assert freeze(value) == expected
+
+
+@pytest.fixture
+def loader():
+    calls = []
+
+    def load_data(*args, **kwargs):
+        calls.append((args, kwargs))
+        return "data"
+
+    load_data.calls = calls  # type: ignore
+    return load_data
+
+
+def test_memoize__called_once_per_request(rf, loader):
+    memoized = memoize(loader)
+    request = rf.get("/")
+
+    assert memoized(filters={"a": "1"}, request=request) == "data"
+    assert memoized(filters={"a": "1"}, request=request) == "data"
+    assert len(loader.calls) == 1
+
+    memoized(filters={"a": "2"}, request=request)
+    assert len(loader.calls) == 2
+
+    memoized(filters={"a": "1"}, request=rf.get("/"))
+    assert len(loader.calls) == 3
+
+
+def test_memoize__no_request__not_memoized(loader):
+    memoized = memoize(loader)
+
+    memoized({"a": "1"})
+    memoized({"a": "1"})
+
+    assert len(loader.calls) == 2
+
+
+def test_memoize__positional_with_active_memo(rf, loader):
+    memoized = memoize(loader)
+
+    with activate(rf.get("/")):
+        memoized({"a": "1"})
+        memoized({"a": "1"})
+
+    assert len(loader.calls) == 1
+
+
+def test_component__passes_memo(rf, loader):
+    request = rf.get("/")
+
+    Text(value=loader).get_value(request=request)
+
+    assert loader.calls[0][1]["memo"] is RequestMemo.for_request(request)
+
+
+@pytest.mark.django_db
+def test_chart_serializer__get_data__shared(rf, django_assert_num_queries):
+    fake_user(username="one")
+
+    class OneSerializer(ChartSerializer):
+        class Meta:
+            fields = ["username"]
+            model = User
+
+    class TwoSerializer(OneSerializer):
+        pass
+
+    request = rf.get("/")
+
+    with django_assert_num_queries(1):
+        one = OneSerializer().get_data(request=request)
+        two = TwoSerializer().get_data(request=request)
+
+    assert isinstance(one, pd.DataFrame)
+    assert list(one["username"]) == ["one"]
+    assert one.equals(two)
+
+    # each serializer may change its dataframe in place
+    one.loc[0, "username"] = "changed"
+    one.sort_values("username", inplace=True)
+
+    assert list(two["username"]) == ["one"]
+    assert list(TwoSerializer().get_data(request=request)["username"]) == ["one"]
@@ -0,0 +1,76 @@
+import os
+
+import pandas as pd
+import pytest
+
+from dashboards import offload
+
+
+def fail(df):
+    raise TypeError(f"failed in {os.getpid()}")
+
+
+def describe(df, suffix=""):
+    return f"{os.getpid()}:{df['a'].sum()}:{list(df['b'])}{suffix}"
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+
+
+def test_share_frame(frame):
+    data, block, sizes = offload.share_frame(frame)
+    try:
+        assert block is not None
+        assert sum(sizes) <= block.size
+
+        result = offload.call_with_frame(
+            describe, data, block.name, sizes, {"suffix": "!"}
+        )
+    finally:
+        block.close()
+        block.unlink()
+
+    assert result == f"{os.getpid()}:6:['x', 'y', 'z']!"
+
+
+def test_run(settings, frame):
+    settings.DASHBOARDS_CHART_PROCESSES = 1
+    try:
+        result = offload.run(describe, frame, suffix="!")
+    finally:
+        offload.get_executor().shutdown()
+        offload.get_executor.cache_clear()
+
+    pid, rest = result.split(":", 1)
+    assert int(pid) != os.getpid()
+    assert rest == "6:['x', 'y', 'z']!"
+
+
+def test_run__unpicklable(settings, frame):
+    settings.DASHBOARDS_CHART_PROCESSES = 1
+
+    def local(df):
+        return os.getpid()
+
+    try:
+        # local functions can't be sent to workers, so run here
+        assert offload.run(local, frame) == os.getpid()
+    finally:
+        offload.get_executor().shutdown()
+        offload.get_executor.cache_clear()
+
+
+def test_run__error__raised(settings, frame):
+    settings.DASHBOARDS_CHART_PROCESSES = 1
+
+    try:
+        with pytest.raises(TypeError) as error:
+            offload.run(fail, frame)
+    finally:
+        offload.get_executor().shutdown()
+        offload.get_executor.cache_clear()
+
+    # raised in the worker, and not built again here
+    assert str(error.value) != f"failed in {os.getpid()}"
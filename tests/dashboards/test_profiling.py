@@ -0,0 +1,99 @@
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+
+import pytest
+
+from dashboards import profiling
+from dashboards.component import Text
+from dashboards.signals import component_profiled
+from dashboards.views import ComponentView, DashboardView
+
+
+pytest_plugins = [
+    "tests.dashboards.fixtures",
+]
+
+
+def test_profile__disabled(rf, settings):
+    settings.DASHBOARDS_PROFILING = False
+
+    with profiling.profile(rf.get("/")) as profiler:
+        assert profiler is None
+        assert profiling.get_profiler() is None
+
+
+def test_phase__without_profiler__noop():
+    with profiling.component("component_1"), profiling.phase("fetch"):
+        assert profiling.get_profiler() is None
+
+
+def test_phase__nested_time_excluded(rf, settings):
+    settings.DASHBOARDS_PROFILING = True
+
+    # render 0 -> 10, fetch 2 -> 5
+    with patch("dashboards.profiling.time.perf_counter", side_effect=[0, 2, 5, 10]):
+        with profiling.profile(rf.get("/")) as profiler:
+            with profiling.component("component_1"):
+                with profiling.phase("render"):
+                    with profiling.phase("fetch"):
+                        pass
+
+    timing = profiler.timings["component_1"]
+    assert timing.fetch == 3000
+    assert timing.render == 7000
+    assert timing.serialize == 0
+    assert timing.total == 10000
+
+
+@pytest.mark.django_db
+def test_profile__counts_queries(rf, settings):
+    settings.DASHBOARDS_PROFILING = True
+
+    component = Text(value=lambda **kwargs: str(User.objects.count()))
+
+    with profiling.profile(rf.get("/")) as profiler:
+        with profiling.component("users"):
+            component.get_value()
+        # outside of a component, not counted
+        User.objects.count()
+
+    assert profiler.timings["users"].queries == 1
+
+
+def test_dashboard_view__server_timing(rf, settings, dashboard):
+    settings.DASHBOARDS_PROFILING = True
+    request = rf.get("/")
+    response = DashboardView.as_view(dashboard_class=dashboard)(request)
+
+    header = response["Server-Timing"]
+    assert "component_1.render;dur=" in header
+    assert 'component_1.queries;desc="0"' in header
+
+
+def test_dashboard_view__disabled__no_server_timing(rf, settings, dashboard):
+    settings.DASHBOARDS_PROFILING = False
+    request = rf.get("/")
+    response = DashboardView.as_view(dashboard_class=dashboard)(request)
+
+    assert "Server-Timing" not in response
+
+
+def test_component_view__json__signal_sent(rf, settings, dashboard):
+    settings.DASHBOARDS_PROFILING = True
+    received = []
+
+    def receiver(sender, timing, request, **kwargs):
+        received.append(timing)
+
+    component_profiled.connect(receiver)
+    try:
+        request = rf.get("/", HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+        response = ComponentView.as_view(dashboard_class=dashboard)(
+            request, component="component_2"
+        )
+    finally:
+        component_profiled.disconnect(receiver)
+
+    assert "component_2.fetch;dur=" in response["Server-Timing"]
+    assert [timing.key for timing in received] == ["component_2"]
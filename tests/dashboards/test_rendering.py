@@ -0,0 +1,119 @@
+from unittest.mock import patch
+
+from django.template import Context
+
+import pytest
+
+from dashboards import rendering
+from dashboards.component import Text
+from dashboards.component.layout import HTML, Header
+
+
+pytest_plugins = [
+    "tests.dashboards.fixtures",
+]
+
+
+def test_get_template__cached():
+    rendering.clear_cache()
+
+    with patch(
+        "dashboards.rendering.loader.get_template", wraps=rendering.loader.get_template
+    ) as get_template:
+        rendering.render_to_string("dashboards/components/loading.html")
+        rendering.render_to_string("dashboards/components/loading.html")
+
+    assert get_template.call_count == 1
+
+
+def test_get_template__cleared_on_templates_setting_changed(settings):
+    template = rendering.get_template("dashboards/components/loading.html")
+    settings.TEMPLATES = settings.TEMPLATES
+
+    assert rendering.get_template("dashboards/components/loading.html") is not template
+
+
+def test_render_static():
+    rendered = rendering.render_static("dashboards/components/loading.html")
+
+    assert rendered is rendering.render_static("dashboards/components/loading.html")
+    assert 'class="loading-img"' in rendered
+
+
+@pytest.fixture
+def loading_templates(settings):
+    settings.TEMPLATES = [
+        {
+            "BACKEND": "django.template.backends.django.DjangoTemplates",
+            "OPTIONS": {
+                "loaders": [
+                    (
+                        "django.template.loaders.locmem.Loader",
+                        {
+                            "static.html": "{% load static %}<img src=\"{% static 'a.svg' %}\" />",
+                            "context.html": "<span>{{ defer_url }}</span>",
+                        },
+                    ),
+                    "django.template.loaders.app_directories.Loader",
+                ],
+            },
+        }
+    ]
+
+
+def test_is_static(loading_templates):
+    assert rendering.is_static("dashboards/components/loading.html")
+    assert rendering.is_static("static.html")
+    assert not rendering.is_static("context.html")
+
+
+def test_render_placeholder__context(loading_templates):
+    assert (
+        rendering.render_placeholder("context.html", {"defer_url": "/url/"})
+        == "<span>/url/</span>"
+    )
+    assert rendering.render_placeholder(
+        "static.html", {}
+    ) is rendering.render_placeholder("static.html", {"defer_url": "/url/"})
+
+
+def test_component_render__loading_placeholder_context(loading_templates, dashboard):
+    component = Text(value="value", defer=lambda **kwargs: "value", key="deferred")
+    component.defer_loading_template_name = "context.html"
+    component.dashboard = dashboard
+
+    with patch.object(Text, "get_absolute_url", return_value="/url/"):
+        rendered = component.render(context=Context({}))
+
+    assert "<span>/url/</span>" in rendered
+
+
+def test_component_render__reverses_url_once(dashboard):
+    component = dashboard.components["component_1"]
+    component.dashboard = dashboard
+
+    with patch.object(
+        Text, "get_absolute_url", autospec=True, return_value="/url/"
+    ) as get_absolute_url:
+        component.render(context=Context({}))
+
+    assert get_absolute_url.call_count == 1
+
+
+def test_html__compiled_once():
+    html = HTML(html="<p>{{ value }}</p>")
+    template = html.template
+
+    assert html.render(context={"value": 1}) == "<p>1</p>"
+    assert html.template is template
+
+
+def test_html__changed__recompiled():
+    html = HTML(html="<p>{{ value }}</p>")
+    html.html = "<span>{{ value }}</span>"
+
+    assert html.render(context={"value": 1}) == "<span>1</span>"
+
+
+def test_header__compiled():
+    assert Header(heading="Title", size=2).render(context={}) == "<h2>Title</h2>"
@@ -0,0 +1,127 @@
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+
+import pytest
+
+from dashboards import routing, versions
+from dashboards.component import Stat
+from dashboards.component.chart import ChartSerializer
+from dashboards.component.stat import StatSerializer
+from dashboards.component.table import TableSerializer
+from tests.dashboards.app1.dashboards import TestModelDashboard
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return "replica"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def replica_router(settings):
+    settings.DATABASE_ROUTERS = ["tests.dashboards.test_routing.ReplicaRouter"]
+
+
+def test_get_database():
+    assert routing.get_database() == "default"
+    assert routing.get_database(User) == "default"
+    assert routing.get_database(User, using="analytics") == "analytics"
+
+
+def test_get_database__setting(settings):
+    settings.DASHBOARDS_DATABASE_ALIAS = "analytics"
+
+    assert routing.get_database() == "analytics"
+    assert routing.get_database(User) == "analytics"
+    assert routing.get_database(User, using="other") == "other"
+
+
+def test_get_database__router(replica_router):
+    assert routing.get_database(User) == "replica"
+
+
+def test_get_database__replica_lag(replica_router, settings):
+    settings.DASHBOARDS_REPLICA_LAG = 5
+    versions.track(Group)
+
+    assert routing.get_database(Group) == "replica"
+
+    versions.bump_version(Group)
+
+    # read your writes while the replica may not have caught up
+    assert routing.get_database(Group) == "default"
+    # untracked models are not known to have changed
+    assert routing.get_database(User) == "replica"
+
+
+def test_get_database__replica_lag__explicit_alias(replica_router, settings):
+    settings.DASHBOARDS_REPLICA_LAG = 5
+    versions.track(Group)
+    versions.bump_version(Group)
+
+    # a Meta.using or DASHBOARDS_DATABASE_ALIAS may not be a replica
+    assert routing.get_database(Group, using="analytics") == "analytics"
+
+    class GroupStatSerializer(StatSerializer):
+        class Meta:
+            annotation_field = "id"
+            model = Group
+            using = "analytics"
+
+    assert Stat(defer=GroupStatSerializer).get_database() == "analytics"
+
+    settings.DASHBOARDS_DATABASE_ALIAS = "warehouse"
+
+    assert routing.get_database(Group) == "warehouse"
+
+
+def test_get_database__replica_lag_unset(replica_router):
+    versions.track(Group)
+    versions.bump_version(Group)
+
+    assert routing.get_database(Group) == "replica"
+
+
+def test_serializer_querysets(settings):
+    settings.DASHBOARDS_DATABASE_ALIAS = "analytics"
+
+    class UserTableSerializer(TableSerializer):
+        class Meta:
+            columns = {"username": "Username"}
+            order = ["username"]
+            model = User
+
+    class UserChartSerializer(ChartSerializer):
+        class Meta:
+            fields = ["username"]
+            model = User
+            using = "other"
+
+    class UserStatSerializer(StatSerializer):
+        class Meta:
+            annotation_field = "id"
+            model = User
+
+    assert UserTableSerializer().get_queryset().db == "analytics"
+    assert UserChartSerializer().get_queryset().db == "other"
+    assert UserStatSerializer().get_queryset().db == "analytics"
+    assert Stat(defer=UserStatSerializer).get_database() == "analytics"
+
+
+def test_model_dashboard_queryset(settings):
+    dashboard = TestModelDashboard(object=User(pk=1))
+
+    assert dashboard.get_queryset().db == "default"
+
+    settings.DASHBOARDS_DATABASE_ALIAS = "analytics"
+
+    assert dashboard.get_queryset().db == "analytics"
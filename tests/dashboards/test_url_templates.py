@@ -0,0 +1,69 @@
+from unittest.mock import patch
+
+from django.urls import NoReverseMatch, path, reverse
+from django.views.generic import View
+
+import pytest
+
+from dashboards import url_templates
+
+
+urlpatterns = [
+    path("int/<int:pk>/", View.as_view(), name="int"),
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_url_templates():
+    url_templates.get_url_template.cache_clear()
+    yield
+    url_templates.get_url_template.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["app1", "testdashboard", "component_1"],
+        ["app1", "testdashboard", "a b&é?", "component_1"],
+        ["app1", "testdashboard", 1, "component_1"],
+    ],
+)
+def test_reverse_args(args):
+    assert url_templates.reverse_args(
+        "dashboards:dashboard_component", args
+    ) == reverse("dashboards:dashboard_component", args=args)
+
+
+def test_reverse_args__resolves_once():
+    with patch("dashboards.url_templates.reverse", wraps=reverse) as mock_reverse:
+        url_templates.reverse_args("dashboards:dashboard_component", ["a", "b", "c"])
+        url_templates.reverse_args("dashboards:dashboard_component", ["d", "e", "f"])
+
+    assert mock_reverse.call_count == 1
+
+
+@pytest.mark.parametrize("args", [["a", "b", ""], ["a", "b/c", "d"]])
+def test_reverse_args__invalid__uses_reverse(args):
+    with pytest.raises(NoReverseMatch):
+        url_templates.reverse_args("dashboards:dashboard_component", args)
+
+
+def test_get_url_template():
+    assert (
+        url_templates.get_url_template("dashboards:dashboard_component", 3, "/", None)
+        == "/dash/{0}/{1}/@component/{2}/"
+    )
+    assert (
+        url_templates.get_url_template("dashboards:dashboard_component", 4, "/", None)
+        == "/dash/{0}/{1}/{2}/@component/{3}/"
+    )
+
+
+def test_get_url_template__placeholders_not_accepted():
+    assert url_templates.get_url_template("int", 1, "/", __name__) is None
+
+
+def test_reverse_many():
+    assert url_templates.reverse_many(
+        "dashboards:app1_testmodeldashboard_detail", [[1], [2]]
+    ) == ["/dash/app1/testmodeldashboard/1/", "/dash/app1/testmodeldashboard/2/"]
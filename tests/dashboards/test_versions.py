@@ -0,0 +1,142 @@
+from django.contrib.admin.models import LogEntry
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.deletion import Collector
+from django.db.models.signals import m2m_changed, post_delete
+
+import pytest
+
+from dashboards import versions
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_get_version__stable_until_bumped():
+    version = versions.get_version(User)
+
+    assert versions.get_version(User) == version
+
+    versions.bump_version(User)
+
+    assert versions.get_version(User) == version + 1
+
+
+def test_get_version__evicted__does_not_repeat():
+    version = versions.get_version(User)
+    versions.bump_version(User)
+    cache.clear()
+
+    assert versions.get_version(User) > version + 1
+
+
+def test_get_versions():
+    assert set(versions.get_versions([User, Group])) == {"auth.user", "auth.group"}
+
+
+def test_get_related_models():
+    assert versions.get_related_models(
+        User, ["groups", "groups__permissions", "user_permissions", "missing"]
+    ) == [Group, Permission]
+
+
+@pytest.mark.django_db
+def test_save__tracked__bumps_version(django_capture_on_commit_callbacks):
+    versions.track(Group)
+    version = versions.get_version(Group)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        group = Group.objects.create(name="group")
+    assert versions.get_version(Group) == version + 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        group.delete()
+    assert versions.get_version(Group) == version + 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_save__in_transaction__bumps_version_on_commit():
+    versions.track(Group)
+    version = versions.get_version(Group)
+
+    with transaction.atomic():
+        Group.objects.create(name="group")
+        # a value computed now reads the old rows, so must not get the new version
+        assert versions.get_version(Group) == version
+
+    assert versions.get_version(Group) == version + 1
+
+    with transaction.atomic():
+        Group.objects.create(name="rolled back")
+        transaction.set_rollback(True)
+
+    assert versions.get_version(Group) == version + 1
+
+
+@pytest.mark.django_db
+def test_save__untracked__version_unchanged():
+    version = versions.get_version(Permission)
+
+    Permission.objects.filter(codename="add_user").first().save()
+
+    assert versions.get_version(Permission) == version
+
+
+@pytest.mark.django_db
+def test_m2m_change__bumps_version(django_capture_on_commit_callbacks):
+    versions.track(User, Group)
+    user = User.objects.create(username="versions")
+    group = Group.objects.create(name="group")
+    user_version = versions.get_version(User)
+    group_version = versions.get_version(Group)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.groups.add(group)
+
+    assert versions.get_version(User) == user_version + 1
+    assert versions.get_version(Group) == group_version + 1
+
+
+@pytest.mark.django_db
+def test_versioned_queryset__bulk_operations_bump_version(
+    django_capture_on_commit_callbacks,
+):
+    versions.track(Group)
+    version = versions.get_version(Group)
+    queryset = versions.VersionedQuerySet(model=Group)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        groups = queryset.bulk_create([Group(name="a"), Group(name="b")])
+    assert versions.get_version(Group) == version + 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        queryset.filter(name="a").update(name="c")
+    assert versions.get_version(Group) == version + 2
+
+    groups[1].name = "d"
+    with django_capture_on_commit_callbacks(execute=True):
+        queryset.bulk_update([groups[1]], ["name"])
+    assert versions.get_version(Group) == version + 3
+
+    # nothing changed
+    with django_capture_on_commit_callbacks(execute=True):
+        queryset.filter(name="missing").update(name="e")
+    assert versions.get_version(Group) == version + 3
+
+
+def test_track__only_tracked_models_have_receivers():
+    versions.track(User)
+
+    assert post_delete.has_listeners(User)
+    assert not post_delete.has_listeners(LogEntry)
+    assert m2m_changed.has_listeners(User.groups.through)
+
+
+@pytest.mark.django_db
+def test_delete__untracked__fast_delete():
+    assert Collector(using="default").can_fast_delete(LogEntry.objects.all())
@@ -1,9 +1,20 @@
+import json
+from unittest import mock
+
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
 from django.http import Http404
 
+import pandas as pd
+import plotly.express as px
 import pytest
 
+from dashboards import jobs, lanes, permissions
+from dashboards.component import Component
+from dashboards.component.chart import ChartSerializer
+from dashboards.exceptions import ComponentLimitExceeded
 from dashboards.views import ComponentView
+from tests.dashboards.fakes import FakeJobBackend
 
 
 pytest_plugins = [
@@ -146,3 +157,289 @@ def test_admin_only_dashboard__with_permission(
     view.setup(request, component="component_1")
 
     assert view.dispatch(request).status_code == 200
+
+
+def test_get__json__delta(rf, dashboard):
+    class DeltaSerializer:
+        @classmethod
+        def serialize(cls, **kwargs):
+            return ["a", "b"]
+
+        @classmethod
+        def serialize_since(cls, cursor, **kwargs):
+            return {"data": ["b"], "cursor": int(cursor) + 1}
+
+        @classmethod
+        def get_data_since(cls, cursor, **kwargs):
+            raise NotImplementedError
+
+    dashboard.components["component_2"].defer = DeltaSerializer
+    dashboard.components["component_2"].poll_rate = 5
+
+    request = rf.get("/dash/app1/TestDashboard/component_2/", {"_cursor": 1})
+    request.headers = {"x-requested-with": "XMLHttpRequest"}
+    view = ComponentView(dashboard_class=dashboard)
+    view.setup(request, component="component_2")
+
+    try:
+        response = view.get(request)
+    finally:
+        dashboard.components["component_2"].defer = lambda **kwargs: "value"
+        dashboard.components["component_2"].poll_rate = None
+
+    assert response.status_code == 200
+    assert json.loads(response.content) == {"data": ["b"], "cursor": 2}
+
+
+class NumpyCursorChartSerializer(ChartSerializer):
+    class Meta:
+        delta_max_points = 10
+
+    def get_data_since(self, cursor, **kwargs):
+        df = pd.DataFrame({"id": [2, 3], "value": [20, 30]})
+        return df, df["id"].max()
+
+    def to_fig(self, df):
+        return px.line(df, x="id", y="value")
+
+
+def test_get__json__delta__chart_numpy_cursor(rf, dashboard):
+    dashboard.components["component_2"].defer = NumpyCursorChartSerializer
+    dashboard.components["component_2"].poll_rate = 5
+
+    request = rf.get("/dash/app1/TestDashboard/component_2/", {"_cursor": 1})
+    request.headers = {"x-requested-with": "XMLHttpRequest"}
+    view = ComponentView(dashboard_class=dashboard)
+    view.setup(request, component="component_2")
+
+    try:
+        response = view.get(request)
+    finally:
+        dashboard.components["component_2"].defer = lambda **kwargs: "value"
+        dashboard.components["component_2"].poll_rate = None
+
+    assert response.status_code == 200
+    assert json.loads(response.content) == {
+        "update": {"x": [[2, 3]], "y": [[20, 30]]},
+        "traces": [0],
+        "cursor": 3,
+        "max_points": 10,
+    }
+
+
+@pytest.mark.django_db
+def test_admin_only_dashboard__access_token__skips_permissions(
+    rf, admin_dashboard, user, settings
+):
+    settings.DASHBOARDS_COMPONENT_ACCESS_TOKEN_MAX_AGE = 60
+    request = rf.get("/")
+    request.user = user
+    token = permissions.get_access_token(request, admin_dashboard)
+
+    request = rf.get("/", {permissions.ACCESS_TOKEN_PARAM: token})
+    request.user = user
+    request.htmx = False
+    view = ComponentView(dashboard_class=admin_dashboard)
+    view.setup(request, component="component_1")
+
+    with mock.patch.object(permissions.IsAdminUser, "has_permission") as check:
+        assert view.dispatch(request).status_code == 200
+
+    check.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_admin_only_dashboard__access_token__other_user(
+    rf, django_user_model, admin_dashboard, user, settings
+):
+    settings.DASHBOARDS_COMPONENT_ACCESS_TOKEN_MAX_AGE = 60
+    request = rf.get("/")
+    request.user = django_user_model.objects.create(username="other", is_staff=True)
+    token = permissions.get_access_token(request, admin_dashboard)
+
+    request = rf.get("/", {permissions.ACCESS_TOKEN_PARAM: token})
+    request.user = user
+    request.htmx = False
+    view = ComponentView(dashboard_class=admin_dashboard)
+    view.setup(request, component="component_1")
+
+    with pytest.raises(PermissionDenied):
+        view.dispatch(request)
+
+
+@pytest.mark.django_db
+def test_admin_only_dashboard__access_token__disabled(
+    rf, admin_dashboard, user, settings
+):
+    settings.DASHBOARDS_COMPONENT_ACCESS_TOKEN_MAX_AGE = 60
+    request = rf.get("/")
+    request.user = user
+    token = permissions.get_access_token(request, admin_dashboard)
+    settings.DASHBOARDS_COMPONENT_ACCESS_TOKEN_MAX_AGE = None
+
+    request = rf.get("/", {permissions.ACCESS_TOKEN_PARAM: token})
+    request.user = user
+    request.htmx = False
+    view = ComponentView(dashboard_class=admin_dashboard)
+    view.setup(request, component="component_1")
+
+    with pytest.raises(PermissionDenied):
+        view.dispatch(request)
+
+
+def test_get__json__access_token_not_a_filter(rf, dashboard, settings):
+    settings.DASHBOARDS_COMPONENT_ACCESS_TOKEN_MAX_AGE = 60
+    request = rf.get("/", {permissions.ACCESS_TOKEN_PARAM: "token", "a": "b"})
+    request.headers = {"x-requested-with": "XMLHttpRequest"}
+    view = ComponentView(dashboard_class=dashboard)
+    view.setup(request, component="component_2")
+
+    with mock.patch.object(
+        dashboard.components["component_2"], "get_value", return_value="value"
+    ) as get_value:
+        view.get(request)
+
+    assert get_value.call_args.kwargs["filters"] == {"a": "b"}
+
+
+def test_get_dashboard_context__shared_keys(rf, dashboard):
+    request = rf.get("/")
+    view = ComponentView(dashboard_class=dashboard)
+    view.setup(request, component="component_2")
+    dashboard.components["component_2"].shared = ["disk"]
+
+    try:
+        assert view.get_dashboard_context()["shared_keys"] == ["disk"]
+    finally:
+        dashboard.components["component_2"].shared = None
+
+
+@pytest.fixture
+def background_component(dashboard, settings):
+    cache.clear()
+    FakeJobBackend.jobs.clear()
+    settings.DASHBOARDS_JOB_BACKEND = "tests.dashboards.fakes.FakeJobBackend"
+    component = dashboard.components["component_2"]
+    component.background = True
+    yield component
+    component.background = False
+    cache.clear()
+
+
+def test_get__background__pending(rf, dashboard, background_component):
+    request = rf.get("/dash/app1/testdashboard/@component/component_2/", {"a": "b"})
+    view = ComponentView(dashboard_class=dashboard)
+    view.setup(request, component="component_2")
+
+    response = view.get(request)
+
+    assert response.status_code == 202
+    assert response["Retry-After"] == "2"
+    assert 'hx-get="/dash/app1/testdashboard/@component/component_2/?a=b"' in str(
+        response.content
+    )
+    assert len(FakeJobBackend.jobs) == 1
+
+    # polling doesn't submit the job again
+    assert view.get(request).status_code == 202
+    assert len(FakeJobBackend.jobs) == 1
+
+
+def test_get__background__done(rf, dashboard, background_component):
+    request = rf.get("/dash/app1/testdashboard/@component/component_2/")
+    view = ComponentView(dashboard_class=dashboard)
+    view.setup(request, component="component_2")
+    view.get(request)
+    jobs.run(FakeJobBackend.jobs[0])
+
+    response = view.get(request)
+
+    assert response.status_code == 200
+    assert response.context_data["component"] is not background_component
+    assert "value" in response.rendered_content
+
+
+def test_get__background__detached_request(rf, dashboard, background_component):
+    request = rf.get("/dash/app1/testdashboard/@component/component_2/")
+    view = ComponentView(dashboard_class=dashboard)
+    view.setup(request, component="component_2")
+    view.get(request)
+
+    with mock.patch.object(
+        Component, "get_value", autospec=True, return_value="value"
+    ) as get_value:
+        jobs.run(FakeJobBackend.jobs[0])
+
+    job_request = get_value.call_args.kwargs["request"]
+    assert job_request is not request
+    assert job_request.path == request.path
+
+
+def test_get__json__background(rf, dashboard, background_component):
+    request = rf.get("/dash/app1/testdashboard/@component/component_2/")
+    request.headers = {"x-requested-with": "XMLHttpRequest"}
+    view = ComponentView(dashboard_class=dashboard)
+    view.setup(request, component="component_2")
+
+    response = view.get(request)
+
+    assert response.status_code == 202
+    assert json.loads(response.content)["status"] == jobs.PENDING
+
+    jobs.run(FakeJobBackend.jobs[0])
+
+    assert json.loads(view.get(request).content) == "value"
+
+
+def test_get__background__failed(rf, dashboard, background_component):
+    request = rf.get("/dash/app1/testdashboard/@component/component_2/")
+    view = ComponentView(dashboard_class=dashboard)
+    view.setup(request, component="component_2")
+    view.get(request)
+    jobs.run(jobs.Job(id=FakeJobBackend.jobs[0].id, func=lambda: 1 / 0))
+
+    assert view.get(request).status_code == 500
+    assert view.get(request).status_code == 202
+
+
+def test_get__json__degraded(rf, dashboard):
+    request = rf.get("/dash/app1/TestDashboard/component_2/")
+    request.headers = {"x-requested-with": "XMLHttpRequest"}
+    view = ComponentView(dashboard_class=dashboard)
+    view.setup(request, component="component_2")
+
+    with mock.patch(
+        "dashboards.component.Component.get_value",
+        side_effect=ComponentLimitExceeded(),
+    ):
+        response = view.get(request)
+
+    assert response.status_code == 503
+    assert json.loads(response.content) == {"status": "degraded"}
+
+
+@pytest.mark.parametrize("ajax", [True, False])
+def test_get__lane_saturated(rf, dashboard, settings, ajax):
+    settings.DASHBOARDS_LANES = {"expensive": 1}
+    component = dashboard.components["component_2"]
+    component.lane = "expensive"
+    request = rf.get("/dash/app1/testdashboard/@component/component_2/")
+    if ajax:
+        request.headers = {"x-requested-with": "XMLHttpRequest"}
+    view = ComponentView(dashboard_class=dashboard)
+    view.setup(request, component="component_2")
+
+    try:
+        with lanes.admit("expensive"):
+            response = view.get(request)
+
+        assert response.status_code == 503
+        assert response["Retry-After"] == "2"
+        if ajax:
+            assert json.loads(response.content) == {"status": "saturated"}
+        else:
+            assert "hx-get" in str(response.content)
+
+        assert view.get(request).status_code == 200
+    finally:
+        component.lane = None
@@ -93,3 +93,44 @@ def test_admin_only_dashboard__with_permission(rf, admin_dashboard, staff):
     view.setup(request)
 
     assert view.dispatch(request).status_code == 200
+
+
+def test_get__includes_chart_themes(rf, dashboard):
+    request = rf.get("/")
+    view = DashboardView(dashboard_class=dashboard)
+    view.setup(request=request)
+    response = view.get(request).render()
+
+    assert response.content.count(b'id="dashboards-chart-themes"') == 1
+
+
+def test_get__custom_template__includes_chart_themes(rf, dashboard, settings):
+    # a page template without {% chart_themes %}
+    settings.TEMPLATES = [
+        {
+            "BACKEND": "django.template.backends.django.DjangoTemplates",
+            "OPTIONS": {
+                "context_processors": [
+                    "django.template.context_processors.request",
+                ],
+                "loaders": [
+                    (
+                        "django.template.loaders.locmem.Loader",
+                        {
+                            "custom.html": (
+                                "{% load dashboards %}"
+                                "{% render_dashboard dashboard %}"
+                            ),
+                        },
+                    ),
+                    "django.template.loaders.app_directories.Loader",
+                ],
+            },
+        }
+    ]
+    request = rf.get("/")
+    view = DashboardView(dashboard_class=dashboard, template_name="custom.html")
+    view.setup(request=request)
+    response = view.get(request).render()
+
+    assert response.content.count(b'id="dashboards-chart-themes"') == 1
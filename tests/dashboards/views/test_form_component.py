@@ -75,3 +75,49 @@ def test_post_ajax(filter_dashboard, rf, snapshot):
     response = view.post(request)
 
     assert response.status_code == 200
+
+
+def test_get__only_changed_dependents(rf, filter_dashboard):
+    dependent = filter_dashboard.components["dependent_component_2"]
+    dependent.consumes = ["other"]
+    request = rf.get("/", {"country": "two", "_previous": "country=one"})
+    request.htmx = True
+    view = FormComponentView(dashboard_class=filter_dashboard)
+    view.setup(request=request, component="filter_component")
+
+    try:
+        response = view.get(request)
+        content = response.rendered_content
+    finally:
+        dependent.consumes = None
+
+    assert [c.key for c in response.context_data["component"].dependent_components] == [
+        "dependent_component_1"
+    ]
+    assert (
+        "component-dashapp1testfilterdashboardcomponentdependent_component_1" in content
+    )
+    assert "dependent_component_2" not in content
+
+
+def test_get__only_changed_dependents__shared_component_unchanged(rf, filter_dashboard):
+    dependent = filter_dashboard.components["dependent_component_2"]
+    dependent.consumes = ["other"]
+    component = filter_dashboard.components["filter_component"]
+    request = rf.get("/", {"country": "two", "_previous": "country=one"})
+    request.htmx = True
+    view = FormComponentView(dashboard_class=filter_dashboard)
+    view.setup(request=request, component="filter_component")
+
+    try:
+        response = view.get(request)
+        response.render()
+    finally:
+        dependent.consumes = None
+
+    # another request rendering the shared component sees all its dependents
+    assert response.context_data["component"] is not component
+    assert [c.key for c in component.dependent_components] == [
+        "dependent_component_1",
+        "dependent_component_2",
+    ]
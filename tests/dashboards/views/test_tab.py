@@ -0,0 +1,28 @@
+from django.http import Http404
+
+import pytest
+
+from dashboards.views import TabView
+
+
+pytest_plugins = [
+    "tests.dashboards.fixtures",
+]
+
+
+def test_get(rf, lazy_tab_dashboard):
+    request = rf.get("/")
+    response = TabView.as_view(dashboard_class=lazy_tab_dashboard)(
+        request, tab="second"
+    )
+
+    assert response.status_code == 200
+    content = response.content.decode()
+    assert "@component/component_2/" in content
+    assert "value from callable" in content
+    assert "component_1" not in content
+
+
+def test_get__unknown_tab(rf, lazy_tab_dashboard):
+    with pytest.raises(Http404):
+        TabView.as_view(dashboard_class=lazy_tab_dashboard)(rf.get("/"), tab="third")
@@ -9,7 +9,9 @@ def render_component_test(context, htmx):
 
 
 def render_dashboard_test(context):
+    # as dashboard.html, the chart themes are rendered before the dashboard
     template_to_render = Template(
-        "{% load dashboards %}}{{% render_dashboard dashboard=dashboard %}"
+        "{% load dashboards %}{% chart_themes as themes %}}"
+        "{{% render_dashboard dashboard=dashboard %}"
     )
     return template_to_render.render(context)